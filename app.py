@@ -1,40 +1,156 @@
 """
 Streamlit 대시보드 - 추천 결과 확인
 실행: streamlit run app.py
+
+위젯을 누를 때마다 스크립트 전체가 다시 실행되므로 시세·결과는 캐시해 둔다.
+- 시세: (종목코드, 날짜) 별로 프로세스 전체에서 공유, 갱신 주기가 지난 종목만 다시 조회
+- 결과: 세션별 (st.session_state), 쓰인 시세가 그대로면 다시 평가하지 않음 (전체 보기 탭도 재사용)
 """
 import sys
+import threading
+import time
+from datetime import date, datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 import streamlit as st
 
-from src.data import fetch_stock_data, get_rising_star_universe, get_watchlist
+from config import LISTING_TTL_SEC, PRICE_REFRESH_SEC
+from src.data import data_context, fetch_many, get_rising_star_universe, get_watchlist
+from src.data.pool import FetchResult
 from src.recommender import (
     Recommendation,
     evaluate_rising_star,
     evaluate_stock,
 )
 
+# 자동 갱신 주기 선택지 (0: 날짜가 바뀔 때만)
+REFRESH_OPTIONS = {"5분": 300, "30분": 1800, "하루 한 번": 0}
+# 조회에 실패한 종목은 이 시간 뒤 다시 조회 (실패를 갱신 주기 내내 붙들지 않음)
+FAILED_RETRY_SEC = 60
+
+
+@st.cache_resource
+def _price_cache() -> tuple[threading.Lock, dict[tuple[str, date], tuple[float, object]]]:
+    """{(종목코드, 날짜): (조회 시각, 시세 또는 None)} - 모든 세션이 공유"""
+    return threading.Lock(), {}
+
+
+def load_prices(
+    universe: list[tuple[str, str]], day: date, ttl_sec: int
+) -> tuple[list[FetchResult], tuple[float, ...]]:
+    """
+    종목 시세 (캐시에 없거나 ttl_sec 보다 오래된 종목만 동시 조회)
+    Returns: (fetch_many 형식 결과, 종목별 조회 시각) - 조회 시각이 같으면 결과도 같음
+    """
+    lock, cache = _price_cache()
+    now = time.time()
+    entries: dict[str, tuple[float, object]] = {}
+    missing = []
+    with lock:
+        for symbol, name in universe:
+            entry = cache.get((symbol, day))
+            if entry is None or _expired(entry, now, ttl_sec):
+                missing.append((symbol, name))
+            else:
+                entries[symbol] = entry
+    if missing:
+        fetched = fetch_many(missing, days=120)
+        with lock:
+            # 지난 날짜 시세는 버림
+            for key in [k for k in cache if k[1] != day]:
+                del cache[key]
+            for symbol, _, df in fetched:
+                entries[symbol] = cache[(symbol, day)] = (now, df)
+    # 캐시를 다시 읽지 않음 - 그 사이 시세 새로고침으로 비워져도 이번 조회 결과로 응답
+    return (
+        [(symbol, name, entries[symbol][1]) for symbol, name in universe],
+        tuple(entries[symbol][0] for symbol, _ in universe),
+    )
+
+
+def _expired(entry: tuple[float, object], now: float, ttl_sec: int) -> bool:
+    """조회 실패(None)는 FAILED_RETRY_SEC 뒤, 시세는 ttl_sec 뒤 (0: 날짜가 바뀔 때만) 다시 조회"""
+    at, df = entry
+    if df is None:
+        return now - at >= FAILED_RETRY_SEC
+    return bool(ttl_sec) and now - at >= ttl_sec
+
+
+@st.cache_data(ttl=LISTING_TTL_SEC, show_spinner=False)
+def _universes(day: date) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+    """(관심종목, 샛별 종목 풀) - 날짜별, LISTING_TTL_SEC 동안 재사용"""
+    return get_watchlist(), get_rising_star_universe(limit=50)
+
+
+def _evaluate_trend(fetched: list[FetchResult]) -> list[Recommendation]:
+    results = [rec for symbol, name, df in fetched if (rec := evaluate_stock(df, symbol, name))]
+    return sorted(results, key=lambda r: r.score, reverse=True)
+
+
+def _evaluate_rising(fetched: list[FetchResult]) -> list[Recommendation]:
+    results = [
+        rec
+        for symbol, name, df in fetched
+        if (rec := evaluate_rising_star(df, symbol, name)) and rec.signal == "샛별"
+    ]
+    return sorted(results, key=lambda r: r.score, reverse=True)
+
+
+def cached_results(
+    key: str, universe: list[tuple[str, str]], evaluate, day: date, ttl_sec: int
+) -> list[Recommendation]:
+    """세션에 저장된 key 결과 (쓰인 시세가 바뀌었을 때만 다시 평가)"""
+    fetched, version = load_prices(universe, day, ttl_sec)
+    saved = st.session_state.get(key)
+    if saved is not None and saved[0] == (day, version):
+        return saved[1]
+    results = evaluate(fetched)
+    st.session_state[key] = ((day, version), results)
+    st.session_state[f"{key}_at"] = max(version, default=time.time())
+    return results
+
+
+def refresh_controls() -> int:
+    """사이드바 갱신 설정. Returns: 시세 갱신 주기 초 (0: 날짜가 바뀔 때만)"""
+    labels = list(REFRESH_OPTIONS)
+    default = next(
+        (i for i, label in enumerate(labels) if REFRESH_OPTIONS[label] == PRICE_REFRESH_SEC), 0
+    )
+    ttl_sec = REFRESH_OPTIONS[st.sidebar.selectbox("자동 갱신", labels, index=default)]
+    if st.sidebar.button("지금 새로고침"):
+        lock, cache = _price_cache()
+        with lock:
+            cache.clear()
+        _universes.clear()
+    if at := st.session_state.get("trend_at"):
+        st.sidebar.caption(f"시세 조회: {datetime.fromtimestamp(at):%H:%M:%S}")
+    return ttl_sec
+
 
 def main():
+    # 이번 실행(다시 그리기)에서 새로 조회한 시세는 탭끼리 한 번만
+    with data_context() as data:
+        _render()
+    st.sidebar.caption(data.summary())
+
+
+def _render():
     st.set_page_config(page_title="주식 추천 | 토스증권 수동매매", layout="wide")
 
     st.title("📊 주식 추천 시스템")
     st.caption("토스증권 앱에서 수동으로 매수/매도해 주세요")
 
+    ttl_sec = refresh_controls()
+    day = date.today()
+    watchlist, universe = _universes(day)
+
     tab1, tab2, tab3 = st.tabs(["📈 추세 기반", "⭐ 떠오르는 샛별", "전체 보기"])
 
     with tab1:
-        watchlist = get_watchlist()
-        results: list[Recommendation] = []
         with st.spinner("종목 분석 중..."):
-            for symbol, name in watchlist:
-                df = fetch_stock_data(symbol, days=120)
-                rec = evaluate_stock(df, symbol, name)
-                if rec:
-                    results.append(rec)
-            results.sort(key=lambda r: r.score, reverse=True)
+            results = cached_results("trend", watchlist, _evaluate_trend, day, ttl_sec)
 
         buy_list = [r for r in results if r.signal == "매수"]
         watch_list = [r for r in results if r.signal == "관망"]
@@ -61,15 +177,8 @@ def main():
                     st.write(f"• {r}")
 
     with tab2:
-        universe = get_rising_star_universe(limit=50)
-        rising_results: list[Recommendation] = []
         with st.spinner("샛별 종목 스캔 중... (KOSDAQ·중소형 위주)"):
-            for symbol, name in universe:
-                df = fetch_stock_data(symbol, days=120)
-                rec = evaluate_rising_star(df, symbol, name)
-                if rec and rec.signal == "샛별":
-                    rising_results.append(rec)
-            rising_results.sort(key=lambda r: r.score, reverse=True)
+            rising_results = cached_results("rising", universe, _evaluate_rising, day, ttl_sec)
 
         st.metric("샛별 추천", len(rising_results), "종목")
         st.caption("거래량 급증 + 고점 돌파 + 모멘텀 조건")
@@ -85,8 +194,10 @@ def main():
 
     with tab3:
         st.write("추세 + 샛별 결과 통합")
-        all_results = results + rising_results
-        all_results.sort(key=lambda r: r.score, reverse=True)
+        # 앞의 두 탭이 세션에 남긴 결과 재사용
+        _, trend_saved = st.session_state.get("trend", (None, []))
+        _, rising_saved = st.session_state.get("rising", (None, []))
+        all_results = sorted(trend_saved + rising_saved, key=lambda r: r.score, reverse=True)
         for rec in all_results:
             tag = "⭐" if rec.category == "rising_star" else "📈"
             st.write(f"{tag} [{rec.symbol}] {rec.name} — {rec.current_price:,.0f}원 | {rec.signal} | 점수 {rec.score}")
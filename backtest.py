@@ -0,0 +1,121 @@
+"""
+추천 규칙 백테스트 - 과거 일봉 전 구간에서 추세/샛별 신호별 이후 수익률 확인
+실행: python backtest.py --market kr --limit 200 --years 5
+파라미터 탐색: python backtest.py --sweep trend --grid rsi_oversold=25,30,35 buy=3,3.5,4
+"""
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+# Windows 콘솔 한글 출력
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from src.backtest import load_history, parse_grid, run_backtest, run_sweep
+from src.data import US_MARKET_SCAN, US_WATCHLIST, fetch_symbol_list
+
+
+def build_universe(market: str, limit: int) -> list[tuple[str, str]]:
+    """백테스트 대상 (한국: KOSPI + KOSDAQ 리스트 앞쪽 limit종, 미국: 관심종목 + 확장 리스트)"""
+    if market == "us":
+        return (US_WATCHLIST + US_MARKET_SCAN)[:limit]
+    seen = set()
+    result = []
+    for code, name in fetch_symbol_list("KOSPI", limit=limit) + fetch_symbol_list("KOSDAQ", limit=limit):
+        if code not in seen:
+            seen.add(code)
+            result.append((code, name))
+    return result[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추천 규칙 백테스트")
+    parser.add_argument("--market", choices=["kr", "us"], default="kr")
+    parser.add_argument("--limit", type=int, default=200, help="종목 수")
+    parser.add_argument("--years", type=float, default=5, help="기간 (년)")
+    parser.add_argument("--horizons", default="1,5,20", help="보유 기간 (봉 수, 쉼표 구분)")
+    parser.add_argument("--offline", action="store_true", help="저장된 시세만 사용 (추가 조회 없음)")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    sweep = parser.add_argument_group("파라미터 탐색")
+    sweep.add_argument("--sweep", choices=["trend", "rising_star"], help="이 전략의 임계값·지표 창 조합 탐색")
+    sweep.add_argument("--grid", nargs="*", default=None, help="탐색 범위 (이름=값,값 ...), 없으면 기본 범위")
+    sweep.add_argument("--horizon", type=int, default=5, help="탐색 기준 보유 기간 (봉 수)")
+    sweep.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    sweep.add_argument("--top", type=int, default=20, help="출력할 상위 조합 수")
+    sweep.add_argument("--min-count", type=int, default=30, help="신호 건수가 이보다 적은 조합은 순위 제외")
+    sweep.add_argument("--sort", choices=["avg_return", "hit_rate", "excess"], default="avg_return")
+    args = parser.parse_args()
+    horizons = [int(h) for h in args.horizons.split(",") if h]
+
+    universe = build_universe(args.market, args.limit)
+    print(f"시세 로드 중... ({len(universe)}종목, {args.years:g}년)")
+    t0 = time.perf_counter()
+    history = load_history(universe, years=args.years, refresh=not args.offline)
+    t1 = time.perf_counter()
+    if args.sweep:
+        run_sweep_cli(args, history, t1 - t0)
+        return
+    results = run_backtest(history, horizons=horizons)
+    t2 = time.perf_counter()
+    print(f"로드 {t1 - t0:.1f}초 · 계산 {t2 - t1:.2f}초 · {len(history.symbols)}종목 {len(history.close):,}봉")
+
+    print("\n" + "=" * 72)
+    header = f"{'전략':<12}{'신호':<6}{'건수':>10}"
+    for h in horizons:
+        header += f"{f'{h}일 수익':>10}{f'{h}일 적중':>10}"
+    print(header + f"{'회전율':>8}")
+    print("-" * 72)
+    for r in results:
+        line = f"{r.strategy:<12}{r.signal:<6}{r.count:>10,}"
+        for h in horizons:
+            line += f"{r.avg_return[h]:>9.2f}%{r.hit_rate[h]:>9.1f}%"
+        print(line + f"{r.turnover:>7.1f}%")
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([r.to_dict() for r in results], ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        print(f"\n저장: {args.json}")
+
+
+def run_sweep_cli(args, history, load_sec: float) -> None:
+    """--sweep: 조합별 최상위 신호 성과 상위 N개 출력"""
+    grid = parse_grid(args.grid) if args.grid is not None else None
+    t0 = time.perf_counter()
+    results = run_sweep(
+        history, args.sweep, grid=grid, horizon=args.horizon,
+        workers=args.workers, min_count=args.min_count, sort_by=args.sort,
+    )
+    elapsed = time.perf_counter() - t0
+    print(
+        f"로드 {load_sec:.1f}초 · 탐색 {elapsed:.1f}초 · {len(results):,}조합 · "
+        f"{len(history.symbols)}종목 {len(history.close):,}봉"
+    )
+    if not results:
+        return
+
+    print("\n" + "=" * 72)
+    print(f"{'순위':<4}{'건수':>9}{f'{args.horizon}일 수익':>10}{'적중':>8}{'초과':>8}  파라미터")
+    print("-" * 72)
+    for rank, r in enumerate(results[:args.top], 1):
+        params = " ".join(f"{k}={v:g}" for k, v in r.params.items())
+        print(
+            f"{rank:<4}{r.count:>9,}{r.avg_return:>9.2f}%{r.hit_rate:>7.1f}%{r.excess:>7.2f}%p  {params}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([r.to_dict() for r in results], ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        print(f"\n저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
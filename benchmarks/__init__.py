@@ -0,0 +1 @@
+"""오프라인 벤치마크 - 합성 시세 + FinanceDataReader 대역 (python -m benchmarks.run)"""
@@ -0,0 +1,102 @@
+"""FinanceDataReader 대역 - 네트워크 없이 합성 시세 제공 (지연·실패율 설정)
+
+src.data.fetcher 의 `fdr` 자리에 그대로 넣어 쓴다 (DataReader, StockListing).
+use_fake_fdr 는 저장소·리스트 캐시·아카이브도 임시 디렉터리로 바꿔 실제 데이터와 섞이지 않게 한다.
+"""
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from .synthetic import SyntheticMarket, kr_universe, us_universe
+
+
+class FakeFDR:
+    """
+    fdr 모듈 대역
+    - latency: 호출당 평균 지연 초, jitter: 지연 표준편차 비율 (0.5 → ±50%)
+    - failure_rate: DataReader 가 ConnectionError 를 낼 확률
+    - n_listing: KOSPI + KOSDAQ 합성 상장 종목 수 (KOSPI 40%)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.5,
+        failure_rate: float = 0.0,
+        n_listing: int = 2500,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.n_listing = n_listing
+        self.market = SyntheticMarket(seed=seed)
+        self.calls = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _wait_or_fail(self) -> None:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self._rng.gauss(self.latency, self.latency * self.jitter))
+            fail = self._rng.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise ConnectionError("fake fdr: 조회 실패")
+
+    def DataReader(self, symbol: str, start=None, end=None, exchange=None) -> pd.DataFrame:  # noqa: N802
+        self._wait_or_fail()
+        return self.market.history(symbol, start, end)
+
+    def StockListing(self, market: str) -> pd.DataFrame:  # noqa: N802
+        self._wait_or_fail()
+        if market == "S&P500":
+            items = us_universe(500)
+            return pd.DataFrame({"Symbol": [c for c, _ in items], "Name": [n for _, n in items]})
+        items = kr_universe(self.n_listing)
+        cut = int(self.n_listing * 0.4)
+        items = items[:cut] if market == "KOSPI" else items[cut:]
+        return pd.DataFrame({"Code": [c for c, _ in items], "Name": [n for _, n in items]})
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.failures = 0
+
+
+@contextmanager
+def use_fake_fdr(fake: FakeFDR, root: str | Path | None = None) -> Iterator[Path]:
+    """
+    fetcher 의 fdr 과 기본 저장소/리스트 캐시/아카이브를 바꿔 끼움 (with 블록 동안)
+    root 를 주지 않으면 임시 디렉터리를 만들고 끝나면 삭제
+    """
+    from src.data import archive, fetcher, listing, store
+
+    saved = (fetcher.fdr, store._default_store, listing._default_cache, archive._default_archive)
+    tmp = tempfile.TemporaryDirectory(prefix="bench-") if root is None else None
+    base = Path(tmp.name if tmp else root)
+    try:
+        fetcher.fdr = fake
+        store._default_store = store.PriceStore(base / "prices")
+        listing._default_cache = listing.ListingCache(base / "listings")
+        archive._default_archive = archive.PriceArchive(base / "archive")
+        yield base
+    finally:
+        # run_market_scan 이 띄운 아카이브 빌드 스레드가 임시 디렉터리에 쓰는 중일 수 있음
+        main = sys.modules.get("main")
+        if main is not None and hasattr(main, "wait_archive_build"):
+            main.wait_archive_build()
+        fetcher.fdr, store._default_store, listing._default_cache, archive._default_archive = saved
+        if tmp:
+            tmp.cleanup()
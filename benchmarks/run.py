@@ -0,0 +1,243 @@
+"""
+벤치마크 실행 - 네트워크 없이 합성 시세(FakeFDR)로 단계별·전체 소요 시간 측정
+실행: python -m benchmarks.run --sizes 15,100,500,3000 --output bench.json
+비교: python -m benchmarks.run --compare before.json after.json
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Windows 콘솔 한글 출력
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+import main
+from src.data import fetch_many, fetch_stock_data
+from src.recommender import (
+    IndicatorPanel,
+    add_technical_indicators,
+    evaluate_rising_star,
+    evaluate_stock,
+)
+
+from .fake_fdr import FakeFDR, use_fake_fdr
+from .synthetic import kr_universe
+
+DEFAULT_SIZES = (15, 100, 500, 3000)
+DAYS = 120
+
+
+def measure(
+    name: str,
+    size: int,
+    fn: Callable[[], object],
+    repeat: int,
+    setup: Callable[[], object] | None = None,
+) -> dict:
+    """fn 을 repeat 번 실행한 소요 시간 (setup 은 매번 fn 직전에, 시간 제외)"""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    median = statistics.median(times)
+    result = {
+        "name": name,
+        "size": size,
+        "repeat": repeat,
+        "min_sec": round(min(times), 6),
+        "median_sec": round(median, 6),
+        "per_item_ms": round(median / size * 1000, 4) if size else None,
+    }
+    print(f"  {name:<32}{size:>6}  {median * 1000:>10.1f} ms  ({result['per_item_ms']} ms/종목)")
+    return result
+
+
+@contextmanager
+def _patched_universe(universe: list[tuple[str, str]]):
+    """run_* 추천 함수들의 종목 풀을 합성 종목으로 교체"""
+    saved = (main.get_watchlist, main.get_market_scan_universe, main.get_rising_star_universe)
+    main.get_watchlist = lambda market="kr": list(universe)
+    main.get_market_scan_universe = lambda market="kr", limit=25: list(universe)
+    main.get_rising_star_universe = lambda limit=80: list(universe)
+    try:
+        yield
+    finally:
+        main.get_watchlist, main.get_market_scan_universe, main.get_rising_star_universe = saved
+
+
+def _frames(fake: FakeFDR, universe: list[tuple[str, str]]) -> list[tuple[str, str, pd.DataFrame]]:
+    """fetch_stock_data 와 같은 형태(소문자 컬럼, 최근 DAYS 일)의 합성 시세"""
+    end = datetime.now()
+    out = []
+    for symbol, name in universe:
+        df = fake.market.history(symbol, end - timedelta(days=DAYS), end)
+        df.columns = [c.lower() for c in df.columns]
+        out.append((symbol, name, df))
+    return out
+
+
+def run_size(size: int, args: argparse.Namespace) -> list[dict]:
+    """종목 수 size 에서 전체 항목 측정"""
+    print(f"\n[{size}종목]")
+    results = []
+    universe = kr_universe(size)
+    fake = FakeFDR(
+        latency=args.latency, failure_rate=args.failure_rate, n_listing=size, seed=args.seed
+    )
+
+    # 합성 시계열 생성 비용은 측정에서 제외
+    for symbol, _ in universe:
+        fake.market.frame(symbol)
+
+    def case(*measure_args, **kwargs) -> dict:
+        """measure + 이 항목에서만 생긴 fdr 호출·실패 수"""
+        fake.reset_counters()
+        result = measure(*measure_args, **kwargs)
+        result["fdr_calls"] = fake.calls
+        result["fdr_failures"] = fake.failures
+        return result
+
+    with use_fake_fdr(fake) as root:
+        from src.data import store
+
+        def fresh_store():
+            store._default_store = store.PriceStore(root / f"prices-{time.monotonic_ns()}")
+
+        def fetch_all():
+            for symbol, _ in universe:
+                fetch_stock_data(symbol, days=DAYS)
+
+        # 1) 시세 조회: 저장소 비어 있음(cold) / 방금 받은 저장소(warm) / 동시 조회
+        results.append(case("fetch_stock_data.cold", size, fetch_all, args.repeat, fresh_store))
+        results.append(case("fetch_stock_data.warm", size, fetch_all, args.repeat))
+        results.append(case(
+            "fetch_many.cold", size, lambda: fetch_many(universe, days=DAYS), args.repeat, fresh_store
+        ))
+        fetch_many(universe, days=DAYS)
+
+        # 2) 지표·평가 (CPU)
+        frames = _frames(fake, universe)
+        results.append(case(
+            "add_technical_indicators", size,
+            lambda: [add_technical_indicators(df) for _, _, df in frames], args.repeat,
+        ))
+        results.append(case(
+            "evaluate_stock", size,
+            lambda: [evaluate_stock(df, s, n) for s, n, df in frames], args.repeat,
+        ))
+        results.append(case(
+            "evaluate_rising_star", size,
+            lambda: [evaluate_rising_star(df, s, n) for s, n, df in frames], args.repeat,
+        ))
+        results.append(case(
+            "IndicatorPanel.evaluate_all", size,
+            lambda: IndicatorPanel.from_frames([(s, df) for s, _, df in frames]).evaluate_all(
+                [n for _, n, _ in frames]
+            ),
+            args.repeat,
+        ))
+
+        # 3) 전체 추천 (저장소가 채워진 상태, 종목 풀은 합성 종목으로 교체)
+        with _patched_universe(universe):
+            results.append(case(
+                "run_trend_recommender", size, lambda: main.run_trend_recommender(), args.repeat
+            ))
+            results.append(case(
+                "run_rising_star_recommender", size,
+                lambda: main.run_rising_star_recommender(limit=size), args.repeat,
+            ))
+            results.append(case(
+                "run_combined_recommender", size,
+                lambda: main.run_combined_recommender(rising_limit=size), args.repeat,
+            ))
+        results.append(case(
+            "run_market_scan", size,
+            lambda: main.run_market_scan("kr", time_budget=3600), args.repeat,
+        ))
+    return results
+
+
+def _git_rev() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, cwd=Path(__file__).resolve().parent,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(before_path: str, after_path: str) -> None:
+    """두 결과 파일의 중앙값 비교 (같은 이름·종목 수끼리)"""
+    before = json.loads(Path(before_path).read_text(encoding="utf-8"))
+    after = json.loads(Path(after_path).read_text(encoding="utf-8"))
+    old = {(r["name"], r["size"]): r for r in before["results"]}
+    print(f"{'항목':<32}{'종목':>6}{'이전 ms':>12}{'이후 ms':>12}{'배율':>8}")
+    for r in after["results"]:
+        prev = old.get((r["name"], r["size"]))
+        if prev is None:
+            continue
+        a, b = prev["median_sec"] * 1000, r["median_sec"] * 1000
+        ratio = a / b if b else float("inf")
+        print(f"{r['name']:<32}{r['size']:>6}{a:>12.1f}{b:>12.1f}{ratio:>7.2f}x")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크 (합성 시세)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="종목 수 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="fdr 호출당 평균 지연 초")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fdr 조회 실패 확률")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="결과 파일 두 개 비교")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results = []
+    for size in sizes:
+        results.extend(run_size(size, args))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "args": {k: v for k, v in vars(args).items() if k != "compare"},
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n저장: {args.output}")
+    else:
+        print(json.dumps(report, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,90 @@
+"""합성 일봉 생성기 - 시드 고정, 조회 구간과 무관하게 같은 날짜는 항상 같은 값
+
+종목마다 EPOCH 부터 오늘까지 전체 시계열을 한 번 만들어 두고, 요청 구간만 잘라 준다.
+(저장소의 추가 조회처럼 구간을 나눠 받아도 이어 붙인 결과가 한 번에 받은 것과 같다)
+"""
+import threading
+import zlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+EPOCH = "2015-01-01"
+
+
+def _seed(symbol: str, seed: int) -> int:
+    return zlib.crc32(f"{seed}:{symbol}".encode())
+
+
+def make_ohlcv(
+    symbol: str, end: str | datetime | None = None, seed: int = 0, kr: bool = True
+) -> pd.DataFrame:
+    """
+    EPOCH ~ end 영업일 일봉 (FinanceDataReader 형식: Open/High/Low/Close/Volume/Change)
+    - kr: 한국식 정수 원 가격 (아니면 센트 단위)
+    - 가격은 로그 정규 랜덤 워크 + 종목별 추세, 거래량은 로그 정규 + 가끔 급증
+    """
+    idx = pd.bdate_range(EPOCH, pd.Timestamp(end or datetime.now()).normalize(), name="Date")
+    rng = np.random.default_rng(_seed(symbol, seed))
+    n = len(idx)
+    drift = rng.normal(0.0002, 0.0005)
+    vol = rng.uniform(0.01, 0.04)
+    base = rng.uniform(1_000, 200_000) if kr else rng.uniform(10, 500)
+    close = base * np.exp(np.cumsum(rng.normal(drift, vol, n)))
+    spread = np.abs(rng.normal(0, vol / 2, (3, n)))
+    open_ = close * (1 + rng.normal(0, vol / 3, n))
+    high = np.maximum(open_, close) * (1 + spread[0])
+    low = np.minimum(open_, close) * (1 - spread[1])
+    volume = rng.lognormal(np.log(rng.uniform(1e4, 1e6)), 0.5, n)
+    volume[rng.random(n) < 0.02] *= rng.uniform(2, 6)
+
+    decimals = 0 if kr else 2
+    df = pd.DataFrame(
+        {
+            "Open": np.round(open_, decimals),
+            "High": np.round(high, decimals),
+            "Low": np.round(low, decimals),
+            "Close": np.round(close, decimals),
+            "Volume": volume.astype(np.int64),
+        },
+        index=idx,
+    )
+    df["Change"] = df["Close"].pct_change()
+    return df
+
+
+class SyntheticMarket:
+    """종목별 합성 시계열 캐시 (스레드 안전)"""
+
+    def __init__(self, seed: int = 0, end: str | datetime | None = None):
+        self.seed = seed
+        self.end = pd.Timestamp(end or datetime.now()).normalize()
+        self._frames: dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        with self._lock:
+            df = self._frames.get(symbol)
+        if df is None:
+            df = make_ohlcv(symbol, self.end, self.seed, kr=symbol.isdigit())
+            with self._lock:
+                self._frames.setdefault(symbol, df)
+        return df
+
+    def history(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """start~end 구간 (양 끝 포함, 복사본)"""
+        df = self.frame(symbol)
+        lo = pd.Timestamp(start).normalize() if start is not None else df.index[0]
+        hi = pd.Timestamp(end).normalize() if end is not None else df.index[-1]
+        return df.loc[lo:hi].copy()
+
+
+def kr_universe(n: int) -> list[tuple[str, str]]:
+    """합성 한국 종목 리스트 [(6자리 코드, 이름), ...]"""
+    return [(f"{900000 + i:06d}", f"합성{i}") for i in range(n)]
+
+
+def us_universe(n: int) -> list[tuple[str, str]]:
+    """합성 미국 티커 리스트"""
+    return [(f"SYN{i}", f"Synthetic {i}") for i in range(n)]
@@ -1,4 +1,52 @@
 """설정 모듈"""
-from .settings import get, OPENAI_API_KEY
+from .settings import (
+    BACKGROUND_REFRESH,
+    FETCH_TIMEOUT,
+    FETCH_WORKERS,
+    LISTING_CACHE_DIR,
+    LISTING_TTL_SEC,
+    OPENAI_API_KEY,
+    PRICE_ARCHIVE_DIR,
+    PRICE_REFRESH_SEC,
+    PRICE_STORE_DIR,
+    PROFILE_TOKEN,
+    REFRESH_IDLE_SEC,
+    REFRESH_INTERVAL_SEC,
+    REFRESH_LEAD_SEC,
+    RESULT_CACHE_PATH,
+    SCAN_MEMORY_MB,
+    SCAN_TIME_BUDGET_SEC,
+    SCAN_TOP_N,
+    SIGNAL_HISTORY_DIR,
+    SIGNAL_HISTORY_RUNS,
+    SNAPSHOT_DIR,
+    STALE_MAX_SEC,
+    WARM_START_MAX_SEC,
+    get,
+)
 
-__all__ = ["get", "OPENAI_API_KEY"]
+__all__ = [
+    "get",
+    "OPENAI_API_KEY",
+    "PRICE_STORE_DIR",
+    "PRICE_REFRESH_SEC",
+    "PRICE_ARCHIVE_DIR",
+    "FETCH_WORKERS",
+    "FETCH_TIMEOUT",
+    "LISTING_CACHE_DIR",
+    "LISTING_TTL_SEC",
+    "BACKGROUND_REFRESH",
+    "REFRESH_LEAD_SEC",
+    "REFRESH_INTERVAL_SEC",
+    "REFRESH_IDLE_SEC",
+    "STALE_MAX_SEC",
+    "RESULT_CACHE_PATH",
+    "SNAPSHOT_DIR",
+    "WARM_START_MAX_SEC",
+    "SIGNAL_HISTORY_DIR",
+    "SIGNAL_HISTORY_RUNS",
+    "PROFILE_TOKEN",
+    "SCAN_MEMORY_MB",
+    "SCAN_TIME_BUDGET_SEC",
+    "SCAN_TOP_N",
+]
@@ -5,7 +5,8 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 # 프로젝트 루트 기준 .env 로드
-_env_path = Path(__file__).resolve().parent.parent / ".env"
+_ROOT = Path(__file__).resolve().parent.parent
+_env_path = _ROOT / ".env"
 load_dotenv(_env_path)
 
 
@@ -16,3 +17,50 @@ def get(key: str, default: str = "") -> str:
 
 # 선택적 API 키 (AI 분석 시에만 사용)
 OPENAI_API_KEY = get("OPENAI_API_KEY")
+
+# 로컬 시세 저장소 (종목별 일봉 파일)
+PRICE_STORE_DIR = get("PRICE_STORE_DIR", str(_ROOT / "data" / "prices"))
+# 마지막 조회 후 이 시간(초) 안에는 네트워크 없이 저장소만 사용
+PRICE_REFRESH_SEC = int(get("PRICE_REFRESH_SEC", "300"))
+# 전 종목 시세 아카이브 (메모리 매핑 컬럼 파일, python -m src.data.archive 로 빌드)
+PRICE_ARCHIVE_DIR = get("PRICE_ARCHIVE_DIR", str(_ROOT / "data" / "archive"))
+
+# 종목 시세 동시 조회 (스레드 수, 종목당 제한 시간 초)
+FETCH_WORKERS = int(get("FETCH_WORKERS", "8"))
+FETCH_TIMEOUT = float(get("FETCH_TIMEOUT", "20"))
+
+# 종목 리스트 캐시 (KOSPI/KOSDAQ 전체 리스트, 유효 시간 초)
+LISTING_CACHE_DIR = get("LISTING_CACHE_DIR", str(_ROOT / "data" / "listings"))
+LISTING_TTL_SEC = int(get("LISTING_TTL_SEC", "21600"))
+
+# 웹앱 백그라운드 갱신 (캐시 만료 REFRESH_LEAD_SEC 전에 미리 계산)
+BACKGROUND_REFRESH = get("BACKGROUND_REFRESH", "1") == "1"
+REFRESH_LEAD_SEC = int(get("REFRESH_LEAD_SEC", "60"))
+REFRESH_INTERVAL_SEC = int(get("REFRESH_INTERVAL_SEC", "15"))
+# 이 시간(초) 동안 조회가 없던 조합은 갱신 중단
+REFRESH_IDLE_SEC = int(get("REFRESH_IDLE_SEC", "3600"))
+# 만료 후 이 시간(초)까지는 이전 결과를 즉시 응답하고 백그라운드에서 갱신
+STALE_MAX_SEC = int(get("STALE_MAX_SEC", "1800"))
+
+# 웹앱 결과 캐시 공유 파일 (SQLite, 모든 gunicorn 워커가 공유). 빈 값이면 워커별 메모리 캐시
+RESULT_CACHE_PATH = get("RESULT_CACHE_PATH", str(_ROOT / "data" / "results.sqlite3"))
+
+# 재기동 직후 응답용 최근 결과 스냅숏 (market/scope 별 JSON). 빈 값이면 사용 안 함
+SNAPSHOT_DIR = get("SNAPSHOT_DIR", str(_ROOT / "data" / "snapshots"))
+# 재기동 후 첫 계산 전까지 이 시간(초) 안의 스냅숏은 이전 결과로 바로 응답 + 백그라운드 갱신
+WARM_START_MAX_SEC = int(get("WARM_START_MAX_SEC", "604800"))
+
+# 실행별 종목 신호 기록 (변화 조회 /api/changes, CLI 변화 출력). 빈 값이면 사용 안 함
+SIGNAL_HISTORY_DIR = get("SIGNAL_HISTORY_DIR", str(_ROOT / "data" / "signals"))
+# market/scope 별로 보관할 최근 실행 수
+SIGNAL_HISTORY_RUNS = int(get("SIGNAL_HISTORY_RUNS", "50"))
+
+# /api/run?profile=1 (캐시 없이 새로 계산 + 단계별 시간) 에 필요한 토큰 (X-Profile-Token 헤더).
+# 빈 값이면 profile 요청은 거부
+PROFILE_TOKEN = get("PROFILE_TOKEN")
+
+# 전체 시장 스캔 (웹앱 '시장 스캔'): 메모리 한도(MB), 응답 제한 시간(초), 표시할 상위 종목 수
+# 제한 시간이 지나면 남은 종목은 추가 조회 없이 저장된 시세로 평가
+SCAN_MEMORY_MB = int(get("SCAN_MEMORY_MB", "256"))
+SCAN_TIME_BUDGET_SEC = float(get("SCAN_TIME_BUDGET_SEC", "25"))
+SCAN_TOP_N = int(get("SCAN_TOP_N", "30"))
@@ -2,94 +2,204 @@
 추천 결과를 HTML 파일로 저장
 생성된 report.html을 아이폰으로 전송(에어드롭 등) 후 Safari에서 열기
 실행: python export_report.py
+      python export_report.py --all --out site   # 한국/미국 × 관심종목/시장 보고서 + 목차 (index.html)
 """
+import argparse
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).resolve().parent))
-
-from main import run_rising_star_recommender, run_trend_recommender
+from jinja2 import DictLoader, Environment
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-def rec_to_dict(r):
-    return {
-        "symbol": r.symbol,
-        "name": r.name,
-        "price": int(r.current_price),
-        "score": r.score,
-        "signal": r.signal,
-        "reasons": r.reasons,
-    }
-
+from main import run_combined_recommender, run_combined_reports
+from src.data import data_context
 
-def generate_html(trend, rising) -> str:
-    now = datetime.now().strftime("%Y-%m-%d %H:%M")
-    trend_json = [rec_to_dict(r) for r in trend]
-    rising_json = [rec_to_dict(r) for r in rising[:15]]
+MARKETS = {"kr": "한국", "us": "미국"}
+SCOPES = {"watchlist": "관심종목", "market": "시장 상위"}
+ALL_REPORTS = [(m, s) for m in MARKETS for s in SCOPES]
+TAG_CLASS = {"매수": "tag-buy", "관망": "tag-watch", "주의": "tag-warn", "샛별": "tag-star"}
 
-    html = f"""<!DOCTYPE html>
+TEMPLATES = {
+    "base.html": """<!DOCTYPE html>
 <html lang="ko">
 <head>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width,initial-scale=1,user-scalable=yes">
-<title>주식 추천 | {now}</title>
+<title>{% block title %}{% endblock %} | {{ now }}</title>
 <style>
-*{{box-sizing:border-box;margin:0;padding:0}}
-body{{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',sans-serif;padding:12px;background:#f5f5f5;font-size:15px;line-height:1.5}}
-h1{{font-size:18px;margin-bottom:8px;color:#333}}
-h2{{font-size:16px;margin:16px 0 8px;color:#444;border-bottom:1px solid #ddd;padding-bottom:4px}}
-.card{{background:#fff;border-radius:8px;padding:12px;margin-bottom:10px;box-shadow:0 1px 3px rgba(0,0,0,.08)}}
-.symbol{{font-weight:600;color:#0066cc}}
-.price{{color:#333;margin:4px 0}}
-.tag{{display:inline-block;padding:2px 8px;border-radius:4px;font-size:12px;margin-right:6px}}
-.tag-buy{{background:#e8f5e9;color:#2e7d32}}
-.tag-watch{{background:#fff3e0;color:#e65100}}
-.tag-warn{{background:#ffebee;color:#c62828}}
-.tag-star{{background:#e3f2fd;color:#1565c0}}
-ul{{margin:6px 0 0 20px;font-size:14px;color:#555}}
-.caption{{font-size:12px;color:#888;margin-top:16px}}
+*{box-sizing:border-box;margin:0;padding:0}
+body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',sans-serif;padding:12px;background:#f5f5f5;font-size:15px;line-height:1.5}
+h1{font-size:18px;margin-bottom:8px;color:#333}
+h2{font-size:16px;margin:16px 0 8px;color:#444;border-bottom:1px solid #ddd;padding-bottom:4px}
+a{color:#0066cc;text-decoration:none}
+.card{display:block;background:#fff;border-radius:8px;padding:12px;margin-bottom:10px;box-shadow:0 1px 3px rgba(0,0,0,.08)}
+.symbol{font-weight:600;color:#0066cc}
+.price{color:#333;margin:4px 0}
+.tag{display:inline-block;padding:2px 8px;border-radius:4px;font-size:12px;margin-right:6px}
+.tag-buy{background:#e8f5e9;color:#2e7d32}
+.tag-watch{background:#fff3e0;color:#e65100}
+.tag-warn{background:#ffebee;color:#c62828}
+.tag-star{background:#e3f2fd;color:#1565c0}
+ul{margin:6px 0 0 20px;font-size:14px;color:#555}
+.caption{font-size:12px;color:#888;margin-top:16px}
 </style>
 </head>
 <body>
-<h1>주식 추천</h1>
-<p class="caption">생성: {now} · 토스증권 앱에서 수동 매매</p>
+{% block body %}{% endblock %}
+<p class="caption">※ 참고용. 투자 책임은 본인에게 있습니다.</p></body></html>
+""",
+    "report.html": """{% extends "base.html" %}
+{% macro card(r) %}<div class="card"><span class="tag {{ r.tag }}">{{ r.signal }}</span><span class="symbol">[{{ r.symbol }}] {{ r.name }}</span><p class="price">{{ r.price_text }} · 점수 {{ r.score }}</p><ul>{% for reason in r.reasons %}<li>{{ reason }}</li>{% endfor %}</ul></div>
+{% endmacro %}
+{% block title %}{{ title }}{% endblock %}
+{% block body %}
+{% if index %}<p class="caption"><a href="{{ index }}">← 목차</a></p>{% endif %}
+<h1>{{ title }}</h1>
+<p class="caption">생성: {{ now }} · 토스증권 앱에서 수동 매매</p>
 
 <h2>추세 기반 (매수/관망)</h2>
-"""
+{% for r in trend %}{{ card(r) }}{% else %}<div class="card">조건에 맞는 종목이 없습니다.</div>
+{% endfor %}
+{% if show_rising %}
+<h2>떠오르는 샛별</h2>
+{% for r in rising %}{{ card(r) }}{% else %}<div class="card">조건에 맞는 종목이 없습니다.</div>
+{% endfor %}
+{% endif %}
+{% endblock %}
+""",
+    "index.html": """{% extends "base.html" %}
+{% block title %}주식 추천{% endblock %}
+{% block body %}
+<h1>주식 추천</h1>
+<p class="caption">생성: {{ now }} · 추천 종목 {{ n_symbols }}개 · 분석 {{ elapsed }}초</p>
+{% for p in pages %}<a class="card" href="{{ p.href }}"><span class="symbol">{{ p.title }}</span><p class="price">매수 {{ p.buy }} · 관망 {{ p.watch }}{% if p.show_rising %} · 샛별 {{ p.rising }}{% endif %}</p></a>
+{% endfor %}
+{% endblock %}
+""",
+}
 
-    for r in trend_json:
-        tag_class = "tag-buy" if r["signal"] == "매수" else "tag-watch" if r["signal"] == "관망" else "tag-warn"
-        html += f'<div class="card"><span class="tag {tag_class}">{r["signal"]}</span>'
-        html += f'<span class="symbol">[{r["symbol"]}] {r["name"]}</span>'
-        html += f'<p class="price">{r["price"]:,}원 · 점수 {r["score"]}</p>'
-        html += "<ul>"
-        for reason in r["reasons"][:3]:
-            html += f"<li>{reason}</li>"
-        html += "</ul></div>"
-
-    html += "<h2>떠오르는 샛별</h2>"
-    if rising_json:
-        for r in rising_json:
-            html += f'<div class="card"><span class="tag tag-star">샛별</span>'
-            html += f'<span class="symbol">[{r["symbol"]}] {r["name"]}</span>'
-            html += f'<p class="price">{r["price"]:,}원 · 점수 {r["score"]}</p>'
-            html += "<ul>"
-            for reason in r["reasons"][:4]:
-                html += f"<li>{reason}</li>"
-            html += "</ul></div>"
-    else:
-        html += '<div class="card">조건에 맞는 종목이 없습니다.</div>'
-
-    html += '<p class="caption">※ 참고용. 투자 책임은 본인에게 있습니다.</p></body></html>'
-    return html
+# 템플릿은 한 번만 컴파일해 보고서마다 재사용
+_env = Environment(loader=DictLoader(TEMPLATES), autoescape=True, trim_blocks=True, lstrip_blocks=True)
+
+
+def rec_to_dict(r, max_reasons: int, market: str = "kr"):
+    price = f"${r.current_price:,.2f}" if market == "us" else f"{int(r.current_price):,}원"
+    return {
+        "symbol": r.symbol,
+        "name": r.name,
+        "price": int(r.current_price),
+        "price_text": price,
+        "score": r.score,
+        "signal": r.signal,
+        "tag": TAG_CLASS.get(r.signal, "tag-warn"),
+        "reasons": r.render_reasons(max_reasons),
+    }
+
+
+def report_title(market: str, scope: str) -> str:
+    return f"주식 추천 · {MARKETS[market]} {SCOPES[scope]}"
+
+
+def generate_html(
+    trend, rising, market: str = "kr", title: str = "주식 추천", index: str | None = None
+) -> str:
+    """추천 결과 → HTML 문서 (index: 목차 페이지 링크, 정적 사이트에서)"""
+    return _env.get_template("report.html").render(
+        title=title,
+        now=datetime.now().strftime("%Y-%m-%d %H:%M"),
+        index=index,
+        trend=[rec_to_dict(r, 3, market) for r in trend],
+        rising=[rec_to_dict(r, 4, market) for r in rising[:15]],
+        show_rising=market == "kr",
+    )
+
+
+def export_site(
+    reports: list[tuple[str, str]], out_dir: Path, rising_limit: int = 80
+) -> list[Path]:
+    """
+    여러 보고서를 정적 사이트로 저장 ({market}-{scope}.html + index.html)
+    - 보고서들의 종목 풀을 합쳐 한 번만 조회·평가 (run_combined_reports)
+    - 샛별은 한국 보고서에만
+    Returns: 저장한 파일 경로 (index.html 마지막)
+    """
+    t0 = time.perf_counter()
+    plan = [(m, s, rising_limit if m == "kr" else 0) for m, s in reports]
+    results = run_combined_reports(plan)
+    elapsed = time.perf_counter() - t0
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths, pages, symbols = [], [], set()
+    for market, scope in reports:
+        trend, rising = results[(market, scope)]
+        symbols.update(r.symbol for r in trend + rising)
+        title = report_title(market, scope)
+        path = out_dir / f"{market}-{scope}.html"
+        path.write_text(
+            generate_html(trend, rising, market, title, index="index.html"), encoding="utf-8"
+        )
+        paths.append(path)
+        pages.append({
+            "href": path.name,
+            "title": title,
+            "buy": sum(r.signal == "매수" for r in trend),
+            "watch": sum(r.signal == "관망" for r in trend),
+            "rising": len(rising),
+            "show_rising": market == "kr",
+        })
+    index = out_dir / "index.html"
+    index.write_text(
+        _env.get_template("index.html").render(
+            now=datetime.now().strftime("%Y-%m-%d %H:%M"),
+            pages=pages,
+            n_symbols=len(symbols),
+            elapsed=f"{elapsed:.1f}",
+        ),
+        encoding="utf-8",
+    )
+    paths.append(index)
+    return paths
+
+
+def parse_reports(text: str) -> list[tuple[str, str]]:
+    """'kr:watchlist,us:market' → [("kr", "watchlist"), ("us", "market")]"""
+    reports = []
+    for item in text.split(","):
+        market, _, scope = item.strip().partition(":")
+        scope = scope or "watchlist"
+        if market not in MARKETS or scope not in SCOPES:
+            raise argparse.ArgumentTypeError(f"보고서 형식: kr|us[:watchlist|market] ({item})")
+        if (market, scope) not in reports:
+            reports.append((market, scope))
+    return reports
 
 
 def main():
+    parser = argparse.ArgumentParser(description="추천 결과 HTML 저장")
+    parser.add_argument("--all", action="store_true", help="한국/미국 × 관심종목/시장 보고서 전부")
+    parser.add_argument("--reports", type=parse_reports, help="보고서 목록 (예: kr:watchlist,us:market)")
+    parser.add_argument("--out", default="site", help="정적 사이트 디렉터리 (--all/--reports)")
+    parser.add_argument("--rising-limit", type=int, default=80, help="한국 보고서 샛별 종목 수")
+    args = parser.parse_args()
+
+    reports = ALL_REPORTS if args.all else args.reports
+    if reports:
+        print(f"추천 분석 중... (보고서 {len(reports)}개)")
+        with data_context() as data:
+            paths = export_site(reports, Path(args.out), args.rising_limit)
+        for path in paths:
+            print(f"저장: {path}")
+        print(data.summary())
+        print(f"\n→ {paths[-1].absolute()} 를 열면 보고서 목록")
+        return
+
     print("추천 분석 중...")
-    trend = run_trend_recommender()
-    rising = run_rising_star_recommender()
-    print(f"추세: {len(trend)}종목, 샛별: {len(rising)}종목")
+    with data_context() as data:
+        trend, rising = run_combined_recommender(rising_limit=args.rising_limit)
+    print(f"추세: {len(trend)}종목, 샛별: {len(rising)}종목 · {data.summary()}")
 
     html = generate_html(trend, rising)
     out_path = Path(__file__).parent / "report.html"
@@ -0,0 +1,76 @@
+"""
+장중 모드 - 분봉이 들어올 때마다 잠정 일봉으로 추세/샛별 신호를 갱신해 바뀐 종목만 출력
+실행: python intraday.py --replay data/minute/2026-10-16.csv --speed 60
+"""
+import argparse
+import io
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Windows 콘솔 한글 출력
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from main import start_intraday
+from src.data import FileReplayFeed
+from src.recommender import save_states
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장중 신호 갱신 (분봉 피드)")
+    parser.add_argument("--replay", required=True, help="분봉 CSV (symbol,time,open,high,low,close,volume)")
+    parser.add_argument("--speed", type=float, default=0, help="재생 속도 배율 (0: 기다리지 않음, 60: 1분 → 1초)")
+    parser.add_argument("--market", choices=["kr", "us"], default="kr")
+    parser.add_argument("--scope", choices=["watchlist", "market"], default="watchlist")
+    parser.add_argument("--rising-limit", type=int, default=80, help="샛별 종목 수 (0 이면 생략)")
+    parser.add_argument("--day", help="세션 날짜 YYYY-MM-DD (기본: 재생 파일 첫 분봉 날짜)")
+    parser.add_argument("--json", action="store_true", help="신호 변화를 한 줄에 하나씩 JSON 으로 출력")
+    parser.add_argument("--save-states", help="종료 시 당일 봉까지 반영한 지표 상태 저장 경로 (JSON)")
+    args = parser.parse_args()
+
+    feed = FileReplayFeed(args.replay, speed=args.speed)
+    first = feed.first_time()
+    day = date.fromisoformat(args.day) if args.day else (first.date() if first else None)
+
+    t0 = time.perf_counter()
+    session = start_intraday(args.market, args.scope, args.rising_limit, day)
+    print(f"준비 {time.perf_counter() - t0:.1f}초 · {len(session.states)}종목 · {day}", file=sys.stderr)
+
+    n_batches = n_changes = 0
+    busy = 0.0
+    for batch in feed.batches():
+        t = time.perf_counter()
+        changes = session.ingest(batch)
+        busy += time.perf_counter() - t
+        n_batches += 1
+        n_changes += len(changes)
+        for c in changes:
+            if args.json:
+                print(json.dumps(c.to_dict(), ensure_ascii=False), flush=True)
+                continue
+            rec = c.recommendation
+            detail = f" (점수 {rec.score}, {rec.current_price:,.0f})" if rec else ""
+            print(
+                f"{c.time:%H:%M} [{c.symbol}] {c.name} {c.strategy}: "
+                f"{c.before or '-'} → {c.after or '-'}{detail}",
+                flush=True,
+            )
+
+    if n_batches:
+        print(
+            f"분봉 묶음 {n_batches:,}개 · 신호 변화 {n_changes:,}건 · 묶음당 평균 {busy / n_batches * 1000:.1f}ms",
+            file=sys.stderr,
+        )
+    if args.save_states:
+        session.close_day()
+        save_states(args.save_states, session.states)
+        print(f"저장: {args.save_states}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
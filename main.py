@@ -4,9 +4,16 @@
 - 토스증권 앱에서 수동 매수/매도 진행
 """
 import io
+import logging
 import sys
+import threading
+import time
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
 # Windows 콘솔 한글 출력
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
@@ -14,54 +21,393 @@ if sys.platform == "win32":
 # 프로젝트 루트를 path에 추가
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+from config import (
+    PRICE_REFRESH_SEC,
+    SCAN_MEMORY_MB,
+    SCAN_TIME_BUDGET_SEC,
+    SCAN_TOP_N,
+    SIGNAL_HISTORY_DIR,
+    SIGNAL_HISTORY_RUNS,
+)
 from src.data import (
-    fetch_stock_data,
+    PriceArchive,
+    PriceWindow,
+    data_context,
+    fetch_many,
+    get_price_archive,
+    iter_fetch,
+    get_full_market_universe,
     get_market_scan_universe,
     get_rising_star_universe,
     get_watchlist,
 )
+from src.data.archive import COLUMNS as ARCHIVE_COLUMNS
+from src.data.store import get_price_store
+from src.service import SignalHistory
+from src.utils.metrics import stage
 from src.recommender import (
+    RISING_ONLY,
+    CompactPanel,
+    IndicatorPanel,
+    IntradaySession,
+    RankFilter,
     Recommendation,
-    evaluate_rising_star,
-    evaluate_stock,
+    ScanResult,
+    TopK,
+    evaluate_all,
+    rank_panel,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _trend_universe(market: str, scope: str) -> list[tuple[str, str]]:
+    """추세 스크리닝 대상 (scope: 'watchlist'|'market')"""
+    if scope == "market":
+        return get_market_scan_universe(market=market, limit=25)
+    return get_watchlist(market=market)
+
+
+def _rank(
+    panel: IndicatorPanel,
+    names: list[str],
+    category: str,
+    top_k: int | None,
+    where: RankFilter | None,
+) -> list[Recommendation]:
+    """패널 전 종목을 한 전략으로 평가하며 조건에 맞는 상위 top_k 개만 유지"""
+    ranking = TopK(top_k, where)
+    with stage("scoring"):
+        ranking.extend(panel.iter_evaluate(names, category=category))
+    return ranking.results()
+
 
 def run_trend_recommender(
-    market: str = "kr", scope: str = "watchlist"
+    market: str = "kr",
+    scope: str = "watchlist",
+    top_k: int | None = None,
+    where: RankFilter | None = None,
 ) -> list[Recommendation]:
-    """추세 기반 스크리닝. market: 'kr'|'us', scope: 'watchlist'|'market'"""
-    if scope == "market":
-        watchlist = get_market_scan_universe(market=market, limit=25)
-    else:
-        watchlist = get_watchlist(market=market)
-    results: list[Recommendation] = []
-
-    for symbol, name in watchlist:
-        df = fetch_stock_data(symbol, days=120)
-        rec = evaluate_stock(df, symbol, name)
-        if rec:
-            results.append(rec)
-    results.sort(key=lambda r: r.score, reverse=True)
-    return results
+    """
+    추세 기반 스크리닝. market: 'kr'|'us', scope: 'watchlist'|'market'
+    - top_k: 점수 상위 몇 개만 (None 이면 전부), where: 신호·최소 점수 등 조건
+    """
+    with stage("universe"):
+        watchlist = _trend_universe(market, scope)
+    with stage("fetch"):
+        fetched = fetch_many(watchlist, days=120)
+    with stage("indicators"):
+        panel = IndicatorPanel.from_frames([(s, df) for s, _, df in fetched])
+    return _rank(panel, [n for _, n, _ in fetched], "trend", top_k, where)
+
 
+def run_rising_star_recommender(
+    limit: int = 80, top_k: int | None = None, where: RankFilter | None = None
+) -> list[Recommendation]:
+    """샛별형 스크리닝 (거래량 급증, 고점 돌파, 모멘텀). '샛별' 신호만, 조건·top_k 는 추세와 같음"""
+    with stage("universe"):
+        universe = get_rising_star_universe(limit=limit)
+    with stage("fetch"):
+        fetched = fetch_many(universe, days=120)
+    with stage("indicators"):
+        panel = IndicatorPanel.from_frames([(s, df) for s, _, df in fetched])
+    return _rank(panel, [n for _, n, _ in fetched], "rising_star", top_k, RISING_ONLY.merge(where))
 
-def run_rising_star_recommender(limit: int = 80) -> list[Recommendation]:
-    """샛별형 스크리닝 (거래량 급증, 고점 돌파, 모멘텀)"""
-    universe = get_rising_star_universe(limit=limit)
-    results: list[Recommendation] = []
 
-    for symbol, name in universe:
-        df = fetch_stock_data(symbol, days=120)
-        rec = evaluate_rising_star(df, symbol, name)
-        if rec and rec.signal == "샛별":
-            results.append(rec)
-    results.sort(key=lambda r: r.score, reverse=True)
+def _combined_universe(
+    market: str, scope: str, rising_limit: int
+) -> tuple[list[tuple[str, str]], dict[str, list[str]]]:
+    """추세·샛별 종목 풀 합집합과 종목별 적용 전략 목록"""
+    watchlist = _trend_universe(market, scope)
+    universe = get_rising_star_universe(limit=rising_limit) if rising_limit else []
+
+    members: dict[str, list[str]] = {}
+    combined: list[tuple[str, str]] = []
+    for key, pool in (("trend", watchlist), ("rising_star", universe)):
+        for symbol, name in pool:
+            if symbol not in members:
+                members[symbol] = []
+                combined.append((symbol, name))
+            if key not in members[symbol]:
+                members[symbol].append(key)
+    return combined, members
+
+
+def run_combined_recommender(
+    market: str = "kr",
+    scope: str = "watchlist",
+    rising_limit: int = 80,
+    top_k: int | None = None,
+    where: RankFilter | None = None,
+) -> tuple[list[Recommendation], list[Recommendation]]:
+    """
+    추세 + 샛별 동시 스크리닝
+    - 두 종목 풀의 합집합을 한 번만 조회하고, 지표도 종목당 한 번만 계산
+    - rising_limit=0 이면 샛별 생략
+    - top_k, where: 각 목록에 적용할 상위 개수·조건 (평가하면서 상위 top_k 개만 유지)
+    Returns: (추세 결과, 샛별 결과) - 각각 run_trend_recommender/run_rising_star_recommender 와 동일
+    """
+    with stage("universe"):
+        combined, members = _combined_universe(market, scope, rising_limit)
+    with stage("fetch"):
+        fetched = fetch_many(combined, days=120)
+    with stage("indicators"):
+        panel = IndicatorPanel.from_frames([(s, df) for s, _, df in fetched])
+    trend = TopK(top_k, where)
+    rising = TopK(top_k, RISING_ONLY.merge(where))
+    with stage("scoring"):
+        for i, (symbol, name, _) in enumerate(fetched):
+            recs = evaluate_all(panel.snapshot(i), symbol, name, members[symbol])
+            trend.push(recs.get("trend"))
+            rising.push(recs.get("rising_star"))
+    return trend.results(), rising.results()
+
+
+def run_combined_reports(
+    reports: list[tuple[str, str, int]],
+) -> dict[tuple[str, str], tuple[list[Recommendation], list[Recommendation]]]:
+    """
+    여러 보고서를 한 번에 - reports: [(market, scope, rising_limit), ...]
+    - 모든 보고서 종목 풀의 합집합을 한 번만 조회하고, 지표·전략 평가도 종목당 한 번만
+    - 평가 결과를 종목이 속한 보고서들에 나눠 담음
+    Returns: {(market, scope): (추세 결과, 샛별 결과)} - 보고서마다 run_combined_recommender 와 동일
+    """
+    with stage("universe"):
+        plans = [
+            (market, scope, *_combined_universe(market, scope, rising_limit))
+            for market, scope, rising_limit in reports
+        ]
+        strategies: dict[str, list[str]] = {}
+        union: list[tuple[str, str]] = []
+        for _, _, combined, members in plans:
+            for symbol, name in combined:
+                if symbol not in strategies:
+                    strategies[symbol] = []
+                    union.append((symbol, name))
+                for key in members[symbol]:
+                    if key not in strategies[symbol]:
+                        strategies[symbol].append(key)
+    with stage("fetch"):
+        fetched = fetch_many(union, days=120)
+    with stage("indicators"):
+        panel = IndicatorPanel.from_frames([(s, df) for s, _, df in fetched])
+    with stage("scoring"):
+        evaluated = {
+            symbol: evaluate_all(panel.snapshot(i), symbol, name, strategies[symbol])
+            for i, (symbol, name, _) in enumerate(fetched)
+        }
+    results = {}
+    for market, scope, combined, members in plans:
+        trend, rising = TopK(), TopK(where=RISING_ONLY)
+        for symbol, _ in combined:
+            recs = evaluated[symbol]
+            if "trend" in members[symbol]:
+                trend.push(recs.get("trend"))
+            if "rising_star" in members[symbol]:
+                rising.push(recs.get("rising_star"))
+        results[(market, scope)] = (trend.results(), rising.results())
     return results
 
 
+def iter_combined_recommender(
+    market: str = "kr", scope: str = "watchlist", rising_limit: int = 80
+) -> Iterator[tuple[int, int, dict[str, Recommendation]]]:
+    """
+    run_combined_recommender 의 스트리밍 버전 - 종목 조회가 끝나는 대로 평가해 바로 반환
+    Yields: (처리한 종목 수, 전체 종목 수, {"trend"|"rising_star": Recommendation})
+    - 종목마다 한 번 (결과 없는 종목은 빈 dict), 샛별은 signal == "샛별" 인 것만
+    - 정렬은 호출 측에서
+    """
+    with stage("universe"):
+        combined, members = _combined_universe(market, scope, rising_limit)
+    total = len(combined)
+    for n_done, (_, symbol, name, df) in enumerate(iter_fetch(combined, days=120), start=1):
+        with stage("scoring"):
+            recs = evaluate_all(df, symbol, name, members[symbol])
+        out = {}
+        if recs.get("trend"):
+            out["trend"] = recs["trend"]
+        rec = recs.get("rising_star")
+        if rec and rec.signal == "샛별":
+            out["rising_star"] = rec
+        yield n_done, total, out
+
+
+def iter_market_scan(
+    market: str = "kr",
+    top_n: int | None = None,
+    time_budget: float | None = None,
+    memory_mb: float | None = None,
+    days: int = 120,
+    where: RankFilter | None = None,
+) -> Iterator[tuple[int, int, ScanResult | None]]:
+    """
+    전체 시장 스캔 (한국: KOSPI+KOSDAQ 전 종목, 미국: S&P 500 등) - 추세 + 샛별(한국만) 순위
+    - 아카이브(PriceArchive)에 PRICE_REFRESH_SEC 안에 받은 시세가 있으면 조회 없이 그대로 사용
+    - time_budget: 제한 시간 초 (기본 SCAN_TIME_BUDGET_SEC). 나머지 종목은 시간의 60% 까지만 조회하고,
+      못 받은 종목은 90% 까지 네트워크 없이 아카이브/저장소 시세로 채운 뒤 순위 계산
+    - memory_mb: 패널 + 지표 계산 메모리 한도 (기본 SCAN_MEMORY_MB). 패널이 절반을 넘으면 이후 종목 제외
+    - where: 순위 조건 (신호·최소 점수·전략), 점수 배열에서 바로 걸러 top_n 개를 채운다
+    - 스캔 후 아카이브가 PRICE_REFRESH_SEC 보다 오래됐으면 백그라운드에서 다시 빌드
+    Yields: 조회 중 (처리 종목 수, 전체 종목 수, None), 마지막에 (.., .., ScanResult)
+    """
+    started = time.monotonic()
+    top_n = top_n or SCAN_TOP_N
+    time_budget = SCAN_TIME_BUDGET_SEC if time_budget is None else time_budget
+    memory = int((memory_mb or SCAN_MEMORY_MB) * 2**20)
+    strategies = ("trend", "rising_star") if market == "kr" else ("trend",)
+    start = (datetime.now() - timedelta(days=days)).date()
+
+    with stage("universe"):
+        universe = get_full_market_universe(market)
+    total = len(universe)
+    # 한국 주가는 정수 원이라 float32 로 충분, 미국 주가(센트)는 evaluate_stock 과 같게 float64
+    panel = CompactPanel(
+        memory_bytes=int(memory * CompactPanel.PANEL_SHARE),
+        price_dtype=np.float32 if market == "kr" else np.float64,
+    )
+    archive = get_price_archive()
+    done = [False] * total
+    dropped = from_archive = n_done = 0
+
+    def add(symbol: str, name: str, window: PriceWindow) -> None:
+        nonlocal dropped
+        if not panel.append(symbol, name, window.close, window.high, window.volume):
+            dropped += 1
+
+    # 1) 아카이브의 최근 시세 (복사 없는 view 에서 바로 패널로)
+    now = time.time()
+    with stage("archive"):
+        for i, (symbol, name) in enumerate(universe):
+            covered_from = archive.covered_from(symbol)
+            if (
+                covered_from is not None
+                and covered_from <= start
+                and now - archive.fetched_at(symbol) < PRICE_REFRESH_SEC
+            ):
+                add(symbol, name, archive.window(symbol, start=start))
+                done[i] = True
+                from_archive += 1
+                n_done += 1
+    if n_done:
+        yield n_done, total, None
+
+    # 2) 나머지 종목 조회
+    pending = [(i, item) for i, item in enumerate(universe) if not done[i]]
+    with stage("fetch") as clock:
+        for k, symbol, name, df in iter_fetch(
+            [item for _, item in pending], days=days, deadline=started + time_budget * 0.6
+        ):
+            done[pending[k][0]] = True
+            n_done += 1
+            if not panel.append_frame(symbol, name, df):
+                dropped += 1
+            with clock.pause():
+                yield n_done, total, None
+
+    # 3) 제한 시간 안에 못 받은 종목: 아카이브/저장소 시세 (마지막 조회 이후 추가분 없음)
+    store = get_price_store()
+    from_store = 0
+    store_deadline = started + time_budget * 0.9
+    with stage("store_fallback"):
+        for i, (symbol, name) in enumerate(universe):
+            if done[i]:
+                continue
+            if time.monotonic() >= store_deadline:
+                break
+            window = archive.window(symbol, start=start)
+            if window is None:
+                arrays = store.load_arrays(symbol, ARCHIVE_COLUMNS)
+                if arrays is not None:
+                    keep = arrays["dates"] >= np.datetime64(start, "D")
+                    window = PriceWindow(symbol, **{k: v[keep] for k, v in arrays.items()})
+            if window is None or len(window.close) == 0:
+                continue
+            add(symbol, name, window)
+            from_store += 1
+
+    panel.freeze()
+    ranked, scanned = rank_panel(
+        panel, strategies, top_n=top_n, memory_bytes=max(memory - panel.nbytes, 0), where=where
+    )
+    _rebuild_archive_async(archive)
+    yield n_done, total, ScanResult(
+        trend=ranked["trend"],
+        rising=ranked.get("rising_star", []),
+        total=total,
+        scanned=scanned,
+        from_archive=from_archive,
+        from_store=from_store,
+        dropped=dropped,
+        elapsed=time.monotonic() - started,
+        nbytes=panel.nbytes,
+    )
+
+
+_archive_building = threading.Lock()
+
+
+def _rebuild_archive_async(archive: PriceArchive) -> None:
+    """아카이브가 없거나 PRICE_REFRESH_SEC 보다 오래됐으면 저장소에서 다시 빌드 (프로세스당 하나, 워커 간에도 하나)"""
+    built_at = archive.built_at
+    if built_at is not None and time.time() - built_at < PRICE_REFRESH_SEC:
+        return
+    if not _archive_building.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            # 다른 워커가 빌드 중이거나 방금 빌드했으면 건너뜀 (프로세스 간 BUILD.lock)
+            archive.build_from_store(blocking=False, fresh_sec=PRICE_REFRESH_SEC)
+        except Exception:
+            logger.exception("시세 아카이브 빌드 실패: %s", archive.root)
+        finally:
+            _archive_building.release()
+
+    threading.Thread(target=run, name="archive-build", daemon=True).start()
+
+
+def wait_archive_build() -> None:
+    """이 프로세스에서 진행 중인 백그라운드 아카이브 빌드가 끝날 때까지 대기 (없으면 바로 반환)"""
+    with _archive_building:
+        pass
+
+
+def run_market_scan(market: str = "kr", **kwargs) -> ScanResult:
+    """iter_market_scan 결과만 반환"""
+    result = None
+    for _, _, result in iter_market_scan(market, **kwargs):
+        pass
+    return result
+
+
+def start_intraday(
+    market: str = "kr",
+    scope: str = "watchlist",
+    rising_limit: int = 80,
+    day: date | None = None,
+) -> IntradaySession:
+    """
+    장중 세션 시작 - 추세·샛별 종목 풀의 전일까지 일봉으로 지표 상태를 한 번만 만듦
+    이후 session.run(feed) 로 분봉을 넣으면 잠정 일봉으로 바뀐 종목만 다시 평가해 신호 변화를 돌려준다
+    day: 세션 날짜 (기본 오늘, 재생 파일이면 그 날짜)
+    """
+    with stage("universe"):
+        combined, members = _combined_universe(market, scope, rising_limit)
+    with stage("fetch"):
+        fetched = fetch_many(combined, days=120)
+    with stage("indicators"):
+        return IntradaySession.from_frames(fetched, members, day)
+
+
 def run_recommender() -> None:
-    """전체 추천 실행"""
+    """전체 추천 실행 (추세·샛별이 겹치는 종목 시세는 한 번만 조회)"""
+    with data_context() as data:
+        _print_recommendations()
+    print(f"\n※ {data.summary()}")
+
+
+def _print_recommendations() -> None:
     print("=" * 60)
     print("주식 추천 시스템 (토스증권 수동 매매용)")
     print("=" * 60)
@@ -74,7 +420,7 @@ def run_recommender() -> None:
         tag = "[매수]" if rec.signal == "매수" else "[관망]" if rec.signal == "관망" else "[주의]"
         print(f"\n{tag} [{rec.symbol}] {rec.name}")
         print(f"   현재가: {rec.current_price:,.0f}원 | 점수: {rec.score}")
-        for r in rec.reasons[:3]:
+        for r in rec.render_reasons(3):
             print(f"   - {r}")
 
     # 2. 떠오르는 샛별
@@ -85,11 +431,43 @@ def run_recommender() -> None:
         for rec in rising_results[:15]:  # 상위 15개
             print(f"\n[샛별] [{rec.symbol}] {rec.name}")
             print(f"   현재가: {rec.current_price:,.0f}원 | 점수: {rec.score}")
-            for r in rec.reasons[:4]:
+            for r in rec.render_reasons(4):
                 print(f"   - {r}")
     else:
         print("   조건에 맞는 종목이 없습니다.")
 
+    # 3. 지난 실행 대비 신호 변화
+    if SIGNAL_HISTORY_DIR:
+        print_signal_changes(trend_results, rising_results)
+
+
+def _signal_map(recs: list[Recommendation]) -> dict[str, list]:
+    return {r.symbol: [r.name, r.signal, r.score] for r in recs}
+
+
+def print_signal_changes(trend: list[Recommendation], rising: list[Recommendation]) -> None:
+    """이번 실행의 종목별 신호를 기록하고 지난 실행 대비 들어온·빠진·상향·하향 종목 출력"""
+    history = SignalHistory(SIGNAL_HISTORY_DIR, keep=SIGNAL_HISTORY_RUNS)
+    key = "cli_kr_watchlist"
+    runs = history.runs(key)
+    since = runs[-1]["seq"] if runs else None
+    history.record(key, time.time(), {"trend": _signal_map(trend), "rising": _signal_map(rising)})
+
+    print("\n\n[3] 지난 실행 대비 변화")
+    print("-" * 60)
+    if since is None:
+        print("   첫 실행 - 다음 실행부터 변화를 표시합니다.")
+        return
+    changes = history.changes(key, since)
+    labels = {"trend": "추세", "rising": "샛별"}
+    lines = []
+    for kind, mark in (("upgraded", "▲"), ("downgraded", "▼"), ("entered", "+"), ("exited", "-")):
+        for c in (changes or {}).get(kind, []):
+            move = f"{c['before']} → {c['signal']}" if "before" in c else c["signal"]
+            tag = labels.get(c["list"], c["list"])
+            lines.append(f"   {mark} [{tag}] [{c['symbol']}] {c['name']}: {move} ({c['score']})")
+    print("\n".join(lines) if lines else "   변화 없음")
+
 
 if __name__ == "__main__":
     run_recommender()
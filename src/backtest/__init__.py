@@ -0,0 +1,24 @@
+"""백테스트 모듈"""
+from .engine import (
+    PriceHistory,
+    SignalStats,
+    forward_returns,
+    load_history,
+    run_backtest,
+    signals,
+)
+from .sweep import DEFAULT_GRIDS, SweepResult, expand_grid, parse_grid, run_sweep
+
+__all__ = [
+    "PriceHistory",
+    "SignalStats",
+    "load_history",
+    "run_backtest",
+    "signals",
+    "forward_returns",
+    "SweepResult",
+    "DEFAULT_GRIDS",
+    "expand_grid",
+    "parse_grid",
+    "run_sweep",
+]
@@ -0,0 +1,197 @@
+"""백테스트 엔진 - 추세/샛별 점수 규칙을 과거 전 구간에 배열 연산으로 재현
+
+모든 종목의 일봉을 하나의 연속 배열(PriceHistory)로 두고, 지표·점수·신호를 봉 전체에 대해
+한 번에 계산한다. 날짜별로 평가 함수를 다시 부르지 않는다.
+"""
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data import fetch_many
+from src.data.store import PriceStore, get_price_store
+from src.recommender.panel import _column, compute_indicators
+from src.recommender.rules import RULESETS, evaluate_rulesets
+
+
+@dataclass
+class PriceHistory:
+    """종목별 일봉을 이어 붙인 컬럼형 시세 (종목 순서대로 lengths 만큼)"""
+    symbols: list[str]
+    lengths: np.ndarray
+    dates: np.ndarray  # datetime64[D]
+    close: np.ndarray
+    high: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_arrays(cls, items: Sequence[tuple[str, dict[str, np.ndarray] | None]]) -> "PriceHistory":
+        """[(종목코드, {"dates","close","high","volume"}), ...] 로 생성 (없는 종목 제외)"""
+        items = [(s, a) for s, a in items if a is not None and len(a["dates"])]
+        if not items:
+            empty = np.empty(0)
+            return cls([], np.zeros(0, dtype=np.int64), empty.astype("datetime64[D]"), empty, empty, empty)
+        return cls(
+            symbols=[s for s, _ in items],
+            lengths=np.array([len(a["dates"]) for _, a in items], dtype=np.int64),
+            dates=np.concatenate([a["dates"] for _, a in items]).astype("datetime64[D]"),
+            close=np.concatenate([a["close"] for _, a in items]),
+            high=np.concatenate([a["high"] for _, a in items]),
+            volume=np.concatenate([a["volume"] for _, a in items]),
+        )
+
+    @classmethod
+    def from_frames(cls, items: Sequence[tuple[str, pd.DataFrame | None]]) -> "PriceHistory":
+        """[(종목코드, 시세 DataFrame), ...] 로 생성"""
+        arrays = []
+        for symbol, df in items:
+            if df is None or df.empty or _column(df, "close") is None:
+                arrays.append((symbol, None))
+                continue
+            n = len(df)
+            high, vol = _column(df, "high"), _column(df, "volume")
+            arrays.append((symbol, {
+                "dates": df.index.values.astype("datetime64[D]"),
+                "close": _column(df, "close"),
+                "high": high if high is not None else np.full(n, np.nan),
+                "volume": vol if vol is not None else np.full(n, np.nan),
+            }))
+        return cls.from_arrays(arrays)
+
+    @classmethod
+    def from_store(
+        cls, symbols: Sequence[str], start: str | None = None, store: PriceStore | None = None
+    ) -> "PriceHistory":
+        """로컬 시세 저장소에서 DataFrame 없이 바로 로드 (start: 'YYYY-MM-DD' 이후만)"""
+        store = store or get_price_store()
+        start_d = np.datetime64(start, "D") if start else None
+        items = []
+        for symbol in symbols:
+            arrays = store.load_arrays(symbol)
+            if arrays is not None and start_d is not None:
+                keep = arrays["dates"] >= start_d
+                arrays = {k: v[keep] for k, v in arrays.items()}
+            items.append((symbol, arrays))
+        return cls.from_arrays(items)
+
+    _ARRAYS = ("lengths", "dates", "close", "high", "volume")
+
+    def save(self, root: str | Path) -> None:
+        """컬럼별 .npy 파일로 저장 (load(mmap=True) 로 여러 프로세스가 복사 없이 공유)"""
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        for name in self._ARRAYS:
+            np.save(root / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        (root / "symbols.txt").write_text("\n".join(self.symbols), encoding="utf-8")
+
+    @classmethod
+    def load(cls, root: str | Path, mmap: bool = True) -> "PriceHistory":
+        """save() 로 저장한 시세 열기 (mmap: 읽기 전용 메모리 매핑)"""
+        root = Path(root)
+        text = (root / "symbols.txt").read_text(encoding="utf-8")
+        arrays = {
+            name: np.load(root / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in cls._ARRAYS
+        }
+        return cls(symbols=text.split("\n") if text else [], **arrays)
+
+
+def load_history(
+    universe: list[tuple[str, str]], years: float = 5, refresh: bool = True
+) -> PriceHistory:
+    """
+    백테스트용 과거 시세 로드
+    - refresh: 먼저 fetch_many 로 저장소를 채움 (저장된 구간은 다시 받지 않음)
+    - 이후 저장소에서 배열로 바로 읽음
+    """
+    days = int(years * 365.25) + 10
+    if refresh:
+        fetch_many(universe, days=days)
+    start = (pd.Timestamp.now().normalize() - pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+    return PriceHistory.from_store([s for s, _ in universe], start=start)
+
+
+@dataclass
+class SignalStats:
+    """신호별 성과"""
+    strategy: str
+    signal: str
+    count: int
+    avg_return: dict[int, float] = field(default_factory=dict)  # 보유 봉 수 → 평균 수익률(%)
+    hit_rate: dict[int, float] = field(default_factory=dict)  # 보유 봉 수 → 수익 비율(%)
+    turnover: float = float("nan")  # 날마다 새로 편입된 종목 비율 (%)
+
+    def to_dict(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "signal": self.signal,
+            "count": self.count,
+            "avg_return": {str(h): v for h, v in self.avg_return.items()},
+            "hit_rate": {str(h): v for h, v in self.hit_rate.items()},
+            "turnover": self.turnover,
+        }
+
+
+def forward_returns(history: PriceHistory, horizon: int) -> np.ndarray:
+    """각 봉 기준 horizon 봉 뒤 종가 수익률 (종목 구간을 넘으면 NaN)"""
+    seg_end = np.repeat(np.cumsum(history.lengths), history.lengths)
+    idx = np.arange(len(history.close)) + horizon
+    ok = idx < seg_end
+    out = np.full(len(history.close), np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out[ok] = history.close[idx[ok]] / history.close[ok] - 1
+    return out
+
+
+def _turnover(rows: np.ndarray, date_idx: np.ndarray, shape: tuple[int, int], member: np.ndarray) -> float:
+    """날짜별 신호 편입 종목 중 전날 없던 종목 비율 (전 기간 합산, %)"""
+    grid = np.zeros(shape, dtype=bool)
+    grid[rows[member], date_idx[member]] = True
+    if grid.shape[1] < 2:
+        return float("nan")
+    entries = (grid[:, 1:] & ~grid[:, :-1]).sum()
+    held = grid[:, 1:].sum()
+    return float(entries / held * 100) if held else float("nan")
+
+
+def signals(
+    history: PriceHistory, strategies: Sequence[str] | None = None
+) -> dict[str, tuple[np.ndarray, tuple[str, ...]]]:
+    """
+    전략별 봉마다 신호 코드 ({전략: (코드 배열, 코드 이름)}, 평가 불가 -1)
+    strategies: 규칙 전략 이름 (기본: 등록된 RULESETS 전체, 한 번에 평가)
+    """
+    ind = compute_indicators(history.close, history.high, history.volume, history.lengths)
+    names = list(strategies) if strategies is not None else list(RULESETS)
+    results = evaluate_rulesets([RULESETS[n] for n in names], {**ind, "close": history.close}, ind["pos"])
+    return {n: (r.signals, r.ruleset.labels) for n, r in results.items()}
+
+
+def run_backtest(
+    history: PriceHistory,
+    horizons: Sequence[int] = (1, 5, 20),
+    strategies: Sequence[str] = ("trend", "rising_star"),
+) -> list[SignalStats]:
+    """신호 종류별 이후 수익률·적중률·회전율"""
+    codes = signals(history, strategies)
+    fwd = {h: forward_returns(history, h) for h in horizons}
+    # 종목 × 거래일 격자 위치 (회전율 계산용, 한 번만)
+    calendar, date_idx = np.unique(history.dates, return_inverse=True)
+    rows = np.repeat(np.arange(len(history.lengths)), history.lengths)
+    shape = (len(history.lengths), len(calendar))
+    out = []
+    for strategy in strategies:
+        code, labels = codes[strategy]
+        for c, label in enumerate(labels):
+            member = code == c
+            stats = SignalStats(strategy=strategy, signal=label, count=int(member.sum()))
+            for h in horizons:
+                r = fwd[h][member]
+                r = r[~np.isnan(r)]
+                stats.avg_return[h] = float(r.mean() * 100) if len(r) else float("nan")
+                stats.hit_rate[h] = float((r > 0).mean() * 100) if len(r) else float("nan")
+            stats.turnover = _turnover(rows, date_idx, shape, member)
+            out.append(stats)
+    return out
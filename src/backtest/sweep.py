@@ -0,0 +1,245 @@
+"""파라미터 탐색 - 신호 임계값·지표 창 조합을 과거 전 구간에 적용해 성과 비교
+
+시세(PriceHistory)는 임시 디렉터리에 컬럼별 .npy 로 한 번 써 두고, 프로세스 풀 워커가 시작할 때
+메모리 매핑으로 열어 함께 읽는다. 작업마다 넘기는 것은 파라미터 dict 묶음뿐이다.
+조합은 지표 창(ma_short/ma_mid/ma_long/rsi_window)이 같은 것끼리 묶어 지표를 워커당 한 번만 계산하고,
+한 묶음의 RuleSet 들은 evaluate_rulesets 로 같이 평가해 공통 조건식도 한 번만 계산한다.
+"""
+import itertools
+import os
+import tempfile
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from src.recommender.panel import compute_indicators
+from src.recommender.rules import RULE_BUILDERS, RULE_PARAMS, RuleSet, evaluate_rulesets
+
+from .engine import PriceHistory, forward_returns
+
+# 지표 창 기본값 (compute_indicators 의 ma_windows / rsi_window)
+WINDOW_PARAMS = {"ma_short": 5, "ma_mid": 20, "ma_long": 60, "rsi_window": 14}
+
+# 작은 값부터 순서가 맞아야 하는 파라미터 (어긋난 조합은 탐색에서 제외)
+_ORDERED = (
+    ("rsi_oversold", "rsi_low", "rsi_overbought"),
+    ("watch", "buy"),
+    ("watch", "star"),
+    ("vol_slight", "vol_up", "vol_surge"),
+    ("ma_short", "ma_mid", "ma_long"),
+)
+
+# 전략별 기본 탐색 범위 (trend 2,592 / rising_star 768 조합 중 순서가 맞는 것)
+DEFAULT_GRIDS: dict[str, dict[str, list[float]]] = {
+    "trend": {
+        "rsi_oversold": [25, 30, 35],
+        "rsi_low": [45, 50, 55],
+        "rsi_overbought": [65, 70, 75, 80],
+        "buy": [3.0, 3.5, 4.0],
+        "watch": [1.5, 2.0, 2.5],
+        "ma_short": [5, 10],
+        "ma_long": [60, 120],
+        "rsi_window": [9, 14],
+    },
+    "rising_star": {
+        "vol_surge": [1.8, 2.0, 2.5, 3.0],
+        "vol_up": [1.3, 1.5, 1.7],
+        "vol_slight": [1.1, 1.2],
+        "star": [3.5, 4.0, 4.5, 5.0],
+        "watch": [2.5, 3.0],
+        "rsi_window": [9, 14],
+    },
+}
+
+
+@dataclass
+class SweepResult:
+    """파라미터 조합 하나의 최상위 신호(매수/샛별) 성과"""
+    strategy: str
+    params: dict[str, float]
+    signal: str
+    count: int  # 신호가 난 봉 수 (이후 수익률을 알 수 있는 봉만)
+    avg_return: float  # 평균 수익률 (%)
+    hit_rate: float  # 수익 > 0 비율 (%)
+    excess: float = float("nan")  # 평가 가능한 전체 봉 평균 대비 (%p)
+
+    def to_dict(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "params": self.params,
+            "signal": self.signal,
+            "count": self.count,
+            "avg_return": self.avg_return,
+            "hit_rate": self.hit_rate,
+            "excess": self.excess,
+        }
+
+
+def expand_grid(strategy: str, grid: Mapping[str, Sequence[float]] | None = None) -> list[dict[str, float]]:
+    """
+    탐색 범위 {파라미터: 값 목록} → 조합 목록 (빠진 파라미터는 기본값, 순서가 어긋난 조합 제외)
+    파라미터: RULE_PARAMS[strategy] 의 임계값 + WINDOW_PARAMS 의 지표 창
+    """
+    defaults = {**WINDOW_PARAMS, **RULE_PARAMS[strategy]}
+    grid = DEFAULT_GRIDS[strategy] if grid is None else grid
+    unknown = set(grid) - set(defaults)
+    if unknown:
+        raise ValueError(f"{strategy} 전략에 없는 파라미터: {', '.join(sorted(unknown))}")
+    keys = list(grid)
+    out = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        params = {**defaults, **dict(zip(keys, values))}
+        if all(
+            all(params[a] < params[b] for a, b in itertools.pairwise(k for k in chain if k in params))
+            for chain in _ORDERED
+        ):
+            out.append(params)
+    return out
+
+
+def parse_grid(specs: Iterable[str]) -> dict[str, list[float]]:
+    """CLI 인자 ["rsi_oversold=25,30,35", "buy=3,3.5"] → 탐색 범위"""
+    grid = {}
+    for spec in specs:
+        key, sep, values = spec.partition("=")
+        if not sep or not values:
+            raise ValueError(f"탐색 범위 형식 오류 (이름=값,값): {spec}")
+        grid[key.strip()] = [float(v) if "." in v else int(v) for v in values.split(",") if v]
+    return grid
+
+
+def _window_key(params: Mapping[str, float]) -> tuple[int, ...]:
+    return tuple(int(params[k]) for k in WINDOW_PARAMS)
+
+
+# 워커 프로세스 상태 (initializer 에서 시세를 열고, 지표·수익률은 처음 쓸 때 계산해 재사용)
+_history: PriceHistory | None = None
+_indicators: dict[tuple[int, ...], dict[str, np.ndarray]] = {}
+_returns: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _init_worker(root: str | None) -> None:
+    """시세 열기 (None 이면 상태 비우기)"""
+    global _history
+    _history = PriceHistory.load(root) if root else None
+    _indicators.clear()
+    _returns.clear()
+
+
+def _worker_indicators(windows: tuple[int, ...]) -> dict[str, np.ndarray]:
+    """지표 창별 지표 (작업이 창 순서로 오므로 가장 최근 하나만 보관해 메모리 제한)"""
+    if windows not in _indicators:
+        _indicators.clear()
+        h = _history
+        ind = compute_indicators(
+            np.asarray(h.close), np.asarray(h.high), np.asarray(h.volume), np.asarray(h.lengths),
+            ma_windows=windows[:3], rsi_window=windows[3],
+        )
+        _indicators[windows] = {**ind, "close": np.asarray(h.close)}
+    return _indicators[windows]
+
+
+def _worker_returns(horizon: int) -> tuple[np.ndarray, np.ndarray]:
+    """(이후 수익률, 유효 여부)"""
+    if horizon not in _returns:
+        fwd = forward_returns(_history, horizon)
+        _returns[horizon] = (fwd, ~np.isnan(fwd))
+    return _returns[horizon]
+
+
+def _run_batch(strategy: str, configs: list[dict[str, float]], horizon: int) -> list[SweepResult]:
+    """같은 지표 창의 조합 묶음 평가 (워커에서 실행)"""
+    columns = _worker_indicators(_window_key(configs[0]))
+    fwd, has_fwd = _worker_returns(horizon)
+    build = RULE_BUILDERS[strategy]
+    rule_keys = RULE_PARAMS[strategy]
+    rulesets = [build(**{k: p[k] for k in rule_keys}) for p in configs]
+    # 점수는 신호 기준(buy/watch 등)과 무관 → 규칙이 같은 조합은 한 번만 평가하고 신호만 따로 나눔.
+    # 규칙이 다른 것끼리는 이름만 바꿔 함께 평가해 같은 식(ma5 > ma20 등)을 한 번만 계산
+    keys = [(rs.rules, tuple(rs.define.items())) for rs in rulesets]
+    unique: dict[tuple, RuleSet] = {}
+    for key, rs in zip(keys, rulesets):
+        if key not in unique:
+            unique[key] = replace(rs, name=str(len(unique)))
+    scored = evaluate_rulesets(list(unique.values()), columns, columns["pos"])
+    out = []
+    for key, rs, params in zip(keys, rulesets, configs):
+        top = len(rs.labels) - 1
+        member = (rs.signal_codes(scored[unique[key].name].score) == top) & has_fwd
+        r = fwd[member]
+        n = len(r)
+        out.append(SweepResult(
+            strategy=strategy,
+            params=params,
+            signal=rs.labels[top],
+            count=n,
+            avg_return=float(r.mean() * 100) if n else float("nan"),
+            hit_rate=float((r > 0).mean() * 100) if n else float("nan"),
+        ))
+    return out
+
+
+def _baseline(history: PriceHistory, horizon: int, min_bars: int = 20) -> float:
+    """평가 가능한 전체 봉(min_bars 이상)의 평균 이후 수익률 (%)"""
+    fwd = forward_returns(history, horizon)
+    offsets = np.concatenate([[0], np.cumsum(history.lengths)[:-1]])
+    pos = np.arange(len(fwd)) - np.repeat(offsets, history.lengths)
+    r = fwd[(pos >= min_bars - 1) & ~np.isnan(fwd)]
+    return float(r.mean() * 100) if len(r) else float("nan")
+
+
+def run_sweep(
+    history: PriceHistory,
+    strategy: str = "trend",
+    grid: Mapping[str, Sequence[float]] | None = None,
+    horizon: int = 5,
+    workers: int | None = None,
+    batch_size: int = 32,
+    min_count: int = 30,
+    sort_by: str = "avg_return",
+) -> list[SweepResult]:
+    """
+    조합별 최상위 신호의 horizon 봉 뒤 성과 (좋은 순, 신호 min_count 건 미만 조합은 뒤로)
+    - workers: 프로세스 수 (기본: CPU 수, 1 이면 현재 프로세스에서 실행)
+    - batch_size: 작업 하나에 담을 조합 수 (한 번에 평가하는 RuleSet 수 = 메모리 사용량)
+    """
+    if strategy not in RULE_BUILDERS:
+        raise ValueError(f"파라미터 탐색을 지원하지 않는 전략: {strategy}")
+    configs = expand_grid(strategy, grid)
+    if not configs or not len(history.close):
+        return []
+    # 지표 창 순서로 정렬해 같은 창의 작업이 이어지게 (워커는 지표 하나만 보관).
+    # 신호 기준은 각 파라미터 목록의 끝이라 규칙만 같은 조합이 한 묶음에 모인다
+    configs.sort(key=lambda p: tuple(p.values()))
+    batches = []
+    for _, group in itertools.groupby(configs, key=_window_key):
+        group = list(group)
+        batches += [group[i:i + batch_size] for i in range(0, len(group), batch_size)]
+
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory(prefix="sweep-") as root:
+        history.save(root)
+        if workers == 1:
+            _init_worker(root)
+            try:
+                results = [r for b in batches for r in _run_batch(strategy, b, horizon)]
+            finally:
+                _init_worker(None)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(root,)) as pool:
+                futures = [pool.submit(_run_batch, strategy, b, horizon) for b in batches]
+                results = [r for f in futures for r in f.result()]
+
+    baseline = _baseline(history, horizon)
+    for r in results:
+        r.excess = r.avg_return - baseline
+
+    def rank(r: SweepResult) -> tuple[bool, float]:
+        value = getattr(r, sort_by)
+        usable = r.count >= min_count and not np.isnan(value)
+        return not usable, -value if usable else 0.0
+
+    results.sort(key=rank)
+    return results
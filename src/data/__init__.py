@@ -6,20 +6,43 @@ from .fetcher import (
     US_WATCHLIST,
     fetch_kosdaq_list,
     fetch_kospi_list,
+    fetch_sp500_list,
     fetch_stock_data,
     fetch_symbol_list,
+    get_full_market_universe,
     get_market_scan_universe,
     get_rising_star_universe,
     get_watchlist,
 )
+from .context import DataContext, current_data_context, data_context
+from .archive import PriceArchive, PriceWindow, get_price_archive
+from .feed import FileReplayFeed, MinuteBar, MinuteFeed, write_minute_bars
+from .listing import ListingCache, get_listing_cache
+from .pool import fetch_many, iter_fetch
 
 __all__ = [
     "fetch_stock_data",
+    "fetch_many",
+    "iter_fetch",
+    "DataContext",
+    "data_context",
+    "current_data_context",
     "fetch_kospi_list",
     "fetch_kosdaq_list",
+    "fetch_sp500_list",
     "fetch_symbol_list",
+    "ListingCache",
+    "get_listing_cache",
+    "PriceArchive",
+    "PriceWindow",
+    "get_price_archive",
+    "MinuteBar",
+    "MinuteFeed",
+    "FileReplayFeed",
+    "write_minute_bars",
     "get_watchlist",
     "get_market_scan_universe",
+    "get_full_market_universe",
     "get_rising_star_universe",
     "DEFAULT_WATCHLIST",
     "RISING_STAR_UNIVERSE",
@@ -0,0 +1,255 @@
+"""시세 아카이브 - 전 종목 일봉을 컬럼별 고정 dtype 배열 파일로 모아 메모리 매핑
+
+컬럼(date/open/high/low/close/volume)마다 .npy 파일 하나에 모든 종목을 이어 붙이고,
+index.json 에 종목 → (시작 위치, 길이)를 둔다. 읽기는 np.load(mmap_mode="r") 라서
+종목 구간은 복사 없는 NumPy view 이고, 여러 gunicorn 워커가 같은 페이지 캐시를 공유한다.
+
+빌드는 새 세대(generation) 디렉터리에 쓴 뒤 CURRENT 파일만 교체한다.
+읽는 쪽은 CURRENT 가 바뀌면 다음 조회 때 새 세대를 연다.
+빌드와 이전 세대 정리는 BUILD.lock 파일로 프로세스 간에 한 번에 하나만 한다 (gunicorn 워커 등).
+"""
+import json
+import shutil
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import PRICE_ARCHIVE_DIR
+from src.utils.filelock import file_lock
+
+from .store import PriceStore, get_price_store
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass
+class PriceWindow:
+    """한 종목 구간 (아카이브 배열의 view - 읽기 전용)"""
+    symbol: str
+    dates: np.ndarray  # datetime64[D]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def to_frame(self) -> pd.DataFrame:
+        """fetch_stock_data 와 같은 형태의 DataFrame (복사본)"""
+        return pd.DataFrame(
+            {c: np.array(getattr(self, c)) for c in COLUMNS},
+            index=pd.DatetimeIndex(self.dates.astype("datetime64[ns]"), name="Date"),
+        )
+
+
+class _Generation:
+    """한 세대의 메모리 매핑 배열 + 종목 인덱스"""
+
+    def __init__(self, path: Path):
+        meta = json.loads((path / "index.json").read_text(encoding="utf-8"))
+        self.name = path.name
+        self.built_at = float(meta["built_at"])
+        self.symbols: list[str] = meta["symbols"]
+        self.index = {
+            s: (int(o), int(n)) for s, o, n in zip(meta["symbols"], meta["offsets"], meta["lengths"])
+        }
+        self.fetched_at = dict(zip(meta["symbols"], meta["fetched_at"]))
+        self.covered_from = dict(zip(meta["symbols"], meta["covered_from"]))
+        self.arrays = {c: np.load(path / f"{c}.npy", mmap_mode="r") for c in ("date",) + COLUMNS}
+
+
+class PriceArchive:
+    """메모리 매핑 시세 아카이브 (PRICE_ARCHIVE_DIR)"""
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root or PRICE_ARCHIVE_DIR)
+        self._gen: _Generation | None = None
+        self._stamp: int | None = None
+        self._lock = threading.Lock()
+
+    def _current(self) -> _Generation | None:
+        """CURRENT 가 가리키는 세대 (바뀌었으면 다시 염, 없으면 None)"""
+        pointer = self.root / "CURRENT"
+        try:
+            stamp = pointer.stat().st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            if stamp != self._stamp:
+                try:
+                    self._gen = _Generation(self.root / pointer.read_text(encoding="utf-8").strip())
+                except (OSError, ValueError, KeyError):
+                    self._gen = None
+                self._stamp = stamp
+            return self._gen
+
+    @property
+    def built_at(self) -> float | None:
+        """마지막 빌드 시각 (time.time 기준, 없으면 None)"""
+        gen = self._current()
+        return gen.built_at if gen else None
+
+    def symbols(self) -> list[str]:
+        gen = self._current()
+        return list(gen.symbols) if gen else []
+
+    def __contains__(self, symbol: str) -> bool:
+        gen = self._current()
+        return gen is not None and symbol in gen.index
+
+    def fetched_at(self, symbol: str) -> float:
+        """종목 시세를 마지막으로 네트워크에서 받은 시각 (없으면 0)"""
+        gen = self._current()
+        return gen.fetched_at.get(symbol, 0.0) if gen else 0.0
+
+    def covered_from(self, symbol: str) -> date | None:
+        """종목 시세가 보장하는 시작일 (없으면 None)"""
+        gen = self._current()
+        value = gen.covered_from.get(symbol) if gen else None
+        return date.fromisoformat(value) if value else None
+
+    def window(
+        self, symbol: str, start: date | str | None = None, bars: int | None = None
+    ) -> PriceWindow | None:
+        """
+        종목 구간 조회 (복사 없는 view)
+        - start: 이 날짜 이후만, bars: 마지막 bars 봉만 (둘 다 주면 둘 다 적용)
+        """
+        gen = self._current()
+        if gen is None or symbol not in gen.index:
+            return None
+        offset, length = gen.index[symbol]
+        lo, hi = offset, offset + length
+        dates = gen.arrays["date"]
+        if start is not None:
+            lo += int(np.searchsorted(dates[lo:hi], np.datetime64(start, "D")))
+        if bars is not None:
+            lo = max(lo, hi - bars)
+        return PriceWindow(
+            symbol, dates[lo:hi], *(gen.arrays[c][lo:hi] for c in COLUMNS)
+        )
+
+    def build(
+        self,
+        items: Iterable[tuple[str, dict[str, np.ndarray] | None, date | None, float]],
+        blocking: bool = True,
+    ) -> str | None:
+        """
+        새 세대 빌드 후 교체
+        items: [(종목코드, {"dates", "open", ..., "volume"} 배열, 조회 보장 시작일, 마지막 조회 시각), ...]
+        (PriceStore.load_record 형식, 없는 컬럼은 NaN)
+        blocking=False 면 다른 프로세스가 빌드 중일 때 기다리지 않고 None
+        Returns: 세대 이름
+        """
+        with file_lock(self.root / "BUILD.lock", blocking, poll_sec=0.2) as held:
+            return self._build(items) if held else None
+
+    def _build(
+        self, items: Iterable[tuple[str, dict[str, np.ndarray] | None, date | None, float]]
+    ) -> str:
+        """build 본체 (빌드 잠금 안에서)"""
+        name = f"g{time.time_ns()}"
+        path = self.root / name
+        path.mkdir(parents=True, exist_ok=True)
+        symbols, offsets, lengths, fetched, covered = [], [], [], [], []
+        parts: dict[str, list[np.ndarray]] = {c: [] for c in ("date",) + COLUMNS}
+        offset = 0
+        for symbol, arrays, covered_from, fetched_at in items:
+            if arrays is None or len(arrays["dates"]) == 0:
+                continue
+            n = len(arrays["dates"])
+            parts["date"].append(np.asarray(arrays["dates"]).astype("datetime64[D]"))
+            for c in COLUMNS:
+                col = arrays.get(c)
+                parts[c].append(
+                    np.asarray(col, dtype=np.float64) if col is not None else np.full(n, np.nan)
+                )
+            symbols.append(symbol)
+            offsets.append(offset)
+            lengths.append(n)
+            fetched.append(float(fetched_at))
+            covered.append(covered_from.isoformat() if covered_from else None)
+            offset += n
+
+        for c, arrays in parts.items():
+            dtype = "datetime64[D]" if c == "date" else np.float64
+            np.save(path / f"{c}.npy", np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype))
+        (path / "index.json").write_text(
+            json.dumps({
+                "built_at": time.time(),
+                "symbols": symbols,
+                "offsets": offsets,
+                "lengths": lengths,
+                "fetched_at": fetched,
+                "covered_from": covered,
+            }, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        pointer = self.root / "CURRENT"
+        tmp = pointer.with_name(f"CURRENT.{time.monotonic_ns()}.tmp")
+        tmp.write_text(name, encoding="utf-8")
+        tmp.replace(pointer)
+        self._cleanup(keep={name})
+        return name
+
+    def build_from_store(
+        self,
+        symbols: Iterable[str] | None = None,
+        store: PriceStore | None = None,
+        blocking: bool = True,
+        fresh_sec: float | None = None,
+    ) -> str | None:
+        """
+        로컬 시세 저장소(PriceStore)에서 빌드 (symbols 없으면 저장소 전 종목)
+        - blocking=False: 다른 프로세스가 빌드 중이면 None
+        - fresh_sec: 잠금을 잡은 뒤 보니 이 시간(초) 안에 빌드된 세대가 있으면 건너뛰고 None
+        """
+        store = store or get_price_store()
+        with file_lock(self.root / "BUILD.lock", blocking, poll_sec=0.2) as held:
+            if not held:
+                return None
+            built_at = self.built_at
+            if fresh_sec is not None and built_at is not None and time.time() - built_at < fresh_sec:
+                return None
+            symbols = store.symbols() if symbols is None else symbols
+
+            def items():
+                for symbol in symbols:
+                    record = store.load_record(symbol, COLUMNS)
+                    if record is not None:
+                        yield symbol, *record
+
+            return self._build(items())
+
+    def _cleanup(self, keep: set[str]) -> None:
+        """이전 세대 삭제 - 바로 전 세대는 읽는 중일 수 있어 남김 (실패는 무시: Windows 매핑 중 파일 등)"""
+        gens = sorted(p for p in self.root.glob("g*") if p.is_dir() and p.name not in keep)
+        for path in gens[:-1]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+_default_archive: PriceArchive | None = None
+
+
+def get_price_archive() -> PriceArchive:
+    """기본 아카이브 (PRICE_ARCHIVE_DIR)"""
+    global _default_archive
+    if _default_archive is None:
+        _default_archive = PriceArchive()
+    return _default_archive
+
+
+if __name__ == "__main__":
+    # 저장소 전 종목으로 아카이브 빌드: python -m src.data.archive
+    started = time.perf_counter()
+    archive = get_price_archive()
+    name = archive.build_from_store()
+    print(f"{archive.root / name}: {len(archive.symbols())}종목 ({time.perf_counter() - started:.1f}초)")
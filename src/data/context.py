@@ -0,0 +1,94 @@
+"""실행별 시세 메모 - 한 번의 실행(요청·보고서·대시보드 갱신) 동안 (종목코드, 조회 일수) 별로 한 번만 조회
+
+data_context() 블록 안의 fetch_stock_data 는 같은 종목·일수를 다시 받지 않고 먼저 받은 시세를 돌려준다.
+추세·샛별처럼 종목 풀이 겹치는 추천을 따로 불러도 겹치는 종목은 한 번만 조회된다.
+contextvars 기반이라 iter_fetch 처럼 컨텍스트를 복사해 넘긴 작업 스레드에서도 같은 메모를 쓴다.
+반환한 DataFrame 은 호출 측끼리 공유하므로 고치지 말고 복사해서 쓴다 (add_technical_indicators 는 복사함).
+"""
+import contextvars
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+import pandas as pd
+
+from src.utils.metrics import REGISTRY
+
+CONTEXT_LOOKUPS = REGISTRY.counter(
+    "stock_trader_data_context", "실행별 시세 메모 조회 (hit: 재사용, miss: 새로 조회)", ["result"]
+)
+
+Loader = Callable[[str, int], pd.DataFrame | None]
+
+
+class DataContext:
+    """(종목코드, 조회 일수) → 시세 메모와 hit/miss 수 (같은 종목 동시 조회는 하나만 실제로 받음)"""
+
+    def __init__(self):
+        self._frames: dict[tuple[str, int], pd.DataFrame | None] = {}
+        self._loading: dict[tuple[str, int], threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, symbol: str, days: int, loader: Loader) -> pd.DataFrame | None:
+        """메모에 있으면 그대로, 없으면 loader(symbol, days) 로 받아 저장 (실패·None 도 저장)"""
+        key = (symbol, days)
+        while True:
+            with self._lock:
+                if key in self._frames:
+                    self.hits += 1
+                    CONTEXT_LOOKUPS.inc(result="hit")
+                    return self._frames[key]
+                event = self._loading.get(key)
+                if event is None:
+                    event = self._loading[key] = threading.Event()
+                    self.misses += 1
+                    CONTEXT_LOOKUPS.inc(result="miss")
+                    break
+            # 다른 스레드가 받는 중 → 끝나면 메모에서 (예외로 끝났으면 다시 시도)
+            event.wait()
+        try:
+            df = loader(symbol, days)
+            with self._lock:
+                self._frames[key] = df
+            return df
+        finally:
+            with self._lock:
+                del self._loading[key]
+            event.set()
+
+    def stats(self) -> dict:
+        """{"hits", "misses", "symbols"} - symbols: 메모한 종목 수"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "symbols": len({symbol for symbol, _ in self._frames}),
+            }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return f"시세 조회 {s['misses']}건 · 재사용 {s['hits']}건 ({s['symbols']}종목)"
+
+
+_context: contextvars.ContextVar[DataContext | None] = contextvars.ContextVar("data_context", default=None)
+
+
+def current_data_context() -> DataContext | None:
+    return _context.get()
+
+
+@contextmanager
+def data_context() -> Iterator[DataContext]:
+    """이 블록 안의 fetch_stock_data 를 (종목, 일수) 별로 한 번만 조회. 이미 있으면 바깥 컨텍스트를 그대로 사용"""
+    context = _context.get()
+    if context is not None:
+        yield context
+        return
+    context = DataContext()
+    token = _context.set(context)
+    try:
+        yield context
+    finally:
+        _context.reset(token)
@@ -0,0 +1,97 @@
+"""장중 분봉 피드 - 같은 시각의 분봉을 묶음으로 차례로 전달
+
+MinuteFeed 규약(batches())만 맞추면 실시간 시세 소스를 붙일 수 있다.
+FileReplayFeed 는 저장해 둔 분봉 CSV 를 그대로 다시 흘려 장 시간이 아니어도 장중 모드를 시험한다.
+"""
+import csv
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Protocol
+
+# CSV 헤더 (대소문자 무관, 순서 무관)
+FEED_COLUMNS = ("symbol", "time", "open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True, slots=True)
+class MinuteBar:
+    """분봉 하나. 같은 종목·시각이 다시 오면 진행 중인 분봉의 갱신으로 본다"""
+    symbol: str
+    time: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class MinuteFeed(Protocol):
+    """분봉 피드"""
+
+    def batches(self) -> Iterator[list[MinuteBar]]:
+        """시각 순으로 같은 시각의 분봉 묶음 (끝나면 종료)"""
+        ...
+
+
+def _parse_row(row: dict[str, str]) -> MinuteBar:
+    row = {k.strip().lower(): v for k, v in row.items() if k}
+    return MinuteBar(
+        symbol=row["symbol"].strip(),
+        time=datetime.fromisoformat(row["time"].strip()),
+        open=float(row["open"]),
+        high=float(row["high"]),
+        low=float(row["low"]),
+        close=float(row["close"]),
+        volume=float(row["volume"] or 0),
+    )
+
+
+class FileReplayFeed:
+    """
+    분봉 CSV 재생 (헤더: symbol,time,open,high,low,close,volume / 시각 오름차순)
+    - speed: 0 이면 기다리지 않고 바로, 1 이면 실제 시간 간격, 60 이면 1분을 1초로
+    """
+
+    def __init__(self, path: str | Path, speed: float = 0.0):
+        self.path = Path(path)
+        self.speed = speed
+
+    def first_time(self) -> datetime | None:
+        """첫 분봉 시각 (빈 파일이면 None)"""
+        with self.path.open(encoding="utf-8", newline="") as f:
+            row = next(csv.DictReader(f), None)
+        return _parse_row(row).time if row else None
+
+    def batches(self) -> Iterator[list[MinuteBar]]:
+        prev: datetime | None = None
+        batch: list[MinuteBar] = []
+        with self.path.open(encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                bar = _parse_row(row)
+                if batch and bar.time != batch[0].time:
+                    prev = self._wait(prev, batch[0].time)
+                    yield batch
+                    batch = []
+                batch.append(bar)
+        if batch:
+            self._wait(prev, batch[0].time)
+            yield batch
+
+    def _wait(self, prev: datetime | None, at: datetime) -> datetime:
+        """재생 속도에 맞춰 이전 묶음과의 시각 차이만큼 대기"""
+        if self.speed > 0 and prev is not None:
+            time.sleep(max(0.0, (at - prev).total_seconds() / self.speed))
+        return at
+
+
+def write_minute_bars(path: str | Path, bars: list[MinuteBar]) -> None:
+    """분봉을 FileReplayFeed 형식 CSV 로 저장 (장중 기록 → 재생용)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FEED_COLUMNS)
+        for b in sorted(bars, key=lambda b: b.time):
+            writer.writerow([b.symbol, b.time.isoformat(sep=" "), b.open, b.high, b.low, b.close, b.volume])
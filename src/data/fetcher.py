@@ -1,33 +1,118 @@
 """주식 데이터 수집 - FinanceDataReader 사용 (한국 주식, 무료)"""
+import logging
+import time
 from datetime import datetime, timedelta
 
 import pandas as pd
 
+from config import PRICE_REFRESH_SEC
+from src.utils import metrics
+from src.utils.metrics import REGISTRY
+
+from .context import current_data_context
+from .listing import get_listing_cache
+from .store import get_price_store, merge_prices
+
 try:
     import FinanceDataReader as fdr
 except ImportError:
     fdr = None
 
+logger = logging.getLogger(__name__)
+
+FETCH_SECONDS = REGISTRY.histogram(
+    "stock_trader_fetch_seconds", "종목별 시세 조회 시간", ["result"]
+)
+FETCH_RESULTS = REGISTRY.counter(
+    "stock_trader_fetch", "종목별 시세 조회 결과 (network/store/stale/empty/error)", ["result"]
+)
+
 
-def fetch_stock_data(symbol: str, days: int = 120) -> pd.DataFrame | None:
+def _download(symbol: str, start: datetime, end: datetime) -> pd.DataFrame | None:
+    """FinanceDataReader 조회 (컬럼명 소문자 정규화)"""
+    df = fdr.DataReader(symbol, start, end)
+    if df is None or df.empty:
+        return None
+    df.columns = [c.lower() for c in df.columns]
+    return df
+
+
+def fetch_stock_data(
+    symbol: str, days: int = 120, use_store: bool = True
+) -> pd.DataFrame | None:
     """
     개별 종목 시세 조회
     symbol: 종목코드 (예: '005930' 삼성전자, '000660' SK하이닉스)
+    use_store: 로컬 저장소 사용 (저장된 구간은 다시 받지 않고 뒷부분만 추가 조회)
+    data_context() 안이면 (종목, 일수) 별로 한 번만 조회하고 이후는 같은 시세 재사용 (use_store=False 제외)
     """
     if fdr is None:
         raise ImportError("FinanceDataReader 설치 필요: pip install FinanceDataReader")
 
+    context = current_data_context()
+    if context is not None and use_store:
+        return context.load(symbol, days, _fetch_recorded)
+    return _fetch_recorded(symbol, days, use_store)
+
+
+def _fetch_recorded(symbol: str, days: int, use_store: bool = True) -> pd.DataFrame | None:
+    """_fetch + 조회 시간·결과 지표 기록"""
+    started = time.perf_counter()
+    df, result = _fetch(symbol, days, use_store)
+    elapsed = time.perf_counter() - started
+    FETCH_SECONDS.observe(elapsed, result=result)
+    FETCH_RESULTS.inc(result=result)
+    metrics.record("fetch_symbol", elapsed)
+    return df
+
+
+def _fetch(symbol: str, days: int, use_store: bool) -> tuple[pd.DataFrame | None, str]:
+    """
+    fetch_stock_data 본체
+    Returns: (시세, 결과) - 결과: network(조회함) | store(저장소만) | stale(조회 실패, 저장소 대체) | empty | error
+    """
     end = datetime.now()
     start = end - timedelta(days=days)
 
+    if not use_store:
+        try:
+            df = _download(symbol, start, end)
+        except Exception as e:
+            logger.warning("시세 조회 실패 %s: %s", symbol, e)
+            return None, "error"
+        return df, "network" if df is not None else "empty"
+
+    store = get_price_store()
+    cached, covered_from, fetched_at = store.load(symbol)
+    covered = cached is not None and not cached.empty and covered_from <= start.date()
+
+    result = "store"
     try:
-        df = fdr.DataReader(symbol, start, end)
-        if df.empty:
-            return None
-        df.columns = [c.lower() for c in df.columns]
-        return df
-    except Exception:
-        return None
+        if not covered:
+            # 저장소에 없거나 요청 구간보다 짧음 → 전체 구간 조회
+            result = "network"
+            new = _download(symbol, start, end)
+            if new is not None:
+                cached = merge_prices(cached, new)
+                store.save(symbol, cached, start.date())
+        elif time.time() - fetched_at >= PRICE_REFRESH_SEC:
+            # 마지막 저장일(장중 미완성 봉일 수 있음)부터 오늘까지만 조회
+            result = "network"
+            new = _download(symbol, cached.index[-1].to_pydatetime(), end)
+            if new is not None:
+                cached = merge_prices(cached, new)
+            store.save(symbol, cached, covered_from)
+    except Exception as e:
+        # 추가 조회 실패 시 저장된 시세로 대체
+        logger.warning("시세 조회 실패 %s: %s", symbol, e)
+        if not covered:
+            return None, "error"
+        result = "stale"
+
+    if cached is None:
+        return None, "empty"
+    df = cached[cached.index >= pd.Timestamp(start.date())]
+    return (df.copy(), result) if not df.empty else (None, "empty")
 
 
 def fetch_kospi_list() -> pd.DataFrame:
@@ -44,6 +129,13 @@ def fetch_kosdaq_list() -> pd.DataFrame:
     return fdr.StockListing("KOSDAQ")
 
 
+def fetch_sp500_list() -> pd.DataFrame:
+    """S&P 500 종목 리스트 조회 (미국 전체 스캔용)"""
+    if fdr is None:
+        raise ImportError("FinanceDataReader 설치 필요")
+    return fdr.StockListing("S&P500")
+
+
 # 한국 관심 종목 (거래 활성 종목 위주)
 DEFAULT_WATCHLIST: list[tuple[str, str]] = [
     ("005930", "삼성전자"),
@@ -141,6 +233,25 @@ def get_market_scan_universe(market: str = "kr", limit: int = 25) -> list[tuple[
         return DEFAULT_WATCHLIST.copy()[:limit]
 
 
+def get_full_market_universe(market: str = "kr") -> list[tuple[str, str]]:
+    """
+    전체 시장 스캔 대상 (개수 제한 없음)
+    - 한국: KOSPI + KOSDAQ 상장 전 종목 (약 2,500종)
+    - 미국: 관심종목 + 확장 리스트 + S&P 500
+    리스트 조회 실패 시 get_market_scan_universe 와 같은 기본 리스트
+    """
+    if market == "us":
+        pools = [US_WATCHLIST, US_MARKET_SCAN]
+        try:
+            pools.append(get_listing_cache().get("S&P500", fetch_sp500_list, numeric=False))
+        except Exception:
+            pass
+    else:
+        pools = [fetch_symbol_list("KOSPI", limit=None), fetch_symbol_list("KOSDAQ", limit=None)]
+    seen = set()
+    return [(c, n) for pool in pools for c, n in pool if c not in seen and not seen.add(c)]
+
+
 # 샛별형 스크리닝용 종목 풀 (KOSDAQ + 중소형 KOSPI)
 RISING_STAR_UNIVERSE: list[tuple[str, str]] = [
     # KOSDAQ 대표
@@ -196,28 +307,15 @@ def get_rising_star_universe(limit: int = 80) -> list[tuple[str, str]]:
         return RISING_STAR_UNIVERSE.copy()[:limit]
 
 
-def fetch_symbol_list(exchange: str = "KOSPI", limit: int = 100) -> list[tuple[str, str]]:
+def fetch_symbol_list(exchange: str = "KOSPI", limit: int | None = 100) -> list[tuple[str, str]]:
     """
-    시장별 종목 리스트 조회 (KOSPI/KOSDAQ)
+    시장별 종목 리스트 조회 (KOSPI/KOSDAQ, limit=None 이면 전체)
+    전체 리스트는 LISTING_TTL_SEC 동안 캐시 (메모리 + 디스크)
     Returns: [(종목코드, 종목명), ...]
     """
+    loader = fetch_kospi_list if exchange == "KOSPI" else fetch_kosdaq_list
     try:
-        if exchange == "KOSPI":
-            df = fetch_kospi_list()
-        else:
-            df = fetch_kosdaq_list()
-
-        if df is None or df.empty:
-            return get_watchlist()[:limit]
-
-        result = []
-        for _, row in df.iterrows():
-            code = str(row.get("Code", row.get("Symbol", "")))
-            name = str(row.get("Name", ""))
-            if code and code.isdigit():
-                result.append((code, name))
-            if len(result) >= limit:
-                break
+        result = get_listing_cache().get(exchange, loader)[:limit]
         return result if result else get_watchlist()[:limit]
     except Exception:
         return get_watchlist()[:limit]
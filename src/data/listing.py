@@ -0,0 +1,152 @@
+"""종목 리스트 캐시 - TTL + 디스크 저장
+
+거래소 전체 리스트를 받아 숫자 종목코드만 (코드, 이름) 목록으로 걸러 보관한다.
+TTL 안에서는 메모리(없으면 디스크) 값을 그대로 쓰고, 재조회가 실패하면 이전 값을 사용한다.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+
+from config import LISTING_CACHE_DIR, LISTING_TTL_SEC
+from src.utils import metrics
+from src.utils.metrics import REGISTRY
+
+Listing = list[tuple[str, str]]
+
+logger = logging.getLogger(__name__)
+
+LISTING_SECONDS = REGISTRY.histogram(
+    "stock_trader_listing_seconds", "거래소 종목 리스트 다운로드 시간", ["exchange"]
+)
+LISTING_RESULTS = REGISTRY.counter(
+    "stock_trader_listing", "종목 리스트 조회 결과 (cached/ok/error)", ["result"]
+)
+
+
+def filter_listing(df: pd.DataFrame, numeric: bool = True) -> Listing:
+    """
+    종목 리스트 DataFrame → [(종목코드, 종목명), ...] (컬럼 단위 연산)
+    numeric: 숫자 종목코드만 (한국). False 면 영문 티커 (미국, 예: 'AAPL', 'BRK.B')
+    """
+    if df is None or df.empty:
+        return []
+    code_col = "Code" if "Code" in df.columns else "Symbol" if "Symbol" in df.columns else None
+    if code_col is None:
+        return []
+    codes = df[code_col].astype(str)
+    names = df["Name"].astype(str) if "Name" in df.columns else pd.Series("", index=df.index)
+    mask = codes.str.isdigit() if numeric else codes.str.fullmatch(r"[A-Z][A-Z0-9.\-]*")
+    return list(zip(codes[mask].tolist(), names[mask].tolist()))
+
+
+class ListingCache:
+    """거래소별 종목 리스트 캐시"""
+
+    def __init__(self, root: str | Path | None = None, ttl: float | None = None):
+        self.root = Path(root or LISTING_CACHE_DIR)
+        self.ttl = LISTING_TTL_SEC if ttl is None else ttl
+        self._mem: dict[str, tuple[float, Listing]] = {}
+        self._lock = threading.Lock()
+        # 거래소별 조회 잠금 - 같은 거래소 동시 재조회는 하나만, 다른 거래소·캐시 조회는 기다리지 않음
+        self._loading: dict[str, threading.Lock] = {}
+
+    def _path(self, exchange: str) -> Path:
+        return self.root / f"{re.sub(r'[^0-9A-Za-z_-]', '_', exchange)}.json"
+
+    def _load_disk(self, exchange: str) -> tuple[float, Listing] | None:
+        try:
+            data = json.loads(self._path(exchange).read_text(encoding="utf-8"))
+            return float(data["fetched_at"]), [tuple(x) for x in data["symbols"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_disk(self, exchange: str, fetched_at: float, symbols: Listing) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self._path(exchange)
+            tmp = path.with_suffix(f".{time.monotonic_ns()}.tmp")
+            tmp.write_text(
+                json.dumps({"fetched_at": fetched_at, "symbols": symbols}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            tmp.replace(path)
+        except OSError:
+            pass
+
+    def get(
+        self, exchange: str, loader: Callable[[], pd.DataFrame], numeric: bool = True
+    ) -> Listing:
+        """
+        종목 리스트 조회 (TTL 안이면 캐시, 지나면 loader 로 재조회)
+        재조회 실패 시 이전 값, 이전 값도 없으면 예외 전달
+        빈 리스트는 저장하지 않음 (이전 값이 있으면 이전 값, 없으면 빈 리스트 - 다음 호출에서 다시 조회)
+        numeric: filter_listing 참고
+        """
+        entry = self._cached(exchange)
+        if entry is not None and time.time() - entry[0] < self.ttl:
+            LISTING_RESULTS.inc(result="cached")
+            return entry[1]
+        with self._lock:
+            loading = self._loading.setdefault(exchange, threading.Lock())
+        with loading:
+            # 기다리는 동안 다른 스레드가 받아 두었으면 그대로
+            entry = self._cached(exchange)
+            if entry is not None and time.time() - entry[0] < self.ttl:
+                LISTING_RESULTS.inc(result="cached")
+                return entry[1]
+
+            started = time.perf_counter()
+            try:
+                symbols = filter_listing(loader(), numeric=numeric)
+            except Exception as e:
+                LISTING_RESULTS.inc(result="error")
+                logger.warning("종목 리스트 조회 실패 %s: %s", exchange, e)
+                if entry is not None:
+                    return entry[1]
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                LISTING_SECONDS.observe(elapsed, exchange=exchange)
+                metrics.record("listing", elapsed)
+            LISTING_RESULTS.inc(result="ok")
+            if not symbols:
+                logger.warning("종목 리스트가 비어 있음 %s", exchange)
+                return entry[1] if entry is not None else []
+            now = time.time()
+            with self._lock:
+                self._mem[exchange] = (now, symbols)
+            self._save_disk(exchange, now, symbols)
+            return symbols
+
+    def _cached(self, exchange: str) -> tuple[float, Listing] | None:
+        """메모리(없으면 디스크)에 있는 (조회 시각, 리스트)"""
+        with self._lock:
+            entry = self._mem.get(exchange)
+        if entry is None:
+            entry = self._load_disk(exchange)
+            if entry is not None:
+                with self._lock:
+                    entry = self._mem.setdefault(exchange, entry)
+        return entry
+
+    def clear(self) -> None:
+        """메모리 캐시 비우기 (디스크 파일은 유지)"""
+        with self._lock:
+            self._mem.clear()
+
+
+_default_cache: ListingCache | None = None
+
+
+def get_listing_cache() -> ListingCache:
+    """기본 캐시 (LISTING_CACHE_DIR, LISTING_TTL_SEC)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ListingCache()
+    return _default_cache
@@ -0,0 +1,109 @@
+"""종목 시세 동시 조회 - 스레드 풀, 종목당 제한 시간 (완료 순서 스트림 / 입력 순서 목록)"""
+import contextvars
+import math
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from config import FETCH_TIMEOUT, FETCH_WORKERS
+
+from .fetcher import fetch_stock_data
+
+FetchResult = tuple[str, str, pd.DataFrame | None]
+
+
+def iter_fetch(
+    universe: list[tuple[str, str]],
+    days: int = 120,
+    workers: int | None = None,
+    timeout: float | None = None,
+    deadline: float | None = None,
+) -> Iterator[tuple[int, str, str, pd.DataFrame | None]]:
+    """
+    여러 종목 시세를 동시에 조회해 끝나는 순서대로 반환
+    - workers: 동시 조회 수 (기본 FETCH_WORKERS)
+    - timeout: 종목당 제한 시간 초 (조회 시작 기준, 기본 FETCH_TIMEOUT). 초과 종목은 None
+      초과한 조회가 모든 스레드를 붙들고 있으면 대기 중인 종목은 시작될 수 없으므로 모두 None
+    - deadline: 전체 마감 시각 (time.monotonic 기준). 지나면 남은 종목은 반환하지 않고 종료
+    Yields: (universe 내 위치, 종목코드, 종목명, 시세 또는 None) - deadline 이 없으면 모든 종목을 정확히 한 번씩
+    """
+    if not universe:
+        return
+    workers = workers or FETCH_WORKERS
+    timeout = FETCH_TIMEOUT if timeout is None else timeout
+    started: dict[int, float] = {}
+
+    def task(i: int, symbol: str) -> pd.DataFrame | None:
+        started[i] = time.monotonic()
+        return fetch_stock_data(symbol, days=days)
+
+    slots = min(workers, len(universe))
+    pool = ThreadPoolExecutor(max_workers=slots)
+    try:
+        # 호출 측 컨텍스트(실행 프로파일 등)를 작업 스레드에도 전달
+        futures: dict[Future, int] = {
+            pool.submit(contextvars.copy_context().run, task, i, symbol): i
+            for i, (symbol, _) in enumerate(universe)
+        }
+        pending = set(futures)
+        hung: set[Future] = set()
+        while pending:
+            now = time.monotonic()
+            deadlines = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+            wait_sec = max(0.0, min(deadlines) - now) if deadlines else timeout
+            if deadline is not None:
+                if now >= deadline:
+                    return
+                wait_sec = min(wait_sec, deadline - now)
+            done, pending = wait(pending, timeout=wait_sec, return_when=FIRST_COMPLETED)
+            for f in sorted(done, key=futures.get):
+                i = futures[f]
+                try:
+                    df = f.result()
+                except Exception:
+                    df = None
+                yield i, universe[i][0], universe[i][1], df
+            # 제한 시간 초과 종목은 결과 없이 제외 (스레드는 끝날 때까지 자리를 차지함)
+            now = time.monotonic()
+            expired = {
+                f for f in pending
+                if futures[f] in started and now - started[futures[f]] >= timeout
+            }
+            pending -= expired
+            hung = {f for f in hung | expired if not f.done()}
+            if len(hung) >= slots:
+                # 모든 스레드가 끝나지 않는 조회에 묶임 → 대기 중인 종목도 결과 없이 제외
+                expired |= pending
+                pending = set()
+            for f in sorted(expired, key=futures.get):
+                i = futures[f]
+                yield i, universe[i][0], universe[i][1], None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_many(
+    universe: list[tuple[str, str]],
+    days: int = 120,
+    workers: int | None = None,
+    timeout: float | None = None,
+    deadline: float | None = None,
+) -> list[FetchResult]:
+    """
+    여러 종목 시세를 동시에 조회 (iter_fetch 결과를 입력 순서로 정렬)
+    - deadline: 전체 마감 시각 (time.monotonic 기준). 기본은 스레드마다 종목당 제한 시간을 다 쓴 경우
+      (종목 수 / workers 묶음 × timeout + timeout). 마감까지 받지 못한 종목은 None
+    Returns: [(종목코드, 종목명, 시세 또는 None), ...] - universe 순서 그대로
+    """
+    if deadline is None:
+        workers = workers or FETCH_WORKERS
+        per_symbol = FETCH_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + (math.ceil(len(universe) / workers) + 1) * per_symbol
+    frames: list[pd.DataFrame | None] = [None] * len(universe)
+    for i, _, _, df in iter_fetch(
+        universe, days=days, workers=workers, timeout=timeout, deadline=deadline
+    ):
+        frames[i] = df
+    return [(symbol, name, frames[i]) for i, (symbol, name) in enumerate(universe)]
@@ -0,0 +1,144 @@
+"""시세 로컬 저장소 - 종목별 컬럼형 파일 (날짜 키)
+
+종목마다 `<symbol>.npz` 하나에 날짜 배열과 컬럼별 배열을 저장한다.
+파일명에 쓸 수 없는 문자는 '_' 로 바꾸므로 원래 종목코드도 파일 안(symbol)에 같이 둔다.
+fetch_stock_data 는 저장소를 먼저 읽고, 부족한 뒷부분 날짜만 받아 이어 붙인다.
+"""
+import re
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import PRICE_STORE_DIR
+
+
+class PriceStore:
+    """종목별 일봉 저장소"""
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root or PRICE_STORE_DIR)
+
+    def _path(self, symbol: str) -> Path:
+        # 파일명에 쓸 수 없는 문자 치환 (예: 'BRK-B' 는 그대로, '^KS11' → '_KS11')
+        safe = re.sub(r"[^0-9A-Za-z._-]", "_", symbol)
+        return self.root / f"{safe}.npz"
+
+    def symbols(self) -> list[str]:
+        """저장된 종목코드 목록 (파일명에 '_' 가 있으면 치환됐을 수 있어 파일에 저장된 원래 코드로)"""
+        if not self.root.exists():
+            return []
+        return sorted(
+            self._stored_symbol(p) if "_" in p.stem else p.stem
+            for p in self.root.glob("*.npz")
+            if ".tmp" not in p.name
+        )
+
+    @staticmethod
+    def _stored_symbol(path: Path) -> str:
+        """파일에 저장된 종목코드 (symbol 이 없는 예전 파일·읽기 실패는 파일명)"""
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                if "symbol" in z.files:
+                    return str(z["symbol"])
+        except Exception:
+            pass
+        return path.stem
+
+    def load(self, symbol: str) -> tuple[pd.DataFrame | None, date | None, float]:
+        """
+        저장된 시세 조회
+        Returns: (시세, 조회 보장 시작일, 마지막 네트워크 조회 시각)
+        """
+        path = self._path(symbol)
+        if not path.exists():
+            return None, None, 0.0
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                columns = [str(c) for c in z["columns"]]
+                data = {c: z[f"c{i}"] for i, c in enumerate(columns)}
+                index = pd.DatetimeIndex(z["dates"].astype("datetime64[ns]"), name="Date")
+                covered_from = z["covered_from"].astype("datetime64[D]").item()
+                fetched_at = float(z["fetched_at"])
+        except Exception:
+            # 손상된 파일은 없는 것으로 취급 (다음 조회 때 덮어씀)
+            return None, None, 0.0
+        return pd.DataFrame(data, index=index), covered_from, fetched_at
+
+    def load_arrays(
+        self, symbol: str, columns: tuple[str, ...] = ("close", "high", "volume")
+    ) -> dict[str, np.ndarray] | None:
+        """
+        DataFrame 없이 배열로 조회 (대량 로드용)
+        Returns: {"dates": datetime64[D], 컬럼명: float64 배열, ...} - 없는 컬럼은 NaN
+        """
+        record = self.load_record(symbol, columns)
+        return record[0] if record else None
+
+    def load_record(
+        self, symbol: str, columns: tuple[str, ...] = ("close", "high", "volume")
+    ) -> tuple[dict[str, np.ndarray], date, float] | None:
+        """load_arrays + (조회 보장 시작일, 마지막 네트워크 조회 시각)"""
+        path = self._path(symbol)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                names = [str(c) for c in z["columns"]]
+                out = {"dates": z["dates"].astype("datetime64[D]")}
+                for col in columns:
+                    out[col] = (
+                        z[f"c{names.index(col)}"].astype(np.float64)
+                        if col in names
+                        else np.full(len(out["dates"]), np.nan)
+                    )
+                covered_from = z["covered_from"].astype("datetime64[D]").item()
+                fetched_at = float(z["fetched_at"])
+        except Exception:
+            return None
+        return out, covered_from, fetched_at
+
+    def save(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        covered_from: date,
+        fetched_at: float | None = None,
+    ) -> None:
+        """시세 저장 (임시 파일에 쓴 뒤 교체 - 동시 조회 중에도 깨진 파일을 읽지 않음)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "symbol": np.array(symbol),
+            "dates": df.index.values.astype("datetime64[D]"),
+            "columns": np.array([str(c) for c in df.columns]),
+            "covered_from": np.array(covered_from, dtype="datetime64[D]"),
+            "fetched_at": np.array(time.time() if fetched_at is None else fetched_at),
+        }
+        for i, c in enumerate(df.columns):
+            arrays[f"c{i}"] = df[c].to_numpy()
+        path = self._path(symbol)
+        tmp = path.with_name(f"{path.stem}.{time.monotonic_ns()}.tmp.npz")
+        np.savez(tmp, **arrays)
+        tmp.replace(path)
+
+
+def merge_prices(old: pd.DataFrame | None, new: pd.DataFrame) -> pd.DataFrame:
+    """기존 시세 + 신규 시세 병합 (겹치는 날짜는 신규 값 우선)"""
+    if old is None or old.empty:
+        return new.sort_index()
+    merged = pd.concat([old[old.index < new.index[0]], new])
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+
+_default_store: PriceStore | None = None
+
+
+def get_price_store() -> PriceStore:
+    """기본 저장소 (PRICE_STORE_DIR)"""
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore()
+    return _default_store
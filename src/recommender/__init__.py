@@ -1,14 +1,70 @@
 """추천 모듈"""
+from .intraday import Candle, IntradaySession, SignalChange
+from .panel import IndicatorPanel
+from .ranking import RISING_ONLY, RankFilter, TopK
+from .rules import (
+    RISING_RULES,
+    RULESETS,
+    TREND_RULES,
+    Case,
+    Rule,
+    RuleSet,
+    evaluate_rulesets,
+    register_rules,
+    rising_rules,
+    trend_rules,
+)
+from .scan import CompactPanel, ScanResult, rank_panel
 from .strategy import (
+    REASON_TEXT,
+    STRATEGIES,
+    Reason,
     Recommendation,
+    Snapshot,
     add_technical_indicators,
+    evaluate_all,
     evaluate_rising_star,
     evaluate_stock,
+    latest_snapshot,
+    register_strategy,
+    render_reason,
 )
+from .streaming import IndicatorState, load_states, save_states
 
 __all__ = [
     "Recommendation",
+    "Reason",
+    "REASON_TEXT",
+    "render_reason",
     "evaluate_stock",
     "evaluate_rising_star",
+    "evaluate_all",
+    "register_strategy",
+    "STRATEGIES",
     "add_technical_indicators",
+    "latest_snapshot",
+    "Snapshot",
+    "IndicatorPanel",
+    "CompactPanel",
+    "ScanResult",
+    "rank_panel",
+    "RankFilter",
+    "TopK",
+    "RISING_ONLY",
+    "Case",
+    "Rule",
+    "RuleSet",
+    "RULESETS",
+    "TREND_RULES",
+    "RISING_RULES",
+    "evaluate_rulesets",
+    "register_rules",
+    "trend_rules",
+    "rising_rules",
+    "IndicatorState",
+    "save_states",
+    "load_states",
+    "IntradaySession",
+    "SignalChange",
+    "Candle",
 ]
@@ -0,0 +1,182 @@
+"""장중 신호 갱신 - 분봉을 당일 잠정 일봉에 합치고, 바뀐 종목만 다시 평가해 신호 변화 전달
+
+종목마다 전일까지의 IndicatorState 를 한 번 만들어 두고, 분봉이 올 때마다
+state.copy() 에 잠정 일봉을 append 해 평가한다 (120일 시세를 다시 받지 않음).
+날짜가 바뀌면 전날 잠정 일봉을 완성된 봉으로 상태에 넣는다.
+"""
+import math
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from src.utils.metrics import REGISTRY
+
+from .strategy import Recommendation, evaluate_all
+from .streaming import IndicatorState
+
+if TYPE_CHECKING:
+    from src.data.feed import MinuteBar, MinuteFeed
+
+BATCH_SECONDS = REGISTRY.histogram(
+    "stock_trader_intraday_batch_seconds", "장중 분봉 묶음 하나 반영·재평가 시간"
+)
+SIGNAL_CHANGES = REGISTRY.counter(
+    "stock_trader_intraday_signal_changes", "장중 신호 변화 수", ["strategy"]
+)
+
+
+@dataclass(slots=True)
+class Candle:
+    """당일 잠정 일봉 (분봉 누적)"""
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    last_time: datetime
+    last_volume: float  # 마지막 분봉 거래량 (같은 분봉 갱신 시 빼고 다시 더함)
+
+    @classmethod
+    def start(cls, bar: "MinuteBar") -> "Candle":
+        return cls(bar.open, bar.high, bar.low, bar.close, bar.volume, bar.time, bar.volume)
+
+    def fold(self, bar: "MinuteBar") -> None:
+        """분봉 하나 반영 (진행 중인 같은 분봉이 다시 오면 거래량은 교체)"""
+        if bar.time == self.last_time:
+            self.volume -= self.last_volume
+        self.high = max(self.high, bar.high)
+        self.low = min(self.low, bar.low)
+        self.close = bar.close
+        self.volume += bar.volume
+        self.last_time = bar.time
+        self.last_volume = bar.volume
+
+
+@dataclass(frozen=True, slots=True)
+class SignalChange:
+    """종목·전략 하나의 신호 변화 (before/after None = 평가 불가)"""
+    symbol: str
+    name: str
+    strategy: str
+    time: datetime
+    before: str | None
+    after: str | None
+    recommendation: Recommendation | None
+
+    def to_dict(self) -> dict:
+        rec = self.recommendation
+        return {
+            "symbol": self.symbol,
+            "name": self.name,
+            "strategy": self.strategy,
+            "time": self.time.isoformat(),
+            "before": self.before,
+            "after": self.after,
+            "score": rec.score if rec else None,
+            "price": rec.current_price if rec else None,
+            "reasons": rec.render_reasons(4) if rec else [],
+        }
+
+
+class IntradaySession:
+    """
+    장중 세션 - 종목별 전일까지 상태 + 당일 잠정 일봉
+    - members: 종목별 평가 전략 (기본: 등록된 전체)
+    - day: 세션 날짜. 상태에 이미 이 날짜 이후 봉이 있으면 그 종목의 분봉은 무시
+    """
+
+    def __init__(
+        self,
+        universe: Sequence[tuple[str, str]],
+        states: dict[str, IndicatorState],
+        members: dict[str, list[str]] | None = None,
+        day: date | None = None,
+    ):
+        self.names = {s: n for s, n in universe if s in states}
+        self.states = states
+        self.members = members or {}
+        self.day = day
+        self.candles: dict[str, Candle] = {}
+        # (종목, 전략) → 마지막으로 알린 신호. 시작 시 전일 종가 기준 신호
+        self.signals: dict[tuple[str, str], str | None] = {}
+        self.latest: dict[tuple[str, str], Recommendation | None] = {}
+        for symbol in self.names:
+            for strategy, rec in self._evaluate(symbol, states[symbol]).items():
+                self.signals[(symbol, strategy)] = rec.signal if rec else None
+                self.latest[(symbol, strategy)] = rec
+
+    @classmethod
+    def from_frames(
+        cls,
+        fetched: Iterable[tuple[str, str, pd.DataFrame | None]],
+        members: dict[str, list[str]] | None = None,
+        day: date | None = None,
+    ) -> "IntradaySession":
+        """일봉 시세 [(종목코드, 종목명, 시세)] → 세션 (day 당일·이후 봉은 장중 잠정 봉이라 제외)"""
+        day = day or datetime.now().date()
+        universe, states = [], {}
+        for symbol, name, df in fetched:
+            if df is None or df.empty:
+                continue
+            states[symbol] = IndicatorState.from_frame(df[df.index < pd.Timestamp(day)])
+            universe.append((symbol, name))
+        return cls(universe, states, members, day)
+
+    def _evaluate(self, symbol: str, state: IndicatorState) -> dict[str, Recommendation | None]:
+        return evaluate_all(state, symbol, self.names[symbol], self.members.get(symbol))
+
+    def close_day(self) -> None:
+        """잠정 일봉을 완성된 봉으로 상태에 추가 (날짜가 바뀔 때, 장 마감 후 상태 저장 전)"""
+        for symbol, c in self.candles.items():
+            self.states[symbol].append(c.close, c.high, c.volume, c.last_time.strftime("%Y-%m-%d"))
+        self.candles.clear()
+
+    def ingest(self, bars: Iterable["MinuteBar"]) -> list[SignalChange]:
+        """분봉 묶음 반영 → 잠정 봉이 바뀐 종목만 다시 평가해 신호가 달라진 것 반환"""
+        started = time.perf_counter()
+        dirty: dict[str, datetime] = {}
+        for bar in bars:
+            state = self.states.get(bar.symbol)
+            if state is None or math.isnan(bar.close):
+                continue
+            bar_day = bar.time.date()
+            if self.day is None or bar_day > self.day:
+                if self.day is not None:
+                    self.close_day()
+                self.day = bar_day
+            elif bar_day < self.day:
+                continue
+            if state.last_date is not None and state.last_date >= bar_day.isoformat():
+                continue  # 일봉으로 이미 반영된 날짜
+            candle = self.candles.get(bar.symbol)
+            if candle is None:
+                self.candles[bar.symbol] = Candle.start(bar)
+            else:
+                candle.fold(bar)
+            dirty[bar.symbol] = bar.time
+
+        changes = []
+        for symbol, at in dirty.items():
+            c = self.candles[symbol]
+            preview = self.states[symbol].copy()
+            preview.append(c.close, c.high, c.volume)
+            for strategy, rec in self._evaluate(symbol, preview).items():
+                key = (symbol, strategy)
+                self.latest[key] = rec
+                after = rec.signal if rec else None
+                before = self.signals.get(key)
+                if after != before:
+                    self.signals[key] = after
+                    SIGNAL_CHANGES.inc(strategy=strategy)
+                    changes.append(SignalChange(symbol, self.names[symbol], strategy, at, before, after, rec))
+        BATCH_SECONDS.observe(time.perf_counter() - started)
+        return changes
+
+    def run(self, feed: "MinuteFeed") -> Iterator[list[SignalChange]]:
+        """피드가 끝날 때까지 묶음마다 신호 변화 (변화 없는 묶음은 빈 목록)"""
+        for batch in feed.batches():
+            yield self.ingest(batch)
@@ -0,0 +1,250 @@
+"""종목 × 날짜 패널 지표 엔진 - 전체 종목 지표를 한 번에 계산
+
+종목별 시세를 하나의 연속 배열로 이어 붙이고, 종목 경계를 넘지 않는 창(window)으로
+롤링 계산을 한 번만 수행한다. 결과는 (종목 수, 최대 봉 수) 2차원 배열에 오른쪽 정렬
+(마지막 열 = 각 종목의 최신 봉, 앞쪽 빈칸 NaN)로 담는다.
+롤링 평균은 add_technical_indicators 와 같은 pandas 롤링 커널을 사용하므로 값이 동일하다.
+"""
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+
+from .strategy import STRATEGIES, Recommendation, Snapshot, evaluate_all
+
+try:
+    import ta  # noqa: F401  (add_technical_indicators 와 동일하게 설치 여부로 RSI 계산 결정)
+
+    _HAS_TA = True
+except ImportError:
+    _HAS_TA = False
+
+
+class _SegmentIndexer(BaseIndexer):
+    """종목 구간을 넘지 않는 고정 길이 창"""
+
+    def __init__(self, seg_start: np.ndarray, window: int):
+        super().__init__(window_size=window)
+        self.seg_start = seg_start
+
+    def get_window_bounds(self, num_values=0, min_periods=None, center=None, closed=None, step=None):
+        end = np.arange(1, num_values + 1, dtype=np.int64)
+        start = np.maximum(end - self.window_size, self.seg_start)
+        return start, end
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray | None:
+    """대/소문자 컬럼 중 있는 쪽을 float64 배열로"""
+    for col in (name.capitalize(), name):
+        if col in df.columns:
+            return df[col].to_numpy(dtype=np.float64)
+    return None
+
+
+def compute_indicators(
+    close: np.ndarray,
+    high: np.ndarray,
+    volume: np.ndarray,
+    lengths: np.ndarray,
+    ma_windows: tuple[int, int, int] = (5, 20, 60),
+    rsi_window: int = 14,
+) -> dict[str, np.ndarray]:
+    """
+    이어 붙인 종목별 시세(1차원, 종목 순서대로 lengths 만큼)의 봉마다 지표 계산
+    Returns: {"ma5","ma20","ma60","rsi","vol_ma20","vol_ma5","high_20d","close_5d_ago","pos"}
+    - pos: 종목 내 봉 번호 (0부터). vol_ma5/high_20d 는 pos >= 19 구간만 유효 (평가 최소 20봉)
+    - ma_windows/rsi_window: 이동평균(ma5/ma20/ma60 자리)·RSI 창. 파라미터 탐색용이며 키 이름은 그대로
+    """
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    seg_start = np.repeat(offsets[:-1], lengths)
+    pos = np.arange(len(close), dtype=np.int64) - seg_start
+
+    def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+        indexer = _SegmentIndexer(seg_start, window)
+        return pd.Series(values).rolling(indexer, min_periods=window).mean().to_numpy()
+
+    def shifted(values: np.ndarray, k: int) -> np.ndarray:
+        """종목 내 k봉 전 값 (없으면 NaN)"""
+        out = np.full_like(values, np.nan)
+        if k < len(values):
+            out[k:] = values[:-k] if k else values
+        out[pos < k] = np.nan
+        return out
+
+    out = {
+        "pos": pos,
+        "ma5": rolling_mean(close, ma_windows[0]),
+        "ma20": rolling_mean(close, ma_windows[1]),
+        "ma60": rolling_mean(close, ma_windows[2]),
+        "vol_ma20": rolling_mean(volume, 20),
+        "close_5d_ago": shifted(close, 5),
+    }
+
+    # RSI (기본 14일) - 종목 첫 봉의 변화량은 NaN → 상승/하락폭 0 (pandas diff/where 와 동일)
+    if _HAS_TA:
+        delta = close - shifted(close, 1)
+        with np.errstate(invalid="ignore"):
+            gain = np.where(delta > 0, delta, 0.0)
+            loss = np.where(delta < 0, -delta, 0.0)
+        avg_gain = rolling_mean(gain, rsi_window)
+        avg_loss = rolling_mean(loss, rsi_window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = avg_gain / np.where(avg_loss == 0, 1e-10, avg_loss)
+            out["rsi"] = 100 - (100 / (1 + rs))
+    else:
+        out["rsi"] = np.full_like(close, 50.0)
+
+    # 최근 5봉 거래량 평균 (Series.tail(5).mean() 과 같은 합산 순서: v0 + (((v1+v2)+v3)+v4), NaN 제외)
+    vols = [shifted(volume, k) for k in range(4, -1, -1)]
+    valid = [~np.isnan(v) for v in vols]
+    filled = [np.where(m, v, 0.0) for v, m in zip(vols, valid)]
+    inner = ((filled[1] + filled[2]) + filled[3]) + filled[4]
+    count = sum(m.astype(np.int64) for m in valid)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vol_ma5 = (filled[0] + inner) / count
+    vol_ma5[pos < 4] = np.nan
+    out["vol_ma5"] = vol_ma5
+
+    # 최근 20봉 고가 최고치 (NaN 제외)
+    high_20d = shifted(high, 19)
+    for k in range(18, -1, -1):
+        high_20d = np.fmax(high_20d, shifted(high, k))
+    high_20d[pos < 19] = np.nan
+    out["high_20d"] = high_20d
+    return out
+
+
+def snapshot_from_arrays(close: np.ndarray, high: np.ndarray, volume: np.ndarray) -> Snapshot:
+    """
+    한 종목 가격 배열(PriceArchive.window 등)에서 최신 봉 Snapshot 계산
+    float64 배열이면 복사 없이 그대로 읽는다. 같은 구간 DataFrame 의 latest_snapshot 과 같은 값
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    if n == 0:
+        return Snapshot(n_bars=0, close=float("nan"))
+    ind = compute_indicators(
+        close,
+        np.asarray(high, dtype=np.float64),
+        np.asarray(volume, dtype=np.float64),
+        np.array([n], dtype=np.int64),
+    )
+    j = n - 1
+    return Snapshot(
+        n_bars=n,
+        close=float(close[j]),
+        ma5=ind["ma5"][j],
+        ma20=ind["ma20"][j],
+        ma60=ind["ma60"][j],
+        rsi=ind["rsi"][j],
+        vol_ma20=ind["vol_ma20"][j],
+        vol_ma5=ind["vol_ma5"][j],
+        high_20d=ind["high_20d"][j],
+        close_5d_ago=float(close[j - 5]) if n >= 6 else None,
+    )
+
+
+class IndicatorPanel:
+    """
+    전체 종목 지표 패널
+    - close/high/volume, ma5/ma20/ma60, rsi, vol_ma20: (종목 수, 봉 수) 배열
+    - vol_ma5, high_20d, close_5d_ago: 종목별 최신 값 (1차원)
+    """
+
+    def __init__(self, symbols: list[str], frames: Sequence[pd.DataFrame | None]):
+        self.symbols = symbols
+        closes, highs, vols = [], [], []
+        for df in frames:
+            close = _column(df, "close") if df is not None and not df.empty else None
+            if close is None:
+                closes.append(np.empty(0))
+                highs.append(np.empty(0))
+                vols.append(np.empty(0))
+                continue
+            closes.append(close)
+            high = _column(df, "high")
+            highs.append(high if high is not None else np.full(len(close), np.nan))
+            vol = _column(df, "volume")
+            vols.append(vol if vol is not None else np.full(len(close), np.nan))
+
+        self.lengths = np.array([len(c) for c in closes], dtype=np.int64)
+        n, width = len(closes), int(self.lengths.max()) if len(closes) else 0
+        close = np.concatenate(closes) if n else np.empty(0)
+        high = np.concatenate(highs) if n else np.empty(0)
+        volume = np.concatenate(vols) if n else np.empty(0)
+        ind = compute_indicators(close, high, volume, self.lengths)
+
+        # 오른쪽 정렬 2차원 배치
+        row = np.repeat(np.arange(n), self.lengths)
+        col = width - np.repeat(self.lengths, self.lengths) + ind["pos"]
+
+        def to_panel(values: np.ndarray) -> np.ndarray:
+            out = np.full((n, width), np.nan)
+            out[row, col] = values
+            return out
+
+        self.close = to_panel(close)
+        self.high = to_panel(high)
+        self.volume = to_panel(volume)
+        self.ma5 = to_panel(ind["ma5"])
+        self.ma20 = to_panel(ind["ma20"])
+        self.ma60 = to_panel(ind["ma60"])
+        self.rsi = to_panel(ind["rsi"])
+        self.vol_ma20 = to_panel(ind["vol_ma20"])
+
+        # 종목별 최신 봉 값
+        last = np.cumsum(self.lengths) - 1
+        has = self.lengths > 0
+        self.vol_ma5 = np.full(n, np.nan)
+        self.high_20d = np.full(n, np.nan)
+        self.close_5d_ago = np.full(n, np.nan)
+        self.vol_ma5[has] = ind["vol_ma5"][last[has]]
+        self.high_20d[has] = ind["high_20d"][last[has]]
+        self.close_5d_ago[has] = ind["close_5d_ago"][last[has]]
+
+    @classmethod
+    def from_frames(cls, items: Sequence[tuple[str, pd.DataFrame | None]]) -> "IndicatorPanel":
+        """[(종목코드, 시세), ...] 로 패널 생성"""
+        return cls([s for s, _ in items], [df for _, df in items])
+
+    def snapshot(self, i: int) -> Snapshot:
+        """i번째 종목의 최신 봉 지표 (evaluate_stock/evaluate_rising_star 입력)"""
+        n_bars = int(self.lengths[i])
+        if n_bars == 0:
+            return Snapshot(n_bars=0, close=float("nan"))
+        return Snapshot(
+            n_bars=n_bars,
+            close=float(self.close[i, -1]),
+            ma5=self.ma5[i, -1],
+            ma20=self.ma20[i, -1],
+            ma60=self.ma60[i, -1],
+            rsi=self.rsi[i, -1],
+            vol_ma20=self.vol_ma20[i, -1],
+            vol_ma5=self.vol_ma5[i],
+            high_20d=self.high_20d[i],
+            close_5d_ago=float(self.close_5d_ago[i]) if n_bars >= 6 else None,
+        )
+
+    def evaluate(
+        self, names: Sequence[str], category: str = "trend"
+    ) -> list[Recommendation | None]:
+        """전체 종목을 한 전략으로 평가 (category: STRATEGIES 이름), 종목 순서 유지"""
+        return list(self.iter_evaluate(names, category))
+
+    def iter_evaluate(
+        self, names: Sequence[str], category: str = "trend"
+    ) -> Iterator[Recommendation | None]:
+        """evaluate 의 지연 버전 (결과 목록을 만들지 않음, TopK 등에 바로 넘길 때)"""
+        evaluator = STRATEGIES[category]
+        for i, (symbol, name) in enumerate(zip(self.symbols, names)):
+            yield evaluator(self.snapshot(i), symbol, name)
+
+    def evaluate_all(
+        self, names: Sequence[str], strategies: Sequence[str] | None = None
+    ) -> list[dict[str, Recommendation | None]]:
+        """전체 종목을 여러 전략으로 평가 (종목당 Snapshot 1회 생성)"""
+        return [
+            evaluate_all(self.snapshot(i), symbol, name, strategies)
+            for i, (symbol, name) in enumerate(zip(self.symbols, names))
+        ]
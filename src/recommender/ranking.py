@@ -0,0 +1,102 @@
+"""추천 순위 - 조건 필터 + 상위 K개만 유지하는 힙
+
+수천 종목을 평가해도 결과 전체를 모아 정렬하지 않고, 조건에 맞는 상위 K개만 메모리에 둔다.
+순서는 점수 내림차순, 같은 점수는 먼저 들어온 순 (전체를 안정 정렬해 자른 것과 같음).
+"""
+import heapq
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .strategy import Recommendation
+
+
+@dataclass(frozen=True)
+class RankFilter:
+    """
+    추천 결과 조건 (None 이면 조건 없음)
+    - signals: 허용 신호 ("매수", "관망", "주의", "샛별")
+    - min_score: 최소 점수 (이상)
+    - categories: 허용 전략 ("trend", "rising_star")
+    """
+    signals: frozenset[str] | None = None
+    min_score: float | None = None
+    categories: frozenset[str] | None = None
+
+    def accepts(self, score: float, signal: str, category: str) -> bool:
+        if self.min_score is not None and not score >= self.min_score:
+            return False
+        if self.signals is not None and signal not in self.signals:
+            return False
+        if self.categories is not None and category not in self.categories:
+            return False
+        return True
+
+    def matches(self, rec: Recommendation) -> bool:
+        return self.accepts(rec.score, rec.signal, rec.category)
+
+    def merge(self, other: "RankFilter | None") -> "RankFilter":
+        """두 조건을 모두 만족하는 조건"""
+        if other is None:
+            return self
+
+        def both(a, b):
+            if a is None or b is None:
+                return a if b is None else b
+            return a & b
+
+        min_score = self.min_score
+        if other.min_score is not None:
+            min_score = other.min_score if min_score is None else max(min_score, other.min_score)
+        return RankFilter(
+            signals=both(self.signals, other.signals),
+            min_score=min_score,
+            categories=both(self.categories, other.categories),
+        )
+
+
+# 샛별 추천 목록 조건 ('샛별' 신호만)
+RISING_ONLY = RankFilter(signals=frozenset({"샛별"}))
+
+
+class TopK:
+    """
+    조건에 맞는 추천 결과 중 점수 상위 k개 (k=None 이면 전부)
+    push 한 결과 중 조건 통과 수는 matched, 전체는 seen
+    """
+
+    def __init__(self, k: int | None = None, where: RankFilter | None = None):
+        self.k = k
+        self.where = where
+        self.seen = 0
+        self.matched = 0
+        # 최소 힙: (점수, -순번, 결과) - 꺼낼 때 가장 낮은 점수, 같은 점수면 가장 늦게 들어온 것
+        self._heap: list[tuple[float, int, Recommendation]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, rec: Recommendation | None) -> bool:
+        """결과 하나 추가 (None 이나 조건 불일치는 무시). 상위 k개 안에 들었으면 True"""
+        if rec is None:
+            return False
+        self.seen += 1
+        if self.where is not None and not self.where.matches(rec):
+            return False
+        self.matched += 1
+        item = (rec.score, -self.matched, rec)
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+            return True
+        if self.k <= 0 or item[:2] <= self._heap[0][:2]:
+            return False
+        heapq.heapreplace(self._heap, item)
+        return True
+
+    def extend(self, recs: Iterable[Recommendation | None]) -> "TopK":
+        for rec in recs:
+            self.push(rec)
+        return self
+
+    def results(self) -> list[Recommendation]:
+        """점수 내림차순 (같은 점수는 들어온 순)"""
+        return [rec for _, _, rec in sorted(self._heap, key=lambda x: (-x[0], -x[1]))]
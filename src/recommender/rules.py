@@ -0,0 +1,378 @@
+"""선언형 점수 규칙 - 조건·가중치·사유를 표로 적고, 지표 배열 전체에 한 번에 적용
+
+규칙 하나는 if/elif 묶음이다. requires 가 참인 행에서 위에서부터 처음 맞는 Case 하나의 점수를 더한다.
+조건식은 지표 이름(close, ma5, ma20, ma60, rsi, vol_ma20, vol_ma5, high_20d, close_5d_ago)과
+RuleSet.define 의 파생 값, 숫자, + - * /, 비교(연쇄 가능), and/or/not, valid(...)(NaN 아님)로 쓴다.
+식은 한 번 파싱해 NumPy 배열 연산 함수로 바꿔 두고, 여러 전략을 같이 평가하면 같은 식은 한 번만 계산한다.
+
+예) Rule("골든크로스", [Case("ma5 > ma20", 2.0, Reason.MA5_ABOVE_MA20), ...], requires="valid(ma5, ma20)")
+점수는 평가 함수와 같은 순서로 더하므로 evaluate_stock / evaluate_rising_star 와 값이 같다.
+"""
+import ast
+import functools
+import operator
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .strategy import STRATEGIES, Reason, Recommendation, Snapshot, _to_snapshot
+
+# 평가 시 값 (배열 또는 스칼라)
+Value = np.ndarray | float | bool
+Expr = Callable[["_Env"], Value]
+
+COLUMNS = ("close", "ma5", "ma20", "ma60", "rsi", "vol_ma20", "vol_ma5", "high_20d", "close_5d_ago")
+
+_BINOPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+_CMPOPS = {
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt,
+    ast.GtE: operator.ge, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+
+
+def _valid(*values: Value) -> Value:
+    out = True
+    for v in values:
+        out = out & ~np.isnan(v)
+    return out
+
+
+def _build(node: ast.AST, src: str) -> Expr:
+    """파이썬 식 AST → env 를 받아 배열을 돌려주는 함수"""
+    if isinstance(node, ast.Expression):
+        return _build(node.body, src)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, bool)):
+        value = node.value
+        return lambda env: value
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda env: env[name]
+    if isinstance(node, ast.UnaryOp):
+        arg = _build(node.operand, src)
+        if isinstance(node.op, ast.USub):
+            return lambda env: -arg(env)
+        if isinstance(node.op, ast.Not):
+            return lambda env: ~np.asarray(arg(env), dtype=bool)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+        op, left, right = _BINOPS[type(node.op)], _build(node.left, src), _build(node.right, src)
+        return lambda env: op(left(env), right(env))
+    if isinstance(node, ast.BoolOp):
+        parts = [_build(v, src) for v in node.values]
+        combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        return lambda env: functools.reduce(combine, (np.asarray(p(env), dtype=bool) for p in parts))
+    if isinstance(node, ast.Compare) and all(type(op) in _CMPOPS for op in node.ops):
+        # a < b < c → (a < b) & (b < c)
+        terms = [_build(n, src) for n in [node.left, *node.comparators]]
+        ops = [_CMPOPS[type(op)] for op in node.ops]
+
+        def compare(env):
+            values = [t(env) for t in terms]
+            out = ops[0](values[0], values[1])
+            for k in range(1, len(ops)):
+                out = out & ops[k](values[k], values[k + 1])
+            return out
+
+        return compare
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "valid":
+        args = [_build(a, src) for a in node.args]
+        return lambda env: _valid(*(a(env) for a in args))
+    raise ValueError(f"규칙 식에서 쓸 수 없는 구문: {ast.dump(node)} ({src!r})")
+
+
+@functools.lru_cache(maxsize=None)
+def compile_expr(src: str) -> Expr:
+    """규칙 식 문자열 → 배열 연산 함수 (같은 문자열은 한 번만 파싱)"""
+    return _build(ast.parse(src.strip(), mode="eval"), src)
+
+
+class _Env:
+    """식 평가 환경 - 지표 배열 + 파생 값, 식 결과는 문자열 단위로 한 번만 계산"""
+
+    def __init__(self, columns: Mapping[str, np.ndarray], defines: Mapping[str, str]):
+        self.columns = columns
+        self.defines = dict(defines)
+        self.n = len(columns["close"])
+        self._memo: dict[str, Value] = {}
+
+    def __getitem__(self, name: str) -> Value:
+        if name in self.columns:
+            return self.columns[name]
+        if name in self.defines:
+            return self.eval(self.defines[name])
+        raise KeyError(f"규칙 식의 알 수 없는 이름: {name}")
+
+    def eval(self, src: str) -> Value:
+        if src not in self._memo:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self._memo[src] = compile_expr(src)(self)
+        return self._memo[src]
+
+    def mask(self, src: str) -> np.ndarray:
+        """조건식 → 행 수 길이의 bool 배열 (NaN 비교는 거짓)"""
+        return np.broadcast_to(np.asarray(self.eval(src), dtype=bool), (self.n,))
+
+
+@dataclass(frozen=True)
+class Case:
+    """조건 하나: when 이 참이면 points 가산, 사유 reason (value 식의 값이 문구에 들어감)"""
+    when: str
+    points: float = 0.0
+    reason: Reason | None = None
+    value: str | None = None
+
+
+@dataclass(frozen=True)
+class Rule:
+    """if/elif 묶음 - requires 가 참인 행에서 cases 중 처음 맞는 하나만 적용"""
+    name: str
+    cases: tuple[Case, ...]
+    requires: str | None = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "cases", tuple(self.cases))
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """
+    전략 하나의 규칙 모음
+    - signals: (최소 점수, 신호) 높은 점수부터, 어느 것도 안 되면 default_signal (판정은 반올림 전 점수)
+    - define: 조건식에서 쓸 파생 값 {이름: 식}
+    - min_bars: 이보다 봉이 적은 종목은 평가하지 않음 (점수 NaN)
+    """
+    name: str
+    rules: tuple[Rule, ...]
+    signals: tuple[tuple[float, str], ...]
+    default_signal: str
+    define: Mapping[str, str] = field(default_factory=dict)
+    min_bars: int = 20
+
+    def __post_init__(self):
+        object.__setattr__(self, "rules", tuple(self.rules))
+        object.__setattr__(self, "signals", tuple(self.signals))
+
+    @property
+    def labels(self) -> tuple[str, ...]:
+        """신호 코드 → 이름 (점수 낮은 쪽부터, 0 = default_signal)"""
+        return (self.default_signal,) + tuple(s for _, s in reversed(self.signals))
+
+    def evaluate(self, columns: Mapping[str, np.ndarray], pos: np.ndarray | None = None) -> "RuleScores":
+        """지표 배열 전체 평가 (pos: 종목 내 봉 번호, 없으면 모든 행을 평가 대상으로)"""
+        return evaluate_rulesets([self], columns, pos)[self.name]
+
+    def scores(self, ind: Mapping[str, np.ndarray], close: np.ndarray) -> np.ndarray:
+        """compute_indicators 결과 + close → 반올림 전 점수 (봉 부족은 NaN)"""
+        return self.evaluate({**ind, "close": close}, ind["pos"]).score
+
+    def signal_codes(self, score: np.ndarray) -> np.ndarray:
+        """점수 → 신호 코드 (labels 인덱스, 평가 불가 -1)"""
+        thresholds = [t for t, _ in self.signals]
+        codes = [len(thresholds) - k for k in range(len(thresholds))]
+        with np.errstate(invalid="ignore"):
+            code = np.select([score >= t for t in thresholds], codes, default=0)
+        return np.where(np.isnan(score), -1, code).astype(np.int8)
+
+
+@dataclass
+class RuleScores:
+    """RuleSet 평가 결과 - 점수 배열 (사유는 필요한 행만 조건 배열에서 다시 찾음)"""
+    ruleset: RuleSet
+    score: np.ndarray
+    env: _Env
+
+    @functools.cached_property
+    def signals(self) -> np.ndarray:
+        """신호 코드 (RuleSet.labels 인덱스)"""
+        return self.ruleset.signal_codes(self.score)
+
+    def reason_codes(self, i: int) -> list[tuple[int, float]]:
+        """i 행의 (사유 코드, 값) - 규칙 순서"""
+        out = []
+        for rule in self.ruleset.rules:
+            if rule.requires and not self.env.mask(rule.requires)[i]:
+                continue
+            case = next((c for c in rule.cases if self.env.mask(c.when)[i]), None)
+            if case is None or case.reason is None:
+                continue
+            value = 0.0
+            if case.value is not None:
+                v = self.env.eval(case.value)
+                value = float(v[i] if np.ndim(v) else v)
+            out.append((case.reason, value))
+        return out
+
+    def recommendation(self, i: int, symbol: str, name: str) -> Recommendation | None:
+        """i 행 → Recommendation (평가 불가면 None)"""
+        score = float(self.score[i])
+        if np.isnan(score):
+            return None
+        return Recommendation(
+            symbol=symbol,
+            name=name,
+            current_price=float(self.env.columns["close"][i]),
+            score=round(score, 1),
+            reason_codes=self.reason_codes(i),
+            signal=self.ruleset.labels[int(self.signals[i])],
+            category=self.ruleset.name,
+        )
+
+
+def evaluate_rulesets(
+    rulesets: Sequence[RuleSet], columns: Mapping[str, np.ndarray], pos: np.ndarray | None = None
+) -> dict[str, RuleScores]:
+    """여러 전략을 한 번에 평가 (같은 식은 전략끼리 공유해 한 번만 계산)"""
+    defines: dict[str, str] = {}
+    for rs in rulesets:
+        for key, src in rs.define.items():
+            if defines.setdefault(key, src) != src:
+                raise ValueError(f"전략마다 다르게 정의된 파생 값: {key}")
+    env = _Env(columns, defines)
+    out = {}
+    for rs in rulesets:
+        score = np.zeros(env.n)
+        for rule in rs.rules:
+            conds = [env.mask(case.when) for case in rule.cases]
+            if rule.requires:
+                required = env.mask(rule.requires)
+                conds = [required & c for c in conds]
+            # np.select 는 처음 참인 조건을 고름 (if/elif). 평가 함수의 score += 와 같은 순서로 합산
+            score = score + np.select(conds, [case.points for case in rule.cases], default=0.0)
+        if pos is not None:
+            score = np.where(pos >= rs.min_bars - 1, score, np.nan)
+        out[rs.name] = RuleScores(rs, score, env)
+    return out
+
+
+def snapshot_columns(snaps: Sequence[Snapshot]) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """Snapshot 목록 → (지표 배열, pos). None 은 NaN"""
+    columns = {
+        key: np.array(
+            [np.nan if getattr(s, key) is None else float(getattr(s, key)) for s in snaps],
+            dtype=np.float64,
+        )
+        for key in COLUMNS
+    }
+    pos = np.array([s.n_bars - 1 for s in snaps], dtype=np.int64)
+    return columns, pos
+
+
+def rule_evaluator(ruleset: RuleSet) -> Callable[..., Recommendation | None]:
+    """RuleSet → 종목 하나 평가 함수 (evaluate_stock 과 같은 입력)"""
+
+    def evaluate(df, symbol: str, name: str) -> Recommendation | None:
+        snap = _to_snapshot(df)
+        if snap is None:
+            return None
+        columns, pos = snapshot_columns([snap])
+        return ruleset.evaluate(columns, pos).recommendation(0, symbol, name)
+
+    evaluate.__doc__ = f"규칙 전략 '{ruleset.name}' 평가"
+    return evaluate
+
+
+# 배열 평가에 쓸 전략 규칙 (이름 → RuleSet)
+RULESETS: dict[str, RuleSet] = {}
+
+
+def register_rules(ruleset: RuleSet, evaluator: Callable[..., Recommendation | None] | None = None) -> None:
+    """
+    규칙 전략 등록 - 시장 스캔·백테스트의 배열 평가(RULESETS)와 종목별 평가(STRATEGIES) 모두에 사용
+    evaluator: 종목별 평가 함수 (기본: 규칙으로 만든 rule_evaluator)
+    """
+    RULESETS[ruleset.name] = ruleset
+    STRATEGIES[ruleset.name] = evaluator or rule_evaluator(ruleset)
+
+
+# 규칙 임계값 기본값 (parameter sweep 으로 바꿔 볼 수 있는 값)
+TREND_PARAMS = {"rsi_oversold": 30, "rsi_low": 50, "rsi_overbought": 70, "buy": 3.5, "watch": 2.0}
+RISING_PARAMS = {"vol_surge": 2.0, "vol_up": 1.5, "vol_slight": 1.2, "star": 4.0, "watch": 3.0}
+
+
+def _merge_params(defaults: Mapping[str, float], params: Mapping[str, float]) -> dict[str, float]:
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise ValueError(f"알 수 없는 규칙 파라미터: {', '.join(sorted(unknown))}")
+    return {**defaults, **params}
+
+
+def trend_rules(**params: float) -> RuleSet:
+    """추세 규칙 (evaluate_stock 과 같은 규칙, 임계값은 TREND_PARAMS 키로 바꿀 수 있음)"""
+    p = _merge_params(TREND_PARAMS, params)
+    return RuleSet(
+        name="trend",
+        define={"pct_from_ma20": "(close - ma20) / ma20 * 100"},
+        rules=[
+            Rule("단기 추세", [
+                Case("ma5 > ma20", 2.0, Reason.MA5_ABOVE_MA20),
+                Case("True", 0.0, Reason.MA5_BELOW_MA20),
+            ], requires="valid(ma5, ma20)"),
+            Rule("장기 추세", [
+                Case("ma20 > ma60", 1.0, Reason.MA20_ABOVE_MA60),
+            ], requires="valid(ma20, ma60)"),
+            Rule("RSI", [
+                Case(f"rsi < {p['rsi_oversold']}", 1.5, Reason.RSI_OVERSOLD, "rsi"),
+                Case(f"rsi < {p['rsi_low']}", 0.5, Reason.RSI_NEUTRAL_LOW, "rsi"),
+                Case(f"rsi > {p['rsi_overbought']}", -1.0, Reason.RSI_OVERBOUGHT, "rsi"),
+                Case("True", 0.0, Reason.RSI_NEUTRAL, "rsi"),
+            ], requires="valid(rsi)"),
+            Rule("20일선 위치", [
+                Case("-3 < pct_from_ma20 < 5", 0.5, Reason.NEAR_MA20, "pct_from_ma20"),
+                Case("pct_from_ma20 < -5", 0.0, Reason.BELOW_MA20, "pct_from_ma20"),
+            ], requires="valid(ma20)"),
+        ],
+        signals=[(p["buy"], "매수"), (p["watch"], "관망")],
+        default_signal="주의",
+    )
+
+
+def rising_rules(**params: float) -> RuleSet:
+    """샛별 규칙 (evaluate_rising_star 와 같은 규칙, 임계값은 RISING_PARAMS 키로 바꿀 수 있음)"""
+    p = _merge_params(RISING_PARAMS, params)
+    return RuleSet(
+        name="rising_star",
+        define={
+            "vol_ratio": "vol_ma5 / vol_ma20",
+            "pct_to_high": "(high_20d - close) / close * 100",
+            "mom_5d": "(close - close_5d_ago) / close_5d_ago * 100",
+        },
+        rules=[
+            Rule("거래량", [
+                Case(f"vol_ratio >= {p['vol_surge']}", 2.5, Reason.VOLUME_SURGE, "vol_ratio"),
+                Case(f"vol_ratio >= {p['vol_up']}", 1.5, Reason.VOLUME_UP, "vol_ratio"),
+                Case(f"vol_ratio >= {p['vol_slight']}", 0.5, Reason.VOLUME_SLIGHT, "vol_ratio"),
+            ], requires="vol_ma20 > 0 and vol_ma5 > 0"),
+            Rule("20일 고점", [
+                Case("close >= high_20d * 0.998", 2.0, Reason.HIGH_20D_BREAKOUT),
+                Case("pct_to_high < 3", 1.0, Reason.HIGH_20D_NEAR, "pct_to_high"),
+            ]),
+            Rule("5일 모멘텀", [
+                Case("mom_5d >= 10", 1.5, Reason.MOMENTUM_STRONG, "mom_5d"),
+                Case("mom_5d >= 5", 1.0, Reason.MOMENTUM, "mom_5d"),
+                Case("mom_5d >= 0", 0.0, Reason.MOMENTUM_FLAT, "mom_5d"),
+                Case("True", 0.0, Reason.MOMENTUM_DOWN, "mom_5d"),
+            ], requires="close_5d_ago > 0"),
+            Rule("RSI", [
+                Case("40 <= rsi <= 65", 1.0, Reason.RSI_ROOM, "rsi"),
+                Case("rsi < 40", 0.5, Reason.RSI_LOW, "rsi"),
+                Case("rsi > 75", -0.5, Reason.RSI_OVERHEATED, "rsi"),
+            ], requires="valid(rsi)"),
+            Rule("단기 추세", [
+                Case("ma5 > ma20", 0.5, Reason.MA5_ABOVE_MA20_SHORT),
+            ], requires="valid(ma5, ma20)"),
+        ],
+        signals=[(p["star"], "샛별"), (p["watch"], "관망")],
+        default_signal="주의",
+    )
+
+
+# 전략 이름 → 임계값을 받아 RuleSet 을 만드는 함수 / 기본 임계값
+RULE_BUILDERS: dict[str, Callable[..., RuleSet]] = {"trend": trend_rules, "rising_star": rising_rules}
+RULE_PARAMS: dict[str, dict[str, float]] = {"trend": TREND_PARAMS, "rising_star": RISING_PARAMS}
+
+TREND_RULES = trend_rules()
+RISING_RULES = rising_rules()
+
+# 기존 두 전략은 종목별 평가 함수(evaluate_stock/evaluate_rising_star)를 그대로 두고 배열 평가만 규칙으로
+RULESETS[TREND_RULES.name] = TREND_RULES
+RULESETS[RISING_RULES.name] = RISING_RULES
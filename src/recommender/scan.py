@@ -0,0 +1,243 @@
+"""전체 시장 스캔 - 수천 종목을 압축 패널에 모아 메모리 한도 안에서 순위 계산
+
+종목별 시세는 받는 즉시 가격 / 거래량 정수 1차원 배열(CompactPanel)에 이어 붙인다.
+지표·점수는 메모리 한도에 맞춘 종목 묶음 단위로 float64 로 올려 배열 연산으로 계산하고,
+순위 상위 종목만 Snapshot 으로 평가 함수를 다시 불러 사유(reasons)를 채운다.
+가격은 한국만 float32 (정수 원 단위라 2^24 원 미만이면 값이 그대로 보존됨).
+미국 주가(센트 단위 소수)는 float32 로 줄이면 123.45 같은 값이 바뀌어 close > ma20 같은 경계 비교가
+evaluate_stock 과 달라질 수 있어 float64 그대로 둔다.
+"""
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.utils.metrics import stage
+
+from .panel import _column, compute_indicators
+from .ranking import RankFilter
+from .rules import RULESETS, evaluate_rulesets
+from .strategy import STRATEGIES, Recommendation, Snapshot
+
+# 지표·점수 계산 중 봉 하나당 float64 임시 배열 수 (compute_indicators + 점수, 여유 포함)
+_WORK_ARRAYS = 48
+
+# 순위에 넣을 최소 점수 (샛별은 '샛별' 신호만, 그 밖의 전략은 제한 없음)
+_MIN_SCORE = {"rising_star": 4.0}
+_LATEST = ("ma5", "ma20", "ma60", "rsi", "vol_ma20", "vol_ma5", "high_20d", "close_5d_ago")
+
+
+class CompactPanel:
+    """
+    종목별 시세를 이어 붙인 압축 패널 (종목 순서대로 lengths 만큼)
+    append 로 채운 뒤 freeze 하면 close/high(price_dtype), volume(uint32 또는 int64) 배열이 생긴다.
+    price_dtype: 가격 배열 dtype - float32 는 정수 가격(한국 원)일 때만 값이 그대로 보존됨
+    memory_bytes 를 넘게 되는 종목은 받지 않는다 (append 가 False).
+    """
+
+    # 스캔 메모리 한도 중 패널에 쓸 비율 (나머지는 지표 묶음 계산용)
+    PANEL_SHARE = 0.5
+
+    def __init__(self, memory_bytes: int | None = None, price_dtype: type = np.float64):
+        self.memory_bytes = memory_bytes
+        self.price_dtype = np.dtype(price_dtype)
+        # 봉 하나당 바이트 (종가 + 고가, freeze 전 거래량은 int64)
+        self.bar_bytes = 2 * self.price_dtype.itemsize + 8
+        self.symbols: list[str] = []
+        self.names: list[str] = []
+        self.nbytes = 0
+        self._parts: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self.lengths = np.zeros(0, dtype=np.int64)
+        self.close = np.empty(0, dtype=self.price_dtype)
+        self.high = np.empty(0, dtype=self.price_dtype)
+        self.volume = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def append(
+        self, symbol: str, name: str, close: np.ndarray, high: np.ndarray, volume: np.ndarray
+    ) -> bool:
+        """종목 하나 추가 (거래량 NaN 은 0). 메모리 한도 초과 시 추가하지 않고 False"""
+        size = len(close) * self.bar_bytes
+        if self.memory_bytes is not None and self.nbytes + size > self.memory_bytes:
+            return False
+        self.symbols.append(symbol)
+        self.names.append(name)
+        self._parts.append((
+            np.asarray(close, dtype=self.price_dtype),
+            np.asarray(high, dtype=self.price_dtype),
+            np.nan_to_num(np.asarray(volume, dtype=np.float64), nan=0.0).astype(np.int64),
+        ))
+        self.nbytes += size
+        return True
+
+    def append_frame(self, symbol: str, name: str, df: pd.DataFrame | None) -> bool:
+        """시세 DataFrame 으로 추가 (시세 없으면 길이 0 종목)"""
+        close = _column(df, "close") if df is not None and not df.empty else None
+        if close is None:
+            close = np.empty(0)
+        n = len(close)
+        high = _column(df, "high") if n else None
+        vol = _column(df, "volume") if n else None
+        return self.append(
+            symbol,
+            name,
+            close,
+            high if high is not None else np.full(n, np.nan),
+            vol if vol is not None else np.full(n, np.nan),
+        )
+
+    def freeze(self) -> "CompactPanel":
+        """이어 붙인 배열 생성 (거래량은 uint32 범위면 uint32 로 줄임)"""
+        parts, self._parts = self._parts, []
+        self.lengths = np.array([len(p[0]) for p in parts], dtype=np.int64)
+        if parts:
+            self.close = np.concatenate([p[0] for p in parts])
+            self.high = np.concatenate([p[1] for p in parts])
+            volume = np.concatenate([p[2] for p in parts])
+        else:
+            volume = np.empty(0, dtype=np.int64)
+        if len(volume) == 0 or (volume.min() >= 0 and volume.max() <= np.iinfo(np.uint32).max):
+            volume = volume.astype(np.uint32)
+        self.volume = volume
+        self.nbytes = self.close.nbytes + self.high.nbytes + self.volume.nbytes
+        return self
+
+
+@dataclass
+class ScanResult:
+    """전체 시장 스캔 결과"""
+    trend: list[Recommendation] = field(default_factory=list)
+    rising: list[Recommendation] = field(default_factory=list)
+    total: int = 0  # 대상 종목 수
+    scanned: int = 0  # 평가한 종목 수 (20봉 이상)
+    from_archive: int = 0  # 조회 없이 아카이브의 최근 시세로 평가한 종목 수
+    from_store: int = 0  # 제한 시간 후 저장된 시세로 평가한 종목 수
+    dropped: int = 0  # 메모리 한도로 제외한 종목 수
+    elapsed: float = 0.0
+    nbytes: int = 0  # 패널 크기 (바이트)
+
+    def to_dict(self) -> dict:
+        """응답용 요약 (추천 목록 제외)"""
+        return {
+            "total": self.total,
+            "scanned": self.scanned,
+            "from_archive": self.from_archive,
+            "from_store": self.from_store,
+            "dropped": self.dropped,
+            "elapsed": round(self.elapsed, 2),
+            "panel_mb": round(self.nbytes / 2**20, 2),
+        }
+
+
+def _chunks(lengths: np.ndarray, max_bars: int) -> list[tuple[int, int]]:
+    """종목 구간 [lo, hi) 목록 - 묶음당 봉 수가 max_bars 이하 (한 종목이 더 길면 단독)"""
+    out = []
+    lo, bars = 0, 0
+    for i, n in enumerate(lengths):
+        if i > lo and bars + n > max_bars:
+            out.append((lo, i))
+            lo, bars = i, 0
+        bars += int(n)
+    if lo < len(lengths):
+        out.append((lo, len(lengths)))
+    return out
+
+
+def _candidates(name: str, score: np.ndarray, where: RankFilter | None) -> np.ndarray:
+    """순위 후보 종목 번호 (전략 기본 최소 점수 + 조건)"""
+    with np.errstate(invalid="ignore"):
+        mask = score >= _MIN_SCORE.get(name, -np.inf)
+        if where is not None:
+            # 점수는 0.5 단위 합이라 반올림(Recommendation.score) 전후 비교 결과가 같다
+            if where.min_score is not None:
+                mask &= score >= where.min_score
+            if where.categories is not None and name not in where.categories:
+                mask[:] = False
+            if where.signals is not None:
+                rules = RULESETS[name]
+                allowed = [code for code, label in enumerate(rules.labels) if label in where.signals]
+                mask &= np.isin(rules.signal_codes(score), allowed)
+    return np.flatnonzero(mask)
+
+
+def _top(candidates: np.ndarray, score: np.ndarray, top_n: int) -> np.ndarray:
+    """점수 내림차순 상위 top_n (같은 점수는 패널 순서). 후보가 많으면 경계 점수 이상만 정렬"""
+    if len(candidates) > top_n > 0:
+        bound = -np.partition(-score[candidates], top_n - 1)[top_n - 1]
+        candidates = candidates[score[candidates] >= bound]
+    return candidates[np.argsort(-score[candidates], kind="stable")][:top_n]
+
+
+def rank_panel(
+    panel: CompactPanel,
+    strategies: Sequence[str] = ("trend", "rising_star"),
+    top_n: int = 30,
+    memory_bytes: int | None = None,
+    where: RankFilter | None = None,
+) -> tuple[dict[str, list[Recommendation]], int]:
+    """
+    패널 전체 종목을 전략별 점수로 정렬해 상위 top_n 개 Recommendation 생성
+    - memory_bytes: 지표 계산 메모리 한도 (패널 크기 제외). 이 안에 들어가도록 종목을 나눠 계산
+    - 샛별은 '샛별' 신호(4.0점 이상)만
+    - where: 신호·최소 점수·전략 조건 (점수 배열에 바로 적용, 통과한 종목만 순위)
+    Returns: ({전략 이름: 점수순 추천 목록}, 평가한 종목 수)
+    """
+    n = len(panel)
+    offsets = np.concatenate([[0], np.cumsum(panel.lengths)]).astype(np.int64)
+    scores = {name: np.full(n, np.nan) for name in strategies}
+    latest = {key: np.full(n, np.nan) for key in ("close",) + _LATEST}
+
+    max_bars = (
+        max(1, memory_bytes // (_WORK_ARRAYS * 8)) if memory_bytes is not None else len(panel.close)
+    )
+    for lo, hi in _chunks(panel.lengths, max_bars):
+        s, e = offsets[lo], offsets[hi]
+        lengths = panel.lengths[lo:hi]
+        if e == s:
+            continue
+        close = panel.close[s:e].astype(np.float64)
+        with stage("indicators"):
+            ind = compute_indicators(
+                close, panel.high[s:e].astype(np.float64), panel.volume[s:e].astype(np.float64), lengths
+            )
+        has = lengths > 0
+        rows = np.arange(lo, hi)[has]
+        last = (offsets[lo + 1:hi + 1] - s - 1)[has]
+        with stage("scoring"):
+            # 전략 전체를 한 번에 (같은 조건식은 한 번만 계산)
+            results = evaluate_rulesets(
+                [RULESETS[name] for name in strategies], {**ind, "close": close}, ind["pos"]
+            )
+            for name in strategies:
+                scores[name][rows] = results[name].score[last]
+        latest["close"][rows] = close[last]
+        for key in _LATEST:
+            latest[key][rows] = ind[key][last]
+
+    def snapshot(i: int) -> Snapshot:
+        n_bars = int(panel.lengths[i])
+        return Snapshot(
+            n_bars=n_bars,
+            close=float(latest["close"][i]),
+            ma5=latest["ma5"][i],
+            ma20=latest["ma20"][i],
+            ma60=latest["ma60"][i],
+            rsi=latest["rsi"][i],
+            vol_ma20=latest["vol_ma20"][i],
+            vol_ma5=latest["vol_ma5"][i],
+            high_20d=latest["high_20d"][i],
+            close_5d_ago=float(latest["close_5d_ago"][i]) if n_bars >= 6 else None,
+        )
+
+    ranked: dict[str, list[Recommendation]] = {}
+    with stage("ranking"):
+        for name in strategies:
+            score = scores[name]
+            order = _top(_candidates(name, score, where), score, top_n)
+            recs = [STRATEGIES[name](snapshot(i), panel.symbols[i], panel.names[i]) for i in order]
+            ranked[name] = [r for r in recs if r]
+    scanned = int((panel.lengths >= 20).sum())
+    return ranked, scanned
@@ -1,24 +1,125 @@
 """추천 로직 - 기술적 지표 기반 스크리닝"""
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
+from enum import IntEnum
 from typing import TYPE_CHECKING
 
 import pandas as pd
 
 if TYPE_CHECKING:
-    pass
-
-
-@dataclass
+    from src.data.archive import PriceWindow
+
+    from .streaming import IndicatorState
+
+
+class Reason(IntEnum):
+    """추천 사유 코드 (문구는 REASON_TEXT, 값은 RSI·거래량 배율 등 문구에 들어갈 수치)"""
+    MA5_ABOVE_MA20 = 1
+    MA5_BELOW_MA20 = 2
+    MA20_ABOVE_MA60 = 3
+    RSI_OVERSOLD = 4
+    RSI_NEUTRAL_LOW = 5
+    RSI_OVERBOUGHT = 6
+    RSI_NEUTRAL = 7
+    NEAR_MA20 = 8
+    BELOW_MA20 = 9
+    VOLUME_SURGE = 10
+    VOLUME_UP = 11
+    VOLUME_SLIGHT = 12
+    HIGH_20D_BREAKOUT = 13
+    HIGH_20D_NEAR = 14
+    MOMENTUM_STRONG = 15
+    MOMENTUM = 16
+    MOMENTUM_FLAT = 17
+    MOMENTUM_DOWN = 18
+    RSI_ROOM = 19
+    RSI_LOW = 20
+    RSI_OVERHEATED = 21
+    MA5_ABOVE_MA20_SHORT = 22
+
+
+REASON_TEXT: dict[int, str] = {
+    Reason.MA5_ABOVE_MA20: "5일선 > 20일선 (단기 상승 추세)",
+    Reason.MA5_BELOW_MA20: "5일선 < 20일선 (단기 횡보/하락)",
+    Reason.MA20_ABOVE_MA60: "20일선 > 60일선 (장기 상승 추세)",
+    Reason.RSI_OVERSOLD: "RSI {:.0f} (과매도 구간, 반등 가능)",
+    Reason.RSI_NEUTRAL_LOW: "RSI {:.0f} (중립偏低)",
+    Reason.RSI_OVERBOUGHT: "RSI {:.0f} (과매수 구간, 조정 주의)",
+    Reason.RSI_NEUTRAL: "RSI {:.0f} (중립)",
+    Reason.NEAR_MA20: "20일선 대비 {:+.1f}% (적정 구간)",
+    Reason.BELOW_MA20: "20일선 대비 {:+.1f}% (저평가 구간)",
+    Reason.VOLUME_SURGE: "거래량 급증 (5일평균/20일평균 {:.1f}배)",
+    Reason.VOLUME_UP: "거래량 증가 (5일평균/20일평균 {:.1f}배)",
+    Reason.VOLUME_SLIGHT: "거래량 소폭 증가 ({:.1f}배)",
+    Reason.HIGH_20D_BREAKOUT: "20일 고점 돌파 (신고가)",
+    Reason.HIGH_20D_NEAR: "20일 고점 근접 (약 {:.1f}% 남음)",
+    Reason.MOMENTUM_STRONG: "5일 상승률 +{:.1f}% (강한 모멘텀)",
+    Reason.MOMENTUM: "5일 상승률 +{:.1f}%",
+    Reason.MOMENTUM_FLAT: "5일 상승률 +{:.1f}%",
+    Reason.MOMENTUM_DOWN: "5일 상승률 {:.1f}% (보합)",
+    Reason.RSI_ROOM: "RSI {:.0f} (성장 여력 구간)",
+    Reason.RSI_LOW: "RSI {:.0f} (저평가, 반등 가능)",
+    Reason.RSI_OVERHEATED: "RSI {:.0f} (과매수, 조정 리스크)",
+    Reason.MA5_ABOVE_MA20_SHORT: "5일선 > 20일선 (단기 상승)",
+}
+
+
+def render_reason(code: int, value: float = 0.0) -> str:
+    """사유 코드 → 표시 문구"""
+    return REASON_TEXT[code].format(value)
+
+
+@dataclass(slots=True)
 class Recommendation:
-    """추천 결과"""
+    """
+    추천 결과
+    사유는 (코드, 값) 쌍으로만 담고 문구는 표시할 때 만든다 (render_reasons).
+    대량 스캔에서도 종목당 문자열을 만들지 않고, to_row/from_row 로 가볍게 저장·복원
+    """
     symbol: str
     name: str
     current_price: float
     score: float
-    reasons: list[str]
+    reason_codes: list[tuple[int, float]]
     signal: str  # "매수", "관망", "주의", "샛별"
     category: str = "trend"  # "trend" | "rising_star"
 
+    @property
+    def reasons(self) -> list[str]:
+        """전체 사유 문구"""
+        return self.render_reasons()
+
+    def render_reasons(self, limit: int | None = None) -> list[str]:
+        """앞에서부터 limit 개 사유 문구 (None 이면 전부)"""
+        return [render_reason(code, value) for code, value in self.reason_codes[:limit]]
+
+    def to_row(self) -> tuple:
+        """JSON/pickle 용 튜플 (사유는 코드·값 그대로)"""
+        return (
+            self.symbol, self.name, self.current_price, self.score,
+            [list(rc) for rc in self.reason_codes], self.signal, self.category,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Recommendation":
+        symbol, name, price, score, codes, signal, category = row
+        return cls(symbol, name, price, score, [(int(c), float(v)) for c, v in codes], signal, category)
+
+
+@dataclass
+class Snapshot:
+    """최신 봉 기준 지표 값 (평가 함수 입력)"""
+    n_bars: int
+    close: float
+    ma5: float | None = None
+    ma20: float | None = None
+    ma60: float | None = None
+    rsi: float | None = None
+    vol_ma20: float | None = None
+    vol_ma5: float = 0
+    high_20d: float | None = None
+    close_5d_ago: float | None = None
+
 
 def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """이동평균선, RSI 등 기술적 지표 추가"""
@@ -60,69 +161,104 @@ def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def latest_snapshot(df: pd.DataFrame) -> Snapshot:
+    """지표가 추가된 시세에서 최신 봉 기준 값 추출"""
+    close_col = "Close" if "Close" in df.columns else "close"
+    high_col = "High" if "High" in df.columns else "high"
+    vol_col = "Volume" if "Volume" in df.columns else "volume"
+    latest = df.iloc[-1]
+    return Snapshot(
+        n_bars=len(df),
+        close=float(latest[close_col]),
+        ma5=latest.get("ma5"),
+        ma20=latest.get("ma20"),
+        ma60=latest.get("ma60"),
+        rsi=latest.get("rsi"),
+        vol_ma20=latest.get("vol_ma20"),
+        vol_ma5=df[vol_col].tail(5).mean() if vol_col in df.columns else 0,
+        high_20d=df[high_col].tail(20).max(),
+        close_5d_ago=float(df.iloc[-6][close_col]) if len(df) >= 6 else None,
+    )
+
+
+def _to_snapshot(
+    df: "pd.DataFrame | Snapshot | IndicatorState | PriceWindow | None",
+) -> Snapshot | None:
+    """평가 입력(시세, Snapshot, 증분 상태, 가격 배열 창)을 Snapshot 으로 변환 (20봉 미만은 None)"""
+    if df is not None and not isinstance(df, (pd.DataFrame, Snapshot)):
+        if hasattr(df, "snapshot"):
+            df = df.snapshot()
+        else:
+            # close/high/volume 배열을 가진 창 (아카이브 view 그대로 계산)
+            from .panel import snapshot_from_arrays
+
+            df = snapshot_from_arrays(df.close, df.high, df.volume)
+    if isinstance(df, Snapshot):
+        return df if df.n_bars >= 20 else None
+    if df is None or df.empty or len(df) < 20:
+        return None
+    return latest_snapshot(add_technical_indicators(df))
+
+
 def evaluate_stock(
-    df: pd.DataFrame | None, symbol: str, name: str
+    df: "pd.DataFrame | Snapshot | IndicatorState | PriceWindow | None", symbol: str, name: str
 ) -> Recommendation | None:
     """
     개별 종목 평가
     - 골든크로스(5일선 > 20일선) 가산
     - RSI 과매도(30 미만) 구간 매수 유리
     - RSI 과매수(70 초과) 주의
+    df: 시세, 미리 계산된 Snapshot (패널 등), IndicatorState 또는 PriceArchive.window
     """
-    if df is None or df.empty or len(df) < 20:
+    snap = _to_snapshot(df)
+    if snap is None:
         return None
 
-    df = add_technical_indicators(df)
-
-    close_col = "Close" if "Close" in df.columns else "close"
-    latest = df.iloc[-1]
-    prev = df.iloc[-2] if len(df) >= 2 else latest
-
-    current_price = float(latest[close_col])
+    current_price = snap.close
     score = 0.0
-    reasons = []
+    reasons: list[tuple[int, float]] = []  # (사유 코드, 값) - 문구는 표시할 때 생성
 
     # 1. 골든크로스 (5일선 > 20일선)
-    ma5 = latest.get("ma5")
-    ma20 = latest.get("ma20")
+    ma5 = snap.ma5
+    ma20 = snap.ma20
     if ma5 is not None and ma20 is not None and not (pd.isna(ma5) or pd.isna(ma20)):
         if ma5 > ma20:
             score += 2.0
-            reasons.append("5일선 > 20일선 (단기 상승 추세)")
+            reasons.append((Reason.MA5_ABOVE_MA20, 0.0))
         else:
-            reasons.append("5일선 < 20일선 (단기 횡보/하락)")
+            reasons.append((Reason.MA5_BELOW_MA20, 0.0))
 
     # 2. 장기 추세 (20일선 > 60일선)
-    ma60 = latest.get("ma60")
+    ma60 = snap.ma60
     if ma20 is not None and ma60 is not None and not (pd.isna(ma20) or pd.isna(ma60)):
         if ma20 > ma60:
             score += 1.0
-            reasons.append("20일선 > 60일선 (장기 상승 추세)")
+            reasons.append((Reason.MA20_ABOVE_MA60, 0.0))
 
     # 3. RSI
-    rsi = latest.get("rsi")
+    rsi = snap.rsi
     if rsi is not None and not pd.isna(rsi):
         rsi = float(rsi)
         if rsi < 30:
             score += 1.5
-            reasons.append(f"RSI {rsi:.0f} (과매도 구간, 반등 가능)")
+            reasons.append((Reason.RSI_OVERSOLD, rsi))
         elif rsi < 50:
             score += 0.5
-            reasons.append(f"RSI {rsi:.0f} (중립偏低)")
+            reasons.append((Reason.RSI_NEUTRAL_LOW, rsi))
         elif rsi > 70:
             score -= 1.0
-            reasons.append(f"RSI {rsi:.0f} (과매수 구간, 조정 주의)")
+            reasons.append((Reason.RSI_OVERBOUGHT, rsi))
         else:
-            reasons.append(f"RSI {rsi:.0f} (중립)")
+            reasons.append((Reason.RSI_NEUTRAL, rsi))
 
     # 4. 가격 위치 (현재가 vs 20일선)
     if ma20 is not None and not pd.isna(ma20):
         pct_from_ma20 = (current_price - ma20) / ma20 * 100
         if -3 < pct_from_ma20 < 5:
             score += 0.5
-            reasons.append(f"20일선 대비 {pct_from_ma20:+.1f}% (적정 구간)")
+            reasons.append((Reason.NEAR_MA20, pct_from_ma20))
         elif pct_from_ma20 < -5:
-            reasons.append(f"20일선 대비 {pct_from_ma20:+.1f}% (저평가 구간)")
+            reasons.append((Reason.BELOW_MA20, pct_from_ma20))
 
     # 신호 판정
     if score >= 3.5:
@@ -137,14 +273,14 @@ def evaluate_stock(
         name=name,
         current_price=current_price,
         score=round(score, 1),
-        reasons=reasons,
+        reason_codes=reasons,
         signal=signal,
         category="trend",
     )
 
 
 def evaluate_rising_star(
-    df: pd.DataFrame | None, symbol: str, name: str
+    df: "pd.DataFrame | Snapshot | IndicatorState | PriceWindow | None", symbol: str, name: str
 ) -> Recommendation | None:
     """
     떠오르는 샛별형 종목 평가
@@ -152,83 +288,79 @@ def evaluate_rising_star(
     - 20일 고점 돌파
     - 단기 모멘텀 (5일/10일 상승률)
     - RSI 과매수 아님 (성장 여력)
+    df: 시세, 미리 계산된 Snapshot (패널 등), IndicatorState 또는 PriceArchive.window
     """
-    if df is None or df.empty or len(df) < 20:
+    snap = _to_snapshot(df)
+    if snap is None:
         return None
 
-    df = add_technical_indicators(df)
-    close_col = "Close" if "Close" in df.columns else "close"
-    vol_col = "Volume" if "Volume" in df.columns else "volume"
-
-    latest = df.iloc[-1]
-    current_price = float(latest[close_col])
+    current_price = snap.close
     score = 0.0
-    reasons = []
+    reasons: list[tuple[int, float]] = []  # (사유 코드, 값) - 문구는 표시할 때 생성
 
     # 1. 거래량 급증 (최근 5일 평균 vs 20일 평균)
-    vol_ma5 = df[vol_col].tail(5).mean() if vol_col in df.columns else 0
-    vol_ma20 = latest.get("vol_ma20")
+    vol_ma5 = snap.vol_ma5
+    vol_ma20 = snap.vol_ma20
     if vol_ma20 and vol_ma20 > 0 and vol_ma5 > 0:
         vol_ratio = vol_ma5 / vol_ma20
         if vol_ratio >= 2.0:
             score += 2.5
-            reasons.append(f"거래량 급증 (5일평균/20일평균 {vol_ratio:.1f}배)")
+            reasons.append((Reason.VOLUME_SURGE, vol_ratio))
         elif vol_ratio >= 1.5:
             score += 1.5
-            reasons.append(f"거래량 증가 (5일평균/20일평균 {vol_ratio:.1f}배)")
+            reasons.append((Reason.VOLUME_UP, vol_ratio))
         elif vol_ratio >= 1.2:
             score += 0.5
-            reasons.append(f"거래량 소폭 증가 ({vol_ratio:.1f}배)")
+            reasons.append((Reason.VOLUME_SLIGHT, vol_ratio))
 
     # 2. 20일 고점 돌파
-    high_col = "High" if "High" in df.columns else "high"
-    high_20d = df[high_col].tail(20).max()
+    high_20d = snap.high_20d
     if current_price >= high_20d * 0.998:
         score += 2.0
-        reasons.append("20일 고점 돌파 (신고가)")
+        reasons.append((Reason.HIGH_20D_BREAKOUT, 0.0))
     else:
         pct_to_high = (high_20d - current_price) / current_price * 100
         if pct_to_high < 3:
             score += 1.0
-            reasons.append(f"20일 고점 근접 (약 {pct_to_high:.1f}% 남음)")
+            reasons.append((Reason.HIGH_20D_NEAR, pct_to_high))
 
     # 3. 단기 모멘텀 (5일 상승률)
-    if len(df) >= 6:
-        close_5d_ago = float(df.iloc[-6][close_col])
+    if snap.close_5d_ago is not None:
+        close_5d_ago = snap.close_5d_ago
         if close_5d_ago > 0:
             mom_5d = (current_price - close_5d_ago) / close_5d_ago * 100
             if mom_5d >= 10:
                 score += 1.5
-                reasons.append(f"5일 상승률 +{mom_5d:.1f}% (강한 모멘텀)")
+                reasons.append((Reason.MOMENTUM_STRONG, mom_5d))
             elif mom_5d >= 5:
                 score += 1.0
-                reasons.append(f"5일 상승률 +{mom_5d:.1f}%")
+                reasons.append((Reason.MOMENTUM, mom_5d))
             elif mom_5d >= 0:
-                reasons.append(f"5일 상승률 +{mom_5d:.1f}%")
+                reasons.append((Reason.MOMENTUM_FLAT, mom_5d))
             else:
-                reasons.append(f"5일 상승률 {mom_5d:.1f}% (보합)")
+                reasons.append((Reason.MOMENTUM_DOWN, mom_5d))
 
     # 4. RSI (과매수 아닐 때 가산)
-    rsi = latest.get("rsi")
+    rsi = snap.rsi
     if rsi is not None and not pd.isna(rsi):
         rsi = float(rsi)
         if 40 <= rsi <= 65:
             score += 1.0
-            reasons.append(f"RSI {rsi:.0f} (성장 여력 구간)")
+            reasons.append((Reason.RSI_ROOM, rsi))
         elif rsi < 40:
             score += 0.5
-            reasons.append(f"RSI {rsi:.0f} (저평가, 반등 가능)")
+            reasons.append((Reason.RSI_LOW, rsi))
         elif rsi > 75:
             score -= 0.5
-            reasons.append(f"RSI {rsi:.0f} (과매수, 조정 리스크)")
+            reasons.append((Reason.RSI_OVERHEATED, rsi))
 
     # 5. 5일선 > 20일선 (상승 추세)
-    ma5 = latest.get("ma5")
-    ma20 = latest.get("ma20")
+    ma5 = snap.ma5
+    ma20 = snap.ma20
     if ma5 is not None and ma20 is not None and not (pd.isna(ma5) or pd.isna(ma20)):
         if ma5 > ma20:
             score += 0.5
-            reasons.append("5일선 > 20일선 (단기 상승)")
+            reasons.append((Reason.MA5_ABOVE_MA20_SHORT, 0.0))
 
     # 신호: 점수 4.0 이상만 샛별 추천
     if score >= 5.0:
@@ -245,7 +377,39 @@ def evaluate_rising_star(
         name=name,
         current_price=current_price,
         score=round(score, 1),
-        reasons=reasons,
+        reason_codes=reasons,
         signal=signal,
         category="rising_star",
     )
+
+
+# 등록된 전략 (이름 → 평가 함수). 평가 함수는 Snapshot 을 받아 Recommendation 반환
+Evaluator = Callable[[Snapshot, str, str], "Recommendation | None"]
+STRATEGIES: dict[str, Evaluator] = {
+    "trend": evaluate_stock,
+    "rising_star": evaluate_rising_star,
+}
+
+
+def register_strategy(key: str, evaluator: Evaluator) -> None:
+    """전략 등록 (evaluate_all 에서 이름으로 사용)"""
+    STRATEGIES[key] = evaluator
+
+
+def evaluate_all(
+    df: "pd.DataFrame | Snapshot | IndicatorState | PriceWindow | None",
+    symbol: str,
+    name: str,
+    strategies: Iterable[str] | None = None,
+) -> dict[str, Recommendation | None]:
+    """
+    여러 전략을 한 번에 평가
+    - 컬럼 정규화·지표 계산은 한 번만 하고 모든 전략이 같은 Snapshot 을 공유
+    - strategies: 전략 이름 목록 (기본: 등록된 전체)
+    Returns: {전략 이름: Recommendation 또는 None}
+    """
+    keys = list(strategies) if strategies is not None else list(STRATEGIES)
+    snap = _to_snapshot(df)
+    if snap is None:
+        return {key: None for key in keys}
+    return {key: STRATEGIES[key](snap, symbol, name) for key in keys}
@@ -0,0 +1,226 @@
+"""증분 지표 상태 - 새 봉 하나 추가 시 상수 시간 갱신
+
+120일 전체를 다시 계산하지 않고 이동평균 합계, RSI 상승/하락폭 합계, 거래량 평균,
+20일 고점(단조 덱)만 갱신한다. 상태는 dict/JSON 으로 저장해 재시작 후 이어 쓸 수 있다.
+완성된 일봉만 추가해야 한다 (장중 미완성 봉은 copy() 후 append 로 미리보기).
+"""
+import json
+import math
+from collections import deque
+from pathlib import Path
+
+import pandas as pd
+
+from .strategy import Snapshot
+
+try:
+    import ta  # noqa: F401  (add_technical_indicators 와 동일하게 설치 여부로 RSI 계산 결정)
+
+    _HAS_TA = True
+except ImportError:
+    _HAS_TA = False
+
+# 누적 합계 부동소수 오차가 쌓이지 않도록 창 크기만큼 추가될 때마다 다시 합산
+_RESYNC_EVERY = 64
+
+
+class _Window:
+    """고정 길이 롤링 합계 (NaN 개수 추적, 주기적 재합산)"""
+
+    def __init__(self, size: int, values: list[float] | None = None):
+        self.size = size
+        self.values: deque[float] = deque(values or [], maxlen=size)
+        self._resync()
+
+    def _resync(self) -> None:
+        valid = [v for v in self.values if not math.isnan(v)]
+        self.total = math.fsum(valid)
+        self.n_nan = len(self.values) - len(valid)
+        self.n_nonzero = sum(1 for v in valid if v != 0)
+        self._since_resync = 0
+
+    def push(self, x: float) -> None:
+        if len(self.values) == self.size:
+            old = self.values[0]
+            if math.isnan(old):
+                self.n_nan -= 1
+            else:
+                self.total -= old
+                self.n_nonzero -= old != 0
+        self.values.append(x)
+        if math.isnan(x):
+            self.n_nan += 1
+        else:
+            self.total += x
+            self.n_nonzero += x != 0
+        if self.n_nonzero == 0:
+            self.total = 0.0
+        self._since_resync += 1
+        if self._since_resync >= _RESYNC_EVERY:
+            self._resync()
+
+    def full_mean(self) -> float:
+        """창이 NaN 없이 가득 찼을 때만 평균 (rolling(size).mean() 과 같은 규칙)"""
+        if len(self.values) < self.size or self.n_nan:
+            return math.nan
+        return self.total / self.size
+
+    def valid_mean(self) -> float:
+        """NaN 제외 평균 (Series.tail(size).mean() 과 같은 규칙)"""
+        n = len(self.values) - self.n_nan
+        return self.total / n if n else math.nan
+
+
+class IndicatorState:
+    """종목별 증분 지표 상태"""
+
+    def __init__(self):
+        self.n_bars = 0
+        self.last_date: str | None = None
+        self.prev_close = math.nan
+        self.closes: deque[float] = deque(maxlen=6)
+        self.ma5 = _Window(5)
+        self.ma20 = _Window(20)
+        self.ma60 = _Window(60)
+        self.gain = _Window(14)
+        self.loss = _Window(14)
+        self.vol20 = _Window(20)
+        self.vol5 = _Window(5)
+        # 20일 고점 단조 감소 덱 [(봉 번호, 고가), ...]
+        self.highs: deque[tuple[int, float]] = deque()
+
+    def append(
+        self, close: float, high: float, volume: float, date: str | None = None
+    ) -> None:
+        """완성된 봉 하나 추가 (O(1))"""
+        close, high, volume = float(close), float(high), float(volume)
+        delta = close - self.prev_close
+        self.gain.push(delta if delta > 0 else 0.0)
+        self.loss.push(-delta if delta < 0 else 0.0)
+        self.prev_close = close
+
+        self.closes.append(close)
+        self.ma5.push(close)
+        self.ma20.push(close)
+        self.ma60.push(close)
+        self.vol20.push(volume)
+        self.vol5.push(volume)
+
+        idx = self.n_bars
+        if not math.isnan(high):
+            while self.highs and self.highs[-1][1] <= high:
+                self.highs.pop()
+            self.highs.append((idx, high))
+        while self.highs and self.highs[0][0] <= idx - 20:
+            self.highs.popleft()
+
+        self.n_bars += 1
+        if date is not None:
+            self.last_date = date
+
+    def update(self, df: pd.DataFrame) -> int:
+        """시세에서 last_date 이후 봉만 추가. Returns: 추가된 봉 수"""
+        if df is None or df.empty:
+            return 0
+        cols = {c.lower(): c for c in df.columns}
+        new = df
+        if self.last_date is not None:
+            new = df[df.index > pd.Timestamp(self.last_date)]
+        close = new[cols["close"]].to_numpy(dtype=float)
+        high = new[cols["high"]].to_numpy(dtype=float) if "high" in cols else [math.nan] * len(new)
+        vol = new[cols["volume"]].to_numpy(dtype=float) if "volume" in cols else [math.nan] * len(new)
+        dates = [d.strftime("%Y-%m-%d") for d in new.index]
+        for c, h, v, d in zip(close, high, vol, dates):
+            self.append(c, h, v, d)
+        return len(new)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IndicatorState":
+        """시세 전체로 상태 생성"""
+        state = cls()
+        state.update(df)
+        return state
+
+    def copy(self) -> "IndicatorState":
+        """상태 복사 (창 크기 고정이라 상수 시간)"""
+        return IndicatorState.from_dict(self.to_dict())
+
+    def snapshot(self) -> Snapshot:
+        """최신 봉 기준 지표 (evaluate_stock/evaluate_rising_star 입력)"""
+        if self.n_bars == 0:
+            return Snapshot(n_bars=0, close=math.nan)
+        if _HAS_TA:
+            if len(self.gain.values) < 14:
+                rsi = math.nan
+            else:
+                avg_gain = self.gain.total / 14
+                avg_loss = self.loss.total / 14
+                rs = avg_gain / (avg_loss if avg_loss != 0 else 1e-10)
+                rsi = 100 - (100 / (1 + rs))
+        else:
+            rsi = 50
+        return Snapshot(
+            n_bars=self.n_bars,
+            close=self.closes[-1],
+            ma5=self.ma5.full_mean(),
+            ma20=self.ma20.full_mean(),
+            ma60=self.ma60.full_mean(),
+            rsi=rsi,
+            vol_ma20=self.vol20.full_mean(),
+            vol_ma5=self.vol5.valid_mean(),
+            high_20d=self.highs[0][1] if self.highs else math.nan,
+            close_5d_ago=self.closes[0] if self.n_bars >= 6 else None,
+        )
+
+    def to_dict(self) -> dict:
+        """직렬화 (JSON 저장용)"""
+        return {
+            "n_bars": self.n_bars,
+            "last_date": self.last_date,
+            "prev_close": self.prev_close,
+            "closes": list(self.closes),
+            "ma5": list(self.ma5.values),
+            "ma20": list(self.ma20.values),
+            "ma60": list(self.ma60.values),
+            "gain": list(self.gain.values),
+            "loss": list(self.loss.values),
+            "vol20": list(self.vol20.values),
+            "vol5": list(self.vol5.values),
+            "highs": [list(h) for h in self.highs],
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "IndicatorState":
+        """to_dict() 결과로 복원"""
+        state = cls()
+        state.n_bars = d["n_bars"]
+        state.last_date = d["last_date"]
+        state.prev_close = d["prev_close"]
+        state.closes = deque(d["closes"], maxlen=6)
+        state.ma5 = _Window(5, d["ma5"])
+        state.ma20 = _Window(20, d["ma20"])
+        state.ma60 = _Window(60, d["ma60"])
+        state.gain = _Window(14, d["gain"])
+        state.loss = _Window(14, d["loss"])
+        state.vol20 = _Window(20, d["vol20"])
+        state.vol5 = _Window(5, d["vol5"])
+        state.highs = deque((int(i), float(h)) for i, h in d["highs"])
+        return state
+
+
+def save_states(path: str | Path, states: dict[str, IndicatorState]) -> None:
+    """종목별 상태 저장 (JSON)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({s: st.to_dict() for s, st in states.items()}), encoding="utf-8")
+    tmp.replace(path)
+
+
+def load_states(path: str | Path) -> dict[str, IndicatorState]:
+    """save_states() 로 저장한 상태 불러오기 (파일 없으면 빈 dict)"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {s: IndicatorState.from_dict(d) for s, d in data.items()}
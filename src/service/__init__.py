@@ -0,0 +1,20 @@
+"""웹 서비스 공통 - 결과 캐시, 백그라운드 갱신"""
+from .backends import MemoryBackend, SQLiteBackend
+from .cache import ResultCache, cache_key
+from .encoding import EncodedResult
+from .scheduler import RefreshScheduler
+from .signals import SignalHistory, diff_signals, payload_signals
+from .snapshot import SnapshotStore
+
+__all__ = [
+    "ResultCache",
+    "MemoryBackend",
+    "SQLiteBackend",
+    "RefreshScheduler",
+    "SnapshotStore",
+    "SignalHistory",
+    "diff_signals",
+    "payload_signals",
+    "EncodedResult",
+    "cache_key",
+]
@@ -0,0 +1,119 @@
+"""결과 캐시 저장소 - 프로세스 메모리 / SQLite (gunicorn 워커 간 공유)
+
+두 저장소 모두 같은 인터페이스를 가진다.
+- get(key) -> (저장 시각, dict) | None
+- set(key, at, data)
+- try_lease(key, owner, ttl) -> bool : 계산 담당 선점 (다른 워커와 중복 계산 방지)
+- release(key, owner)
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+Entry = tuple[float, dict]
+
+
+class MemoryBackend:
+    """프로세스 내부 저장소 (워커 간 공유 안 됨)"""
+
+    def __init__(self):
+        self._entries: dict[str, Entry] = {}
+        self._leases: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Entry | None:
+        return self._entries.get(key)
+
+    def set(self, key: str, at: float, data: dict) -> None:
+        self._entries[key] = (at, data)
+
+    def try_lease(self, key: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            held = self._leases.get(key)
+            if held and held[0] != owner and held[1] > now:
+                return False
+            self._leases[key] = (owner, now + ttl)
+            return True
+
+    def release(self, key: str, owner: str) -> None:
+        with self._lock:
+            if self._leases.get(key, ("",))[0] == owner:
+                del self._leases[key]
+
+
+class SQLiteBackend:
+    """
+    SQLite 파일 저장소 - 같은 서버의 모든 gunicorn 워커가 한 결과를 공유
+    읽기는 저장 시각만 먼저 확인하고, 바뀌었을 때만 JSON 을 다시 읽는다.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._memo: dict[str, Entry] = {}
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, at REAL, data TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT, expires REAL)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        # 연결은 스레드별로 하나 (sqlite3 연결은 스레드 간 공유 불가)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Entry | None:
+        conn = self._conn()
+        row = conn.execute("SELECT at FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        memo = self._memo.get(key)
+        if memo is not None and memo[0] == row[0]:
+            return memo
+        row = conn.execute("SELECT at, data FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = (row[0], json.loads(row[1]))
+        self._memo[key] = entry
+        return entry
+
+    def set(self, key: str, at: float, data: dict) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO results (key, at, data) VALUES (?, ?, ?)",
+            (key, at, json.dumps(data, ensure_ascii=False)),
+        )
+        self._memo[key] = (at, data)
+
+    def try_lease(self, key: str, owner: str, ttl: float) -> bool:
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT owner, expires FROM leases WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[0] != owner and row[1] > now:
+                conn.execute("COMMIT")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (key, owner, expires) VALUES (?, ?, ?)",
+                (key, owner, now + ttl),
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def release(self, key: str, owner: str) -> None:
+        self._conn().execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
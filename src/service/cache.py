@@ -0,0 +1,339 @@
+"""추천 결과 캐시 - (market, scope) 단위, 만료 직후에는 이전 결과 즉시 반환 + 백그라운드 갱신"""
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from src.utils.metrics import REGISTRY
+
+from .backends import Entry, MemoryBackend, SQLiteBackend
+from .encoding import EncodedResult, format_updated_at
+from .signals import SignalHistory, payload_signals
+from .snapshot import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+CACHE_RESULTS = REGISTRY.counter(
+    "stock_trader_result_cache", "추천 결과 캐시 조회 결과 (hit, stale, miss)", ["result"]
+)
+
+
+def cache_key(market: str, scope: str) -> str:
+    return f"{market}_{scope}"
+
+
+class _Flight:
+    """진행 중인 계산 하나 (같은 키 요청은 이 결과를 기다림)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: Entry | None = None
+        self.error: BaseException | None = None
+
+
+class ResultCache:
+    """
+    추천 결과 캐시 (stale-while-revalidate + single-flight)
+    - ttl_sec 이내: 캐시 그대로
+    - 만료 후 stale_sec 이내: 이전 결과를 바로 주고 백그라운드에서 갱신
+    - 그보다 오래됐거나 없으면: 요청 스레드에서 계산
+    같은 키 계산은 프로세스 안에서 한 번만 돌고, backend 가 SQLite 면 워커 간에도
+    선점(lease)한 한 워커만 계산하고 나머지는 저장된 결과를 기다린다.
+    compute(market, scope, **kwargs) 는 JSON 으로 직렬화 가능한 dict 를 반환
+    snapshots 가 있으면 계산 결과를 파일로도 남기고 restore 로 재기동 후 되살린다.
+    이 프로세스에서 아직 한 번도 계산하지 않은 키는 warm_max_sec 까지 오래된 결과도
+    이전 결과로 바로 응답한다 (재기동 직후 첫 요청이 전체 계산을 기다리지 않게)
+    history 가 있으면 계산할 때마다 종목별 신호·점수를 기록해 이전 계산과의 변화를 조회할 수 있다
+    """
+
+    # 선점 유지 시간 - 계산 중에는 LEASE_SEC / 3 마다 연장하고, 워커가 죽으면 이 시간 뒤 다른 워커가 이어서 계산
+    LEASE_SEC = 60
+    # 다른 요청·워커의 계산을 기다리는 최대 시간 (gunicorn --timeout 120 보다 짧게).
+    # 지나면 이전 결과가 있으면 이전 결과(stale), 없으면 TimeoutError
+    WAIT_SEC = 90
+    POLL_SEC = 0.25
+
+    def __init__(
+        self,
+        compute: Callable[..., dict],
+        ttl_sec: float,
+        stale_sec: float,
+        backend: MemoryBackend | SQLiteBackend | None = None,
+        snapshots: SnapshotStore | None = None,
+        warm_max_sec: float = 0,
+        history: SignalHistory | None = None,
+    ):
+        self._compute = compute
+        self.ttl = ttl_sec
+        self.stale = stale_sec
+        self.backend = backend or MemoryBackend()
+        self.snapshots = snapshots
+        self.warm_max = warm_max_sec
+        self.history = history
+        self._owner = uuid.uuid4().hex
+        self._computed: set[str] = set()  # 이 프로세스에서 계산·저장한 키
+        self._encoded: dict[str, EncodedResult] = {}  # 키별 마지막 결과의 응답 본문
+        self._last_access: dict[str, float] = {}
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def age(self, market: str, scope: str) -> float | None:
+        """캐시 경과 시간 초 (없으면 None)"""
+        entry = self.backend.get(cache_key(market, scope))
+        return time.time() - entry[0] if entry else None
+
+    def last_access(self, market: str, scope: str) -> float | None:
+        """마지막 조회 시각 (time.time 기준, 없으면 None)"""
+        return self._last_access.get(cache_key(market, scope))
+
+    def restore(self, combos: list[tuple[str, str]]) -> int:
+        """스냅숏 파일의 결과를 저장소에 되살림 (저장소 쪽이 더 최근이면 그대로). Returns: 되살린 수"""
+        if self.snapshots is None:
+            return 0
+        restored = 0
+        for market, scope in combos:
+            key = cache_key(market, scope)
+            entry = self.snapshots.load(key)
+            if entry is None:
+                continue
+            current = self.backend.get(key)
+            if current is None or current[0] < entry[0]:
+                self.backend.set(key, *entry)
+                restored += 1
+        return restored
+
+    def _stale_limit(self, key: str) -> float:
+        """이전 결과로 응답할 최대 경과 시간 (아직 계산 전인 키는 warm_max_sec 까지)"""
+        limit = self.ttl + self.stale
+        return limit if key in self._computed else max(limit, self.warm_max)
+
+    def _lookup(self, market: str, scope: str, kwargs: dict) -> tuple[Entry, bool]:
+        """get 본체 - (결과, 갱신 중 이전 결과 여부)"""
+        key = cache_key(market, scope)
+        self._last_access[key] = time.time()
+        entry = self.backend.get(key)
+        if entry is not None:
+            age = time.time() - entry[0]
+            if age < self.ttl:
+                CACHE_RESULTS.inc(result="hit")
+                return entry, False
+            if age < self._stale_limit(key):
+                CACHE_RESULTS.inc(result="stale")
+                self.refresh_async(market, scope, **kwargs)
+                return entry, True
+        CACHE_RESULTS.inc(result="miss")
+        loaded = self._load(key, market, scope, entry, kwargs)
+        # 기다리다 시간이 다 되어 이전 결과를 받은 경우
+        return loaded, entry is not None and loaded[0] <= entry[0]
+
+    def get(self, market: str, scope: str, **kwargs) -> dict:
+        """결과 조회 - 응답에 computed_at(계산 시각), age_sec(경과 초), stale(갱신 중 이전 결과 여부) 포함"""
+        return self._with_meta(*self._lookup(market, scope, kwargs))
+
+    def get_encoded(self, market: str, scope: str, **kwargs) -> tuple[EncodedResult, bool]:
+        """get 과 같은 기준으로 조회하되 미리 직렬화·압축한 본문으로 (본문, 갱신 중 여부)"""
+        entry, stale = self._lookup(market, scope, kwargs)
+        key = cache_key(market, scope)
+        encoded = self._encoded.get(key)
+        if encoded is None or encoded.at != entry[0]:
+            # 다른 워커가 계산했거나 스냅숏에서 되살린 결과 - 이 워커에서 처음 한 번만 직렬화
+            encoded = self._encoded[key] = EncodedResult.build(*entry)
+        return encoded, stale
+
+    def peek(self, market: str, scope: str) -> dict | None:
+        """계산 없이 캐시만 조회 (get 과 같은 기준, 만료 후 stale_sec 지나면 None)"""
+        key = cache_key(market, scope)
+        self._last_access[key] = time.time()
+        entry = self.backend.get(key)
+        if entry is None:
+            CACHE_RESULTS.inc(result="miss")
+            return None
+        age = time.time() - entry[0]
+        if age < self.ttl:
+            CACHE_RESULTS.inc(result="hit")
+            return self._with_meta(entry, stale=False)
+        if age < self._stale_limit(key):
+            CACHE_RESULTS.inc(result="stale")
+            self.refresh_async(market, scope)
+            return self._with_meta(entry, stale=True)
+        CACHE_RESULTS.inc(result="miss")
+        return None
+
+    def put(self, market: str, scope: str, data: dict) -> dict:
+        """외부에서 계산한 결과 저장 (스트리밍 응답 등). Returns: 메타 포함 결과"""
+        entry = (time.time(), data)
+        self._store(cache_key(market, scope), entry)
+        return self._with_meta(entry, stale=False)
+
+    @contextmanager
+    def leading(self, market: str, scope: str) -> Iterator[Callable[[dict], dict] | None]:
+        """
+        호출 측이 직접 계산할 때(스트리밍 응답 등)의 single-flight
+        이 프로세스의 진행 중 계산도, 다른 워커의 선점도 없으면 저장 함수(put 과 같음)를 주고
+        블록이 끝날 때까지 계산 담당이 된다. 아니면 None - 그때는 get 으로 담당의 결과를 기다린다.
+        저장하지 못하고 블록을 빠져나가면(예외·연결 끊김) 기다리던 요청은 다시 계산을 시도한다.
+        """
+        key = cache_key(market, scope)
+        flight = self._claim(key)
+        if flight is None:
+            yield None
+            return
+
+        def store(data: dict) -> dict:
+            entry = (time.time(), data)
+            self._store(key, entry)
+            flight.entry = entry
+            return self._with_meta(entry, stale=False)
+
+        try:
+            with self._renewing(key):
+                yield store
+        finally:
+            self.backend.release(key, self._owner)
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _claim(self, key: str) -> _Flight | None:
+        """계산 담당 선점 (프로세스 내 flight + 워커 간 lease). 이미 담당이 있으면 None"""
+        with self._lock:
+            if key in self._flights:
+                return None
+        if not self.backend.try_lease(key, self._owner, self.LEASE_SEC):
+            return None
+        with self._lock:
+            # 선점 사이에 같은 프로세스의 다른 요청이 담당이 됨 (lease 는 같은 소유자라 그쪽이 해제)
+            if key in self._flights:
+                return None
+            flight = self._flights[key] = _Flight()
+        return flight
+
+    @contextmanager
+    def _renewing(self, key: str) -> Iterator[None]:
+        """블록 동안 워커 간 선점(lease)을 LEASE_SEC / 3 마다 연장 (오래 걸리는 계산을 다른 워커가 가로채지 않게)"""
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(self.LEASE_SEC / 3):
+                try:
+                    self.backend.try_lease(key, self._owner, self.LEASE_SEC)
+                except Exception:
+                    logger.exception("계산 선점 연장 실패: %s", key)
+
+        thread = threading.Thread(target=run, name=f"lease-{key}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+
+    def _waited_too_long(self, key: str, old: Entry | None) -> Entry:
+        """WAIT_SEC 동안 새 결과가 없음 → 이전 결과, 없으면 TimeoutError"""
+        if old is None:
+            raise TimeoutError(f"추천 결과 계산 대기 시간 초과: {key}")
+        logger.warning("추천 결과 계산 대기 시간 초과, 이전 결과로 응답: %s", key)
+        return old
+
+    def _store(self, key: str, entry: Entry) -> None:
+        self.backend.set(key, *entry)
+        self._computed.add(key)
+        self._encoded[key] = EncodedResult.build(*entry)
+        if self.snapshots is not None:
+            self.snapshots.save(key, *entry)
+        if self.history is not None:
+            self.history.record(key, entry[0], payload_signals(entry[1]))
+
+    def changes(self, market: str, scope: str, since: int | None = None) -> dict | None:
+        """계산 결과 기록 기준 since 번 실행 이후 신호 변화 (SignalHistory.changes, 기록 없으면 None)"""
+        if self.history is None:
+            return None
+        return self.history.changes(cache_key(market, scope), since)
+
+    def refresh(self, market: str, scope: str, **kwargs) -> dict:
+        """다시 계산해 캐시 갱신 (진행 중인 같은 계산이 있으면 그 결과 사용)"""
+        key = cache_key(market, scope)
+        return self._load(key, market, scope, self.backend.get(key), kwargs)[1]
+
+    def refresh_async(self, market: str, scope: str, **kwargs) -> bool:
+        """백그라운드 갱신 시작 (이미 진행 중이면 False)"""
+        key = cache_key(market, scope)
+        with self._lock:
+            if key in self._flights:
+                return False
+
+        def run():
+            try:
+                self.refresh(market, scope, **kwargs)
+            except Exception:
+                logger.exception("추천 결과 갱신 실패: %s", key)
+
+        threading.Thread(target=run, name=f"refresh-{key}", daemon=True).start()
+        return True
+
+    def _load(self, key: str, market: str, scope: str, old: Entry | None, kwargs: dict) -> Entry:
+        """프로세스 내 single-flight: 같은 키는 먼저 온 요청만 계산"""
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+            if leader:
+                break
+            if not flight.done.wait(self.WAIT_SEC):
+                return self._waited_too_long(key, old)
+            if flight.error is not None:
+                raise flight.error
+            if flight.entry is not None:
+                return flight.entry
+            # 스트리밍 계산(leading)이 저장 없이 끝남 → 다시 시도
+
+        try:
+            flight.entry = self._load_shared(key, market, scope, old, kwargs)
+            return flight.entry
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _load_shared(self, key: str, market: str, scope: str, old: Entry | None, kwargs: dict) -> Entry:
+        """워커 간 single-flight: 선점한 워커만 계산, 나머지는 새 결과가 저장될 때까지 대기"""
+        since = old[0] if old else 0.0
+        give_up = time.monotonic() + self.WAIT_SEC
+        while True:
+            if self.backend.try_lease(key, self._owner, self.LEASE_SEC):
+                try:
+                    # 선점 직전에 다른 워커가 저장했을 수 있음
+                    entry = self.backend.get(key)
+                    if entry is not None and entry[0] > since:
+                        self._computed.add(key)
+                        return entry
+                    with self._renewing(key):
+                        data = self._compute(market, scope, **kwargs)
+                    entry = (time.time(), data)
+                    self._store(key, entry)
+                    return entry
+                finally:
+                    self.backend.release(key, self._owner)
+            entry = self.backend.get(key)
+            if entry is not None and entry[0] > since:
+                self._computed.add(key)
+                return entry
+            if time.monotonic() >= give_up:
+                return self._waited_too_long(key, old)
+            time.sleep(self.POLL_SEC)
+
+    @staticmethod
+    def _with_meta(entry: Entry, stale: bool) -> dict:
+        at, data = entry
+        out = data.copy()
+        out["updated_at"] = format_updated_at(at)
+        out["computed_at"] = round(at, 3)
+        out["age_sec"] = int(time.time() - at)
+        out["stale"] = stale
+        return out
@@ -0,0 +1,35 @@
+"""캐시 결과의 HTTP 응답 본문 - 계산할 때 한 번만 JSON 직렬화·gzip 압축해 두고 요청마다 그대로 보냄
+
+본문은 결과 + 갱신 시각(updated_at, computed_at)만 담아 같은 결과면 바이트가 같다.
+요청마다 달라지는 경과 시간·갱신 중 여부는 본문이 아니라 헤더(Age, X-Stale)로 보낸다.
+"""
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+
+def format_updated_at(at: float) -> str:
+    return datetime.fromtimestamp(at).strftime("%Y-%m-%d %H:%M")
+
+
+@dataclass(frozen=True)
+class EncodedResult:
+    """직렬화된 결과 하나 (at: 계산 시각)"""
+    at: float
+    body: bytes  # UTF-8 JSON
+    gzip: bytes
+    etag: str  # 본문 해시 (따옴표 없이)
+
+    @classmethod
+    def build(cls, at: float, data: dict) -> "EncodedResult":
+        payload = {**data, "updated_at": format_updated_at(at), "computed_at": round(at, 3)}
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        # mtime=0: 같은 본문이면 압축 결과도 같게
+        return cls(
+            at=at,
+            body=body,
+            gzip=gzip.compress(body, compresslevel=6, mtime=0),
+            etag=hashlib.sha256(body).hexdigest()[:32],
+        )
@@ -0,0 +1,72 @@
+"""추천 결과 백그라운드 갱신 - 캐시 만료 전에 미리 다시 계산"""
+import logging
+import threading
+import time
+
+from .cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    """
+    주기적으로 (market, scope) 조합을 확인해 만료 lead_sec 전에 갱신
+    - 최근 idle_sec 안에 조회된 조합만 갱신 (아무도 안 보는 조합은 쉬게 둠)
+    - warm: 시작 직후 한 번 계산해 둘 조합 (결과가 없거나 만료됐으면, 재기동 후 되살린 스냅숏 포함)
+    """
+
+    def __init__(
+        self,
+        cache: ResultCache,
+        combos: list[tuple[str, str]],
+        lead_sec: float = 60,
+        interval_sec: float = 15,
+        idle_sec: float = 3600,
+        warm: list[tuple[str, str]] | None = None,
+    ):
+        self.cache = cache
+        self.combos = combos
+        self.lead = lead_sec
+        self.interval = interval_sec
+        self.idle = idle_sec
+        self.warm = warm or []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def due(self) -> list[tuple[str, str]]:
+        """지금 갱신할 조합"""
+        now = time.time()
+        out = []
+        for market, scope in self.combos:
+            accessed = self.cache.last_access(market, scope)
+            if accessed is None or now - accessed > self.idle:
+                continue
+            age = self.cache.age(market, scope)
+            if age is None or age >= self.cache.ttl - self.lead:
+                out.append((market, scope))
+        return out
+
+    def run_once(self) -> None:
+        for market, scope in self.due():
+            self.cache.refresh_async(market, scope)
+
+    def _loop(self) -> None:
+        for market, scope in self.warm:
+            age = self.cache.age(market, scope)
+            if age is None or age >= self.cache.ttl:
+                self.cache.refresh_async(market, scope)
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("백그라운드 갱신 확인 실패")
@@ -0,0 +1,124 @@
+"""실행별 신호 기록과 변화 비교 - (market, scope) 별 최근 실행의 종목별 신호·점수
+
+실행마다 목록(trend/rising)별 {종목코드: [종목명, 신호, 점수]} 만 남겨 두고, 이전 실행과 비교해
+새로 들어온 종목(entered), 빠진 종목(exited), 신호 상향(upgraded)·하향(downgraded)을 만든다.
+클라이언트는 마지막으로 받은 실행 번호(seq)만 보내 바뀐 종목만 받는다.
+기록은 키별 잠금 파일로 프로세스 간에도 한 번에 하나씩 (여러 gunicorn 워커가 같은 키를 기록해도 번호가 겹치지 않음).
+"""
+import json
+import logging
+import re
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from src.utils.filelock import file_lock
+
+logger = logging.getLogger(__name__)
+
+# 신호 순위 (높을수록 좋음). 샛별 목록은 모두 '샛별' 이라 들고 나는 것만 의미가 있다
+SIGNAL_RANK = {"주의": 0, "관망": 1, "매수": 2, "샛별": 3}
+
+# 목록 이름 → {종목코드: [종목명, 신호, 점수]}
+Signals = dict[str, dict[str, list]]
+
+
+def payload_signals(data: Mapping, lists: Iterable[str] = ("trend", "rising")) -> Signals:
+    """추천 응답(/api/run 형식)에서 목록별 종목 신호만 추출 (신호 없는 샛별 항목은 '샛별')"""
+    return {
+        key: {
+            item["symbol"]: [item["name"], item.get("signal", "샛별"), item["score"]]
+            for item in data.get(key, [])
+        }
+        for key in lists
+    }
+
+
+def _item(key: str, symbol: str, name: str, signal: str, score: float) -> dict:
+    return {"list": key, "symbol": symbol, "name": name, "signal": signal, "score": score}
+
+
+def diff_signals(before: Signals, after: Signals) -> dict[str, list[dict]]:
+    """두 실행의 목록별 신호 비교 → {"entered","exited","upgraded","downgraded": [...]}"""
+    out: dict[str, list[dict]] = {"entered": [], "exited": [], "upgraded": [], "downgraded": []}
+    for key in dict.fromkeys([*before, *after]):
+        old, new = before.get(key, {}), after.get(key, {})
+        for symbol, (name, signal, score) in new.items():
+            prev = old.get(symbol)
+            item = _item(key, symbol, name, signal, score)
+            if prev is None:
+                out["entered"].append(item)
+                continue
+            step = SIGNAL_RANK.get(signal, 0) - SIGNAL_RANK.get(prev[1], 0)
+            if step:
+                item.update(before=prev[1], before_score=prev[2])
+                out["upgraded" if step > 0 else "downgraded"].append(item)
+        for symbol, (name, signal, score) in old.items():
+            if symbol not in new:
+                out["exited"].append(_item(key, symbol, name, signal, score))
+    return out
+
+
+class SignalHistory:
+    """키별 최근 keep 개 실행의 신호 ({root}/{key}.json, 원자적 교체)"""
+
+    def __init__(self, root: str | Path, keep: int = 50):
+        self.root = Path(root)
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{re.sub(r'[^0-9A-Za-z_-]', '_', key)}.json"
+
+    def runs(self, key: str) -> list[dict]:
+        """[{"seq", "at", "signals"}, ...] 오래된 것부터 (없으면 빈 목록)"""
+        try:
+            return json.loads(self._path(key).read_text(encoding="utf-8"))["runs"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+
+    def record(self, key: str, at: float, signals: Signals) -> int | None:
+        """실행 하나 기록. 직전 실행과 신호·점수가 같으면 새 번호 없이 시각만 갱신. Returns: 실행 번호"""
+        path = self._path(key)
+        try:
+            with self._lock, file_lock(path.with_suffix(".lock")):
+                runs = self.runs(key)
+                if runs and runs[-1]["signals"] == signals:
+                    runs[-1]["at"] = at
+                else:
+                    seq = runs[-1]["seq"] + 1 if runs else 1
+                    runs = (runs + [{"seq": seq, "at": at, "signals": signals}])[-self.keep:]
+                tmp = path.with_suffix(f".{time.monotonic_ns()}.tmp")
+                text = json.dumps({"runs": runs}, ensure_ascii=False, separators=(",", ":"))
+                tmp.write_text(text, encoding="utf-8")
+                tmp.replace(path)
+                return runs[-1]["seq"]
+        except OSError as e:
+            logger.warning("신호 기록 저장 실패 %s: %s", key, e)
+            return None
+
+    def changes(self, key: str, since: int | None = None) -> dict | None:
+        """
+        since 번 실행 이후 바뀐 종목 (기록 없으면 None)
+        - since 없음: 직전 실행 대비
+        - since 가 최신이면 빈 변화, 보관 범위를 벗어났으면 reset=True (전체 결과를 다시 받아야 함)
+        """
+        runs = self.runs(key)
+        if not runs:
+            return None
+        latest = runs[-1]
+        reset = False
+        if since is None:
+            base = runs[-2] if len(runs) > 1 else None
+        else:
+            base = next((r for r in runs if r["seq"] == since), None)
+            reset = base is None
+        diff = diff_signals(base["signals"] if base else {}, latest["signals"])
+        return {
+            "seq": latest["seq"],
+            "since": base["seq"] if base else None,
+            "at": latest["at"],
+            "reset": reset,
+            **diff,
+        }
@@ -0,0 +1,43 @@
+"""최근 추천 결과 스냅숏 - (market, scope) 별 JSON 파일
+
+프로세스가 새로 뜬 직후(배포, 유휴 후 재기동)에도 마지막 결과를 바로 응답할 수 있게
+계산할 때마다 디스크에 남겨 둔다. 저장소(MemoryBackend/SQLite)와 별개로 파일 하나씩이라
+메모리 캐시만 쓰는 환경에서도 재기동 후 읽을 수 있다.
+"""
+import json
+import logging
+import re
+import time
+from pathlib import Path
+
+from .backends import Entry
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """키별 마지막 결과 파일 ({root}/{key}.json)"""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{re.sub(r'[^0-9A-Za-z_-]', '_', key)}.json"
+
+    def load(self, key: str) -> Entry | None:
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+            return float(data["at"]), data["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, key: str, at: float, data: dict) -> None:
+        """원자적 교체 (쓰는 중 재기동돼도 이전 파일 유지). 실패는 기록만"""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp = path.with_suffix(f".{time.monotonic_ns()}.tmp")
+            tmp.write_text(json.dumps({"at": at, "data": data}, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning("추천 결과 스냅숏 저장 실패 %s: %s", key, e)
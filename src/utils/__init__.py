@@ -0,0 +1,15 @@
+"""공통 유틸리티"""
+from .filelock import file_lock
+from .metrics import REGISTRY, Counter, Histogram, RunProfile, StageClock, profile_run, record, stage
+
+__all__ = [
+    "REGISTRY",
+    "Counter",
+    "Histogram",
+    "RunProfile",
+    "StageClock",
+    "file_lock",
+    "profile_run",
+    "record",
+    "stage",
+]
@@ -0,0 +1,58 @@
+"""프로세스 간 잠금 - 잠금 파일에 운영체제 잠금(fcntl.flock / Windows msvcrt.locking)을 걸어 잡음
+
+잠금은 열린 파일에 걸리므로 잡은 프로세스가 죽으면 운영체제가 바로 풀어 준다 (오래된 잠금 판단·가져오기 없음).
+잠금 파일은 지우지 않고 남겨 둔다 - 지우면 지우는 사이에 다른 프로세스가 새 파일을 잠가 둘이 함께 잡을 수 있음.
+열 때마다 별도 파일 핸들이라 같은 프로세스의 스레드끼리도 서로를 막는다.
+"""
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+if os.name == "nt":
+    import msvcrt
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: str | Path, blocking: bool = True, poll_sec: float = 0.05) -> Iterator[bool]:
+    """path 잠금 파일로 프로세스 간 잠금. Yields: 잡았으면 True (blocking=False 면 못 잡을 때 바로 False)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_CREAT | os.O_RDWR)
+    try:
+        while not _try_lock(fd):
+            if not blocking:
+                yield False
+                return
+            time.sleep(poll_sec)
+        try:
+            yield True
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
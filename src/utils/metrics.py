@@ -0,0 +1,250 @@
+"""실행 지표 수집 - 프로세스 내 카운터/히스토그램, Prometheus 텍스트 출력, 실행별 단계 시간
+
+- REGISTRY 의 지표는 프로세스 단위 (gunicorn 워커마다 따로 집계)
+- stage("fetch") 블록은 단계별 히스토그램에 기록되고, profile_run() 안이면 그 실행의 단계 시간에도 더해진다
+  (contextvars 기반이라 iter_fetch 처럼 컨텍스트를 복사해 넘긴 작업 스레드의 기록도 포함)
+"""
+import contextvars
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelKey:
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    @property
+    def family(self) -> str:
+        """# HELP/# TYPE 에 쓰는 이름 (텍스트 형식 0.0.4 는 샘플 이름과 같아야 함)"""
+        return self.name
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.family} {self.help}", f"# TYPE {self.family} {self.kind}"]
+
+
+class Counter(_Metric):
+    """누적 카운터"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, value: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    @property
+    def family(self) -> str:
+        return f"{self.name}_total"
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, v in items:
+            lines.append(f"{self.family}{_fmt_labels(self.labels, key)} {_fmt_value(v)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """소요 시간 분포 (초)"""
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # 라벨별 [버킷별 개수..., 합계, 개수]
+        self._values: dict[LabelKey, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        row = self._values.get(self._key(labels))
+        return int(row[-1]) if row else 0
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for key, row in items:
+            for bound, n in zip(self.buckets + (float("inf"),), row[:-2] + [row[-1]]):
+                le = f'le="{_fmt_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {_fmt_value(n)}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {row[-2]!r}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {_fmt_value(row[-1])}")
+        return lines
+
+
+class Registry:
+    """지표 모음 (이름당 하나, 같은 이름으로 다시 만들면 기존 지표 반환)"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def histogram(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "stock_trader_stage_seconds", "단계별 소요 시간 (fetch, indicators, scoring 등)", ["stage"]
+)
+
+
+class RunProfile:
+    """한 번의 실행(요청) 동안 단계별 소요 시간 합계"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.elapsed: float | None = None
+        self._stages: dict[str, list[float]] = {}  # 단계 → [횟수, 합계, 최대]
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            row = self._stages.setdefault(stage, [0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += seconds
+            row[2] = max(row[2], seconds)
+
+    def to_dict(self) -> dict:
+        total = self.elapsed if self.elapsed is not None else time.perf_counter() - self.started
+        with self._lock:
+            stages = {
+                name: {"count": int(n), "total_ms": round(s * 1000, 2), "max_ms": round(m * 1000, 2)}
+                for name, (n, s, m) in self._stages.items()
+            }
+        return {"total_ms": round(total * 1000, 2), "stages": stages}
+
+
+_profile: contextvars.ContextVar[RunProfile | None] = contextvars.ContextVar("run_profile", default=None)
+
+
+@contextmanager
+def profile_run() -> Iterator[RunProfile]:
+    """이 블록 안의 stage/record 시간을 모으는 실행 프로파일"""
+    profile = RunProfile()
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        profile.elapsed = time.perf_counter() - profile.started
+        _profile.reset(token)
+
+
+def record(stage: str, seconds: float) -> None:
+    """진행 중인 실행 프로파일에만 기록 (없으면 무시)"""
+    profile = _profile.get()
+    if profile is not None:
+        profile.add(stage, seconds)
+
+
+class StageClock:
+    """stage 블록의 시계 - pause() 안에서 흐른 시간은 단계 시간에서 뺀다"""
+
+    def __init__(self):
+        self.paused = 0.0
+
+    @contextmanager
+    def pause(self) -> Iterator[None]:
+        """제너레이터가 yield 로 호출 측에 넘긴 동안처럼 이 단계의 일이 아닌 시간"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.paused += time.perf_counter() - started
+
+
+@contextmanager
+def stage(name: str) -> Iterator[StageClock]:
+    """
+    단계 시간 측정 - STAGE_SECONDS 히스토그램 + 실행 프로파일
+    제너레이터 안에서 블록이 yield 를 감싸면 그 부분은 clock.pause() 로 감싼다 (호출 측 시간 제외)
+    """
+    clock = StageClock()
+    started = time.perf_counter()
+    try:
+        yield clock
+    finally:
+        elapsed = time.perf_counter() - started - clock.paused
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        record(name, elapsed)
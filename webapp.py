@@ -1,84 +1,180 @@
 """
 모바일 웹앱 - 한국/미국 주식 추천, 탭 구분
 실행: python webapp.py  또는  flask run
+
+pandas·FinanceDataReader 를 쓰는 추천 모듈(main, src.recommender)은 처음 계산할 때 불러온다.
+(재기동 직후 포트를 빨리 열고, 스냅숏 결과를 바로 응답)
 """
+import hmac
+import json
+import logging
 import sys
-from datetime import datetime
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from flask import Flask, jsonify, render_template_string, request
+from flask import Flask, Response, jsonify, render_template_string, request, stream_with_context
+
+from config import (
+    BACKGROUND_REFRESH,
+    PROFILE_TOKEN,
+    REFRESH_IDLE_SEC,
+    REFRESH_INTERVAL_SEC,
+    REFRESH_LEAD_SEC,
+    RESULT_CACHE_PATH,
+    SIGNAL_HISTORY_DIR,
+    SIGNAL_HISTORY_RUNS,
+    SNAPSHOT_DIR,
+    STALE_MAX_SEC,
+    WARM_START_MAX_SEC,
+)
+from src.service import (
+    EncodedResult,
+    MemoryBackend,
+    RefreshScheduler,
+    ResultCache,
+    SignalHistory,
+    SnapshotStore,
+    SQLiteBackend,
+)
+from src.utils.metrics import REGISTRY, profile_run
+
+if TYPE_CHECKING:
+    from src.data import DataContext
+    from src.recommender import RankFilter, Recommendation, ScanResult
 
-from main import run_rising_star_recommender, run_trend_recommender
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
-# 캐시 (market_scope 키, 5분)
-_cache: dict = {}
+# 캐시 (market_scope 키, 5분). 만료 후 STALE_MAX_SEC 까지는 이전 결과 즉시 응답 + 백그라운드 갱신
+# RESULT_CACHE_PATH(SQLite)로 모든 워커가 결과를 공유하고, 같은 키 계산은 한 번만 수행
 CACHE_MIN = 5
+COMBOS = [("kr", "watchlist"), ("kr", "market"), ("us", "watchlist"), ("us", "market")]
 
+SCAN_SECONDS = REGISTRY.histogram(
+    "stock_trader_scan_seconds", "추천 계산 전체 소요 시간 (캐시 제외)", ["market", "scope"]
+)
 
-def _cache_key(market: str, scope: str) -> str:
-    return f"{market}_{scope}"
 
+def _rising_limit(market: str, scope: str, fast_mode: bool) -> int:
+    """관심종목 조회에 곁들일 샛별 종목 수 (한국만). 시장 스캔은 전체 스캔에서 샛별도 함께 평가"""
+    if market == "kr" and scope == "watchlist":
+        return 8 if fast_mode else 80
+    return 0
 
-def get_recommendations(
-    market: str = "kr", scope: str = "watchlist", fast_mode: bool = True
-):
-    """추천 실행. market: 'kr'|'us', scope: 'watchlist'|'market'"""
-    global _cache
-    key = _cache_key(market, scope)
-    if key not in _cache:
-        _cache[key] = {"data": None, "time": None}
-    c = _cache[key]
-    if c["data"] and c["time"]:
-        elapsed = (datetime.now() - c["time"]).total_seconds()
-        if elapsed < CACHE_MIN * 60:
-            out = c["data"].copy()
-            out["updated_at"] = c["time"].strftime("%Y-%m-%d %H:%M")
-            return out
-
-    trend = run_trend_recommender(market=market, scope=scope)
-    currency = "USD" if market == "us" else "KRW"
 
-    # 샛별: 한국 + 관심종목일 때만 (시장 스캔은 추세만, 시간 제한)
-    rising = []
-    if market == "kr" and scope == "watchlist":
-        rising = run_rising_star_recommender(limit=8) if fast_mode else run_rising_star_recommender()
+def _trend_item(r: "Recommendation", currency: str) -> dict:
+    return {
+        "symbol": r.symbol,
+        "name": r.name,
+        "price": round(r.current_price, 2) if currency == "USD" else int(r.current_price),
+        "score": r.score,
+        "signal": r.signal,
+        "reasons": r.render_reasons(3),
+    }
+
 
-    now = datetime.now()
+def _rising_item(r: "Recommendation") -> dict:
+    return {
+        "symbol": r.symbol,
+        "name": r.name,
+        "price": int(r.current_price),
+        "score": r.score,
+        "reasons": r.render_reasons(4),
+    }
+
+
+def _payload(
+    market: str,
+    scope: str,
+    trend: "list[Recommendation]",
+    rising: "list[Recommendation]",
+    scan: "ScanResult | None" = None,
+) -> dict:
+    """
+    정렬된 추천 결과 → 응답 JSON (시장 스캔이면 scan 요약 포함)
+    rising 은 상위 10개만, 시장 스캔 목록은 이미 상위 SCAN_TOP_N 개만이라
+    complete 에 목록별로 평가한 종목이 모두 담겼는지 남긴다 (조건·페이지 응답의 page.complete)
+    """
+    currency = "USD" if market == "us" else "KRW"
     data = {
         "market": market,
         "scope": scope,
         "currency": currency,
-        "trend": [
-            {
-                "symbol": r.symbol,
-                "name": r.name,
-                "price": round(r.current_price, 2) if currency == "USD" else int(r.current_price),
-                "score": r.score,
-                "signal": r.signal,
-                "reasons": r.reasons[:3],
-            }
-            for r in trend
-        ],
-        "rising": [
-            {
-                "symbol": r.symbol,
-                "name": r.name,
-                "price": int(r.current_price),
-                "score": r.score,
-                "reasons": r.reasons[:4],
-            }
-            for r in rising[:10]
-        ],
-        "updated_at": now.strftime("%Y-%m-%d %H:%M"),
+        "trend": [_trend_item(r, currency) for r in trend],
+        "rising": [_rising_item(r) for r in rising[:10]],
+        "complete": {"trend": scan is None, "rising": scan is None and len(rising) <= 10},
     }
-    _cache[key] = {"data": data, "time": now}
+    if scan is not None:
+        data["scan"] = scan.to_dict()
     return data
 
 
+def compute_recommendations(
+    market: str = "kr", scope: str = "watchlist", fast_mode: bool = True
+) -> dict:
+    """
+    추천 계산 (캐시 없이). market: 'kr'|'us', scope: 'watchlist'|'market'(전체 시장 스캔)
+    관심종목 추천은 실행 동안 같은 종목 시세를 한 번만 조회 (data_context), 끝나면 조회·재사용 수를 로그로
+    시장 스캔은 종목마다 한 번씩만 조회하므로 메모를 쓰지 않음 (수천 종목 시세를 끝까지 붙들지 않도록)
+    """
+    from main import run_combined_recommender, run_market_scan
+
+    with SCAN_SECONDS.time(market=market, scope=scope):
+        if scope == "market":
+            scan = run_market_scan(market)
+            return _payload(market, scope, scan.trend, scan.rising, scan)
+        with _data_context(scope) as data:
+            # 추세·샛별 종목 풀을 합쳐 한 번만 조회·지표 계산
+            trend, rising = run_combined_recommender(
+                market=market, scope=scope, rising_limit=_rising_limit(market, scope, fast_mode)
+            )
+    logger.info("추천 계산 %s/%s: %s", market, scope, data.summary())
+    return _payload(market, scope, trend, rising)
+
+
+def _data_context(scope: str) -> "AbstractContextManager[DataContext | None]":
+    """관심종목 추천만 실행별 시세 메모 (시장 스캔은 None)"""
+    from src.data import data_context
+
+    return nullcontext() if scope == "market" else data_context()
+
+
+_cache = ResultCache(
+    compute_recommendations,
+    ttl_sec=CACHE_MIN * 60,
+    stale_sec=STALE_MAX_SEC,
+    backend=SQLiteBackend(RESULT_CACHE_PATH) if RESULT_CACHE_PATH else MemoryBackend(),
+    snapshots=SnapshotStore(SNAPSHOT_DIR) if SNAPSHOT_DIR else None,
+    warm_max_sec=WARM_START_MAX_SEC,
+    history=SignalHistory(SIGNAL_HISTORY_DIR, keep=SIGNAL_HISTORY_RUNS) if SIGNAL_HISTORY_DIR else None,
+)
+# 재기동 직후: 마지막 결과를 바로 응답할 수 있게 스냅숏 복원 (갱신은 백그라운드)
+_cache.restore(COMBOS)
+_scheduler = RefreshScheduler(
+    _cache,
+    COMBOS,
+    lead_sec=REFRESH_LEAD_SEC,
+    interval_sec=REFRESH_INTERVAL_SEC,
+    idle_sec=REFRESH_IDLE_SEC,
+    warm=[("kr", "watchlist")],
+)
+if BACKGROUND_REFRESH:
+    _scheduler.start()
+
+
+def get_recommendations(
+    market: str = "kr", scope: str = "watchlist", fast_mode: bool = True
+):
+    """추천 실행 (캐시 사용). market: 'kr'|'us', scope: 'watchlist'|'market'"""
+    return _cache.get(market, scope, fast_mode=fast_mode)
+
+
 HTML = """
 <!DOCTYPE html>
 <html lang="ko">
@@ -145,35 +241,70 @@ function fmtPrice(p, currency){
   if(currency==='USD') return '$'+Number(p).toLocaleString('en-US',{minimumFractionDigits:2});
   return Number(p).toLocaleString()+'원';
 }
+function fmtAge(sec){
+  if(!sec||sec<60) return '방금 전';
+  return Math.floor(sec/60)+'분 전';
+}
+function render(d, progress){
+  var h='';
+  if(progress) h='<p class="updated">'+progress+'</p>';
+  else if(d.updated_at) h='<p class="updated">5분 단위 갱신 · 마지막 갱신: '+d.updated_at+' ('+fmtAge(d.age_sec)+')'+(d.stale?' · 새 데이터 계산 중':'')+(d.scope==='market'?' (시장 스캔)':'')+'</p>';
+  h+='<div class="section">추세 기반'+(d.scope==='market'?(d.scan?' · 전체 '+d.scan.scanned.toLocaleString()+'종목 중 상위 '+d.trend.length:' · 시장 스캔'):'')+'</div>';
+  for(var x of d.trend){
+    var c='tag-buy';if(x.signal==='관망')c='tag-watch';if(x.signal==='주의')c='tag-warn';
+    h+='<div class="card"><span class="tag '+c+'">'+x.signal+'</span><span class="symbol">['+x.symbol+'] '+x.name+'</span><p class="price">'+fmtPrice(x.price,d.currency)+' · 점수 '+x.score+'</p><ul>';
+    for(var rr of x.reasons)h+='<li>'+rr+'</li>';
+    h+='</ul></div>';
+  }
+  if(d.rising && d.rising.length>0){
+    h+='<div class="section">샛별</div>';
+    for(var x of d.rising){
+      h+='<div class="card"><span class="tag tag-star">샛별</span><span class="symbol">['+x.symbol+'] '+x.name+'</span><p class="price">'+x.price.toLocaleString()+'원</p><ul>';
+      for(var rr of x.reasons)h+='<li>'+rr+'</li>';
+      h+='</ul></div>';
+    }
+  } else if(d.market==='kr' && !progress) {
+    h+='<div class="section">샛별</div><div class="card">조건에 맞는 종목 없음</div>';
+  }
+  return h;
+}
+async function runJson(out){
+  var r=await fetch('/api/run?market='+currentMarket+'&scope='+currentScope);
+  var d=await r.json();
+  if(!r.ok)throw new Error(d.error||r.status);
+  d.age_sec=Number(r.headers.get('Age')||0);d.stale=r.headers.get('X-Stale')==='1';
+  out.innerHTML=render(d);
+}
 async function run(){
   var btn=document.getElementById('btn');
   var out=document.getElementById('out');
   btn.disabled=true;
-  var scopeLabel=currentScope==='market'?'시장 스캔(약 25종)':'관심종목';
-  out.innerHTML='<div class="loading">'+scopeLabel+' 분석 중... 25~35초 소요</div>';
+  var scopeLabel=currentScope==='market'?'시장 전체 스캔':'관심종목';
+  out.innerHTML='<div class="loading">'+scopeLabel+' 분석 중...</div>';
   try{
-    var r=await fetch('/api/run?market='+currentMarket+'&scope='+currentScope);
-    var d=await r.json();
-    var h='';
-    if(d.updated_at) h='<p class="updated">5분 단위 갱신 · 마지막 갱신: '+d.updated_at+(d.scope==='market'?' (시장 스캔)':'')+'</p>';
-    h+='<div class="section">추세 기반'+(d.scope==='market'?' · 시장 스캔 (일부 종목)':'')+'</div>';
-    for(var x of d.trend){
-      var c='tag-buy';if(x.signal==='관망')c='tag-watch';if(x.signal==='주의')c='tag-warn';
-      h+='<div class="card"><span class="tag '+c+'">'+x.signal+'</span><span class="symbol">['+x.symbol+'] '+x.name+'</span><p class="price">'+fmtPrice(x.price,d.currency)+' · 점수 '+x.score+'</p><ul>';
-      for(var rr of x.reasons)h+='<li>'+rr+'</li>';
-      h+='</ul></div>';
-    }
-    if(d.rising && d.rising.length>0){
-      h+='<div class="section">샛별</div>';
-      for(var x of d.rising){
-        h+='<div class="card"><span class="tag tag-star">샛별</span><span class="symbol">['+x.symbol+'] '+x.name+'</span><p class="price">'+x.price.toLocaleString()+'원</p><ul>';
-        for(var rr of x.reasons)h+='<li>'+rr+'</li>';
-        h+='</ul></div>';
+    var r=await fetch('/api/run/stream?market='+currentMarket+'&scope='+currentScope);
+    if(!r.body||!r.body.getReader||!window.TextDecoder){await runJson(out);btn.disabled=false;return;}
+    // 종목이 평가되는 대로 카드 추가, 마지막에 정렬된 결과로 교체
+    var reader=r.body.getReader(), dec=new TextDecoder(), buf='';
+    var live={market:currentMarket,scope:currentScope,currency:'KRW',trend:[],rising:[]}, total=0;
+    while(true){
+      var chunk=await reader.read();
+      if(chunk.done) break;
+      buf+=dec.decode(chunk.value,{stream:true});
+      var lines=buf.split('\\n'); buf=lines.pop();
+      for(var line of lines){
+        if(!line) continue;
+        var m=JSON.parse(line);
+        if(m.type==='meta'){live.currency=m.currency;total=m.total;}
+        else if(m.type==='done'){out.innerHTML=render(m.data);}
+        else if(m.type==='error'){throw new Error(m.error);}
+        else{
+          if(m.type==='trend')live.trend.push(m.item);
+          if(m.type==='rising')live.rising.push(m.item);
+          out.innerHTML=render(live,scopeLabel+' 분석 중... '+m.done+'/'+total);
+        }
       }
-    } else if(d.market==='kr') {
-      h+='<div class="section">샛별</div><div class="card">조건에 맞는 종목 없음</div>';
     }
-    out.innerHTML=h;
   }catch(e){out.innerHTML='<div class="loading">오류: '+e.message+'</div>'}
   btn.disabled=false;
 }
@@ -183,13 +314,24 @@ async function run(){
 """
 
 
+_BUSY_MESSAGE = "추천 결과를 계산 중입니다. 잠시 후 다시 시도하세요"
+
+
+@app.errorhandler(TimeoutError)
+def busy(e: TimeoutError):
+    """다른 요청·워커의 계산을 ResultCache.WAIT_SEC 동안 기다려도 결과가 없음 (이전 결과도 없을 때)"""
+    response = jsonify({"error": _BUSY_MESSAGE})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(CACHE_MIN * 60 // 10)
+    return response
+
+
 @app.route("/")
 def index():
     return render_template_string(HTML)
 
 
-@app.route("/api/run")
-def api_run():
+def _run_args() -> tuple[str, str, bool]:
     market = request.args.get("market", "kr")
     scope = request.args.get("scope", "watchlist")
     if market not in ("kr", "us"):
@@ -197,8 +339,268 @@ def api_run():
     if scope not in ("watchlist", "market"):
         scope = "watchlist"
     full = request.args.get("full") == "1"
+    return market, scope, full
+
+
+# 목록별 (응답 키, 전략 이름)
+_LISTS = (("trend", "trend"), ("rising", "rising_star"))
+_PAGE_ARGS = ("signal", "min_score", "category", "offset", "limit")
+
+
+def _page_args() -> "tuple[RankFilter, int, int | None]":
+    """
+    조건·페이지 인자
+    - signal: 신호 (쉼표 구분, 예: 매수,관망), min_score: 최소 점수, category: trend|rising_star (쉼표 구분)
+    - offset, limit: 목록별 시작 위치와 개수 (limit 최대 100)
+    """
+    def csv(key: str) -> frozenset[str] | None:
+        value = request.args.get(key, "").strip()
+        return frozenset(v.strip() for v in value.split(",") if v.strip()) or None
+
+    def number(key: str, cast, default):
+        try:
+            return cast(request.args[key])
+        except (KeyError, ValueError):
+            return default
+
+    from src.recommender import RankFilter
+
+    where = RankFilter(
+        signals=csv("signal"), min_score=number("min_score", float, None), categories=csv("category")
+    )
+    offset = max(number("offset", int, 0), 0)
+    limit = number("limit", int, None)
+    if limit is not None:
+        limit = min(max(limit, 0), 100)
+    return where, offset, limit
+
+
+def _paginate(data: dict, where: "RankFilter", offset: int, limit: int | None) -> dict:
+    """
+    캐시된 추천 목록에 조건·페이지 적용
+    조건은 응답에 담긴 목록(샛별 상위 10개, 시장 스캔은 점수 상위 SCAN_TOP_N 개) 안에서만 거른다.
+    page.total 은 그 안에서 조건을 통과한 수이고, page.complete 가 false 인 목록은 그 밖의 종목이
+    있을 수 있어 전체 개수가 아니다 (예: scope=market&signal=주의 는 상위 종목 중 주의만)
+    """
+    out = dict(data)
+    totals = {}
+    for key, category in _LISTS:
+        # 샛별 항목은 신호 필드 없이 모두 '샛별'
+        items = [
+            item for item in data[key]
+            if where.accepts(item["score"], item.get("signal", "샛별"), category)
+        ]
+        totals[key] = len(items)
+        end = None if limit is None else offset + limit
+        out[key] = items[offset:end]
+    complete = data.get("complete", {})
+    out["page"] = {
+        "offset": offset,
+        "limit": limit,
+        "total": totals,
+        "complete": {key: bool(complete.get(key, False)) for key, _ in _LISTS},
+    }
+    return out
+
+
+@app.route("/api/run")
+def api_run():
+    """
+    추천 결과 (캐시 사용)
+    - profile=1 (X-Profile-Token 필요): 새로 계산하고 단계별 소요 시간·시세 조회/재사용 수(profile)를 함께 반환
+      (결과는 캐시에 저장, _profiled_run)
+    - signal, min_score, category, offset, limit: 캐시된 상위 목록 안에서 조건·페이지 적용 (_paginate)
+    그 외에는 계산할 때 만들어 둔 본문을 그대로 보낸다 (_encoded_response: ETag/304, gzip).
+    어느 경우든 경과 시간·갱신 중 여부는 본문이 아닌 Age/X-Stale 헤더로 보낸다 (본문에는 computed_at)
+    """
+    market, scope, full = _run_args()
+    if request.args.get("profile") == "1":
+        return _profiled_run(market, scope, full)
+    if not any(key in request.args for key in _PAGE_ARGS):
+        encoded, stale = _cache.get_encoded(market, scope, fast_mode=not full)
+        return _encoded_response(encoded, stale)
     data = get_recommendations(market=market, scope=scope, fast_mode=not full)
-    return jsonify(data)
+    return _json_response(_paginate(data, *_page_args()))
+
+
+def _json_response(data: dict) -> Response:
+    """결과 응답 - age_sec/stale 은 본문에서 빼 Age/X-Stale 헤더로 (_encoded_response 와 같은 형식)"""
+    body = dict(data)
+    age, stale = body.pop("age_sec"), body.pop("stale")
+    response = jsonify(body)
+    response.headers["Age"] = str(max(0, age))
+    response.headers["X-Stale"] = "1" if stale else "0"
+    return response
+
+
+def _profiled_run(market: str, scope: str, full: bool):
+    """
+    profile=1: PROFILE_TOKEN 이 맞는 요청만, 캐시의 계산 담당(_cache.leading)을 잡았을 때만 새로 계산
+    (같은 키를 다른 요청·워커가 계산 중이면 409)
+    """
+    token = request.headers.get("X-Profile-Token", "")
+    if not PROFILE_TOKEN or not hmac.compare_digest(token, PROFILE_TOKEN):
+        return jsonify({"error": "profile 요청에는 PROFILE_TOKEN 이 필요합니다"}), 403
+    with _cache.leading(market, scope) as store:
+        if store is None:
+            return jsonify({"error": "이미 계산 중입니다. 잠시 후 다시 시도하세요"}), 409
+        with profile_run() as profile, _data_context(scope) as fetches:
+            data = compute_recommendations(market=market, scope=scope, fast_mode=not full)
+        data = store(data)
+    stats = fetches.stats() if fetches else None
+    return _json_response({**data, "profile": {**profile.to_dict(), "data": stats}})
+
+
+def _encoded_response(encoded: EncodedResult, stale: bool) -> Response:
+    """
+    미리 직렬화·압축한 결과 응답
+    - ETag: 본문 해시 (gzip 본문은 -gz 를 붙인 별도 값). If-None-Match 가 같으면 본문 없이 304
+    - Cache-Control: 갱신 주기(CACHE_MIN)만큼 신선, 이후 STALE_MAX_SEC 동안 이전 결과 사용 + 재검증
+    - Age: 계산 후 경과 초, X-Stale: 1 이면 갱신 중 이전 결과
+    """
+    use_gzip = request.accept_encodings["gzip"] > 0  # gzip;q=0 은 거부
+    response = Response(encoded.gzip if use_gzip else encoded.body, mimetype="application/json")
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    response.set_etag(encoded.etag + ("-gz" if use_gzip else ""))
+    response.headers["Cache-Control"] = (
+        f"public, max-age={CACHE_MIN * 60}, stale-while-revalidate={STALE_MAX_SEC}"
+    )
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Age"] = str(max(0, int(time.time() - encoded.at)))
+    response.headers["X-Stale"] = "1" if stale else "0"
+    return response.make_conditional(request)
+
+
+@app.route("/api/changes")
+def api_changes():
+    """
+    신호 변화만 (전체 목록 대신 가볍게 폴링)
+    - since: 마지막으로 받은 seq. 없으면 직전 계산 대비, 보관 범위 밖이면 reset=true (/api/run 으로 전체 다시 받기)
+    - 응답: seq, since, at, reset, entered/exited/upgraded/downgraded (각 항목 list, symbol, name, signal, score)
+    캐시가 만료됐거나 없으면 백그라운드 계산을 시작하고 지금까지의 기록으로 바로 응답한다.
+    """
+    market, scope, _ = _run_args()
+    try:
+        since = int(request.args["since"])
+    except (KeyError, ValueError):
+        since = None
+    if _cache.peek(market, scope) is None:
+        _cache.refresh_async(market, scope)
+    changes = _cache.changes(market, scope, since)
+    if changes is None:
+        return jsonify({"seq": None, "since": since, "reset": True, "entered": [], "exited": [],
+                        "upgraded": [], "downgraded": []})
+    return jsonify(changes)
+
+
+@app.route("/api/metrics")
+def api_metrics():
+    """프로세스 지표 (Prometheus 텍스트 형식, 워커별)"""
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+
+def _ndjson(obj: dict) -> str:
+    return json.dumps(obj, ensure_ascii=False) + "\n"
+
+
+def _scan_stream(market: str, currency: str, store: Callable[[dict], dict]):
+    """시장 스캔 스트림 - 종목 수가 많아 진행 상황만 보내고, 순위는 마지막 done 에"""
+    from main import iter_market_scan
+
+    meta_sent = False
+    last_sent = 0
+    started = time.perf_counter()
+    for done, total, scan in iter_market_scan(market):
+        if not meta_sent:
+            yield _ndjson({"type": "meta", "market": market, "scope": "market",
+                           "currency": currency, "total": total, "cached": False})
+            meta_sent = True
+        if scan is None:
+            # 진행 상황은 전체의 약 1% 단위로
+            if done - last_sent >= max(1, total // 100):
+                last_sent = done
+                yield _ndjson({"type": "progress", "done": done})
+            continue
+        SCAN_SECONDS.observe(time.perf_counter() - started, market=market, scope="market")
+        data = store(_payload(market, "market", scan.trend, scan.rising, scan))
+        yield _ndjson({"type": "done", "data": data})
+
+
+def _combined_stream(
+    market: str, scope: str, full: bool, currency: str, store: Callable[[dict], dict]
+):
+    """관심종목 스트림 - 종목 평가마다 카드 하나, 마지막 done 에 정렬된 전체 결과"""
+    from main import iter_combined_recommender
+
+    trend: list[Recommendation] = []
+    rising: list[Recommendation] = []
+    started = time.perf_counter()
+    stream = iter_combined_recommender(
+        market=market, scope=scope, rising_limit=_rising_limit(market, scope, not full)
+    )
+    meta_sent = False
+    for done, total, recs in stream:
+        if not meta_sent:
+            yield _ndjson({"type": "meta", "market": market, "scope": scope,
+                           "currency": currency, "total": total, "cached": False})
+            meta_sent = True
+        if "trend" in recs:
+            trend.append(recs["trend"])
+            yield _ndjson({"type": "trend", "item": _trend_item(recs["trend"], currency), "done": done})
+        if "rising_star" in recs:
+            rising.append(recs["rising_star"])
+            yield _ndjson({"type": "rising", "item": _rising_item(recs["rising_star"]), "done": done})
+        if not recs:
+            yield _ndjson({"type": "progress", "done": done})
+    if not meta_sent:
+        yield _ndjson({"type": "meta", "market": market, "scope": scope,
+                       "currency": currency, "total": 0, "cached": False})
+
+    SCAN_SECONDS.observe(time.perf_counter() - started, market=market, scope=scope)
+    trend.sort(key=lambda r: r.score, reverse=True)
+    rising.sort(key=lambda r: r.score, reverse=True)
+    data = store(_payload(market, scope, trend, rising))
+    yield _ndjson({"type": "done", "data": data})
+
+
+@app.route("/api/run/stream")
+def api_run_stream():
+    """
+    /api/run 스트리밍 버전 (NDJSON, 한 줄에 JSON 하나)
+    - {"type":"meta", total} → 종목 평가마다 {"type":"trend"|"rising", item, done}
+    - 마지막 {"type":"done", data}: /api/run 과 같은 정렬된 전체 결과
+    캐시가 유효하면 캐시 결과를 바로 내보낸다.
+    캐시가 없으면 계산 담당(_cache.leading)인 요청 하나만 계산 과정을 스트리밍하고, 같은 키를 계산 중인
+    요청·워커가 이미 있으면 그 결과를 기다려 캐시 결과처럼 내보낸다 (ResultCache.WAIT_SEC 을 넘기면 {"type":"error"}).
+    """
+    market, scope, full = _run_args()
+    currency = "USD" if market == "us" else "KRW"
+
+    def generate():
+        cached = _cache.peek(market, scope)
+        if cached is None:
+            with _cache.leading(market, scope) as store:
+                if store is not None:
+                    if scope == "market":
+                        yield from _scan_stream(market, currency, store)
+                    else:
+                        yield from _combined_stream(market, scope, full, currency, store)
+                    return
+            try:
+                cached = _cache.get(market, scope, fast_mode=not full)
+            except TimeoutError:
+                yield _ndjson({"type": "error", "error": _BUSY_MESSAGE})
+                return
+        yield _ndjson({"type": "meta", "market": market, "scope": scope,
+                       "currency": cached["currency"], "total": 0, "cached": True})
+        yield _ndjson({"type": "done", "data": cached})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 if __name__ == "__main__":